@@ -1,8 +1,23 @@
 # activities_ui.py
 
+import datetime # for the "overdue" / "this week" due date windows
+import string
 import tkinter as tk
-from tkinter import ttk, messagebox
-from database_manager import DatabaseManager
+from tkinter import ttk, messagebox, filedialog
+import task_io
+from event_bus import CREATED, UPDATED, DELETED, BULK
+
+
+# File choices offered by the Import/Export dialogs
+TASK_FILE_TYPES = [("CSV files", "*.csv"), ("Calendar files", "*.ics"), ("All files", "*.*")]
+
+# Choices in the filter bar --> what query_tasks is asked for
+STATUS_FILTERS = {"All": None, "Open": "open", "Completed": "completed"}
+DUE_FILTERS = ["Any time", "Overdue", "Due today", "Due this week", "Custom range"]
+SORT_OPTIONS = {"Due date": "due_date", "Name": "name"}
+
+# sqlite's COLLATE NOCASE only ignores the case of A-Z, sorting new rows in Python does the same
+NOCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
 
 class ActivitiesUI:
     
@@ -10,15 +25,51 @@ class ActivitiesUI:
     Manages the user interface for the Activities tab, including displaying tasks
     and handling the "Add Task" functionality. This class populates a given frame.
     """
+
+    TASK_LIMIT = 500 # most tasks listed at once --> narrow the filters to see the rest
+    SEARCH_DELAY_MS = 250 # the list updates once the user stops typing for this long
     
-    def __init__(self, parent_frame, user_id):
+    def __init__(self, parent_frame, db_manager, db_executor, user_id, change_monitor=None):
+
+        """
+        Initializes the ActivitiesUI.
+
+        Args:
+            parent_frame (ttk.Frame): The frame to place the UI widgets on.
+            db_manager (DatabaseManager): The app's shared DatabaseManager.
+            db_executor (DatabaseExecutor): Runs the database calls off the Tk thread.
+            user_id (int): The ID of the currently logged-in user.
+            change_monitor (ChangeMonitor): If given, the list refreshes itself when tasks
+                are changed by another CampusLink window on the same database (changes made
+                in this app come through the event bus instead).
+        """
+
         self.parent_frame = parent_frame
+        self.db_manager = db_manager
+        self.db_executor = db_executor
         self.user_id = user_id
-        self.db_manager = DatabaseManager(db_path="campuslink.db")
+
+        # Keyed model of the rows currently on screen --> task id to its TaskRow
+        # lets refresh_task_list change only the rows that are different
+        self._task_rows = {}
+        self._row_order = [] # task ids in the order their rows are packed
+        self._search_after_id = None # pending (debounced) refresh while typing in the search box
+        self._list_truncated = False # True when more tasks match than are listed
         
         self.create_widgets()
         self.refresh_task_list()
 
+        if change_monitor:
+            # Changes from other windows --> re-query (the refresh only touches rows that actually changed)
+            monitor_token = change_monitor.subscribe("tasks", lambda table: self.refresh_task_list())
+            self.task_list_frame.bind("<Destroy>", lambda event: change_monitor.unsubscribe(monitor_token), add="+")
+
+        # Task changes made anywhere in this app are applied as patches (no re-query)
+        event_bus = self.db_manager.event_bus
+        if event_bus:
+            bus_token = event_bus.subscribe("tasks", self._apply_task_events)
+            self.task_list_frame.bind("<Destroy>", lambda event: event_bus.unsubscribe(bus_token), add="+")
+
 
 
 
@@ -26,17 +77,84 @@ class ActivitiesUI:
         """
         Sets up the UI elements for the activities tab.
         """
+        # Style used to show completed tasks differently
+        # note: configured once here, every completed row just refers to it by name
+        style = ttk.Style()
+        style.configure("Completed.TLabel", foreground="gray", font=("Arial", 10, "italic"))
+
         # Main header
         header = ttk.Label(self.parent_frame, text="My Tasks", font=("Arial", 18, "bold"))
         header.pack(pady=10)
 
+        # --- Filter bar ---
+        # Every change re-runs the query, only the matching tasks are loaded and shown
+        filter_frame = ttk.Frame(self.parent_frame)
+        filter_frame.pack(fill="x", padx=10)
+
+        ttk.Label(filter_frame, text="Show:").pack(side="left")
+        self.status_var = tk.StringVar(value="All")
+        status_box = ttk.Combobox(filter_frame, textvariable=self.status_var, values=list(STATUS_FILTERS), state="readonly", width=10)
+        status_box.pack(side="left", padx=(2, 10))
+
+        ttk.Label(filter_frame, text="Due:").pack(side="left")
+        self.due_var = tk.StringVar(value=DUE_FILTERS[0])
+        due_box = ttk.Combobox(filter_frame, textvariable=self.due_var, values=DUE_FILTERS, state="readonly", width=14)
+        due_box.pack(side="left", padx=(2, 10))
+
+        ttk.Label(filter_frame, text="Sort by:").pack(side="left")
+        self.sort_var = tk.StringVar(value="Due date")
+        sort_box = ttk.Combobox(filter_frame, textvariable=self.sort_var, values=list(SORT_OPTIONS), state="readonly", width=9)
+        sort_box.pack(side="left", padx=(2, 10))
+
+        ttk.Label(filter_frame, text="Search:").pack(side="left")
+        self.search_entry = ttk.Entry(filter_frame, width=20)
+        self.search_entry.pack(side="left", fill="x", expand=True, padx=(2, 0))
+        self.search_entry.bind("<KeyRelease>", self._on_search_typed)
+
+        for box in (status_box, due_box, sort_box):
+            box.bind("<<ComboboxSelected>>", self._on_filter_changed)
+
+        # From/To dates, only shown for "Custom range"
+        self.custom_range_frame = ttk.Frame(self.parent_frame)
+        ttk.Label(self.custom_range_frame, text="From:").pack(side="left")
+        self.due_from_entry = ttk.Entry(self.custom_range_frame, width=12)
+        self.due_from_entry.pack(side="left", padx=(2, 10))
+        ttk.Label(self.custom_range_frame, text="To:").pack(side="left")
+        self.due_to_entry = ttk.Entry(self.custom_range_frame, width=12)
+        self.due_to_entry.pack(side="left", padx=(2, 10))
+        ttk.Label(self.custom_range_frame, text="(YYYY-MM-DD, either can be left empty)").pack(side="left")
+        for entry in (self.due_from_entry, self.due_to_entry):
+            entry.bind("<Return>", lambda event: self.refresh_task_list())
+            entry.bind("<FocusOut>", lambda event: self.refresh_task_list())
+
+        # Says when not every matching task is listed (or why the filter is wrong)
+        self.filter_status_label = ttk.Label(self.parent_frame, text="", font=("Arial", 10, "italic"))
+        self.filter_status_label.pack()
+
         # Frame for task list
         self.task_list_frame = ttk.Frame(self.parent_frame)
         self.task_list_frame.pack(fill="both", expand=True, padx=10, pady=5)
+
+        # Shown instead of the rows when the list is empty
+        self.no_tasks_label = ttk.Label(self.task_list_frame, text="You don't have any tasks yet.")
         
+        # Buttons along the bottom
+        button_frame = ttk.Frame(self.parent_frame)
+        button_frame.pack(pady=10)
+
         # Add Task button
-        self.add_task_button = ttk.Button(self.parent_frame, text="Add Task", command=self.open_add_task_dialog)
-        self.add_task_button.pack(pady=10)
+        self.add_task_button = ttk.Button(button_frame, text="Add Task", command=self.open_add_task_dialog)
+        self.add_task_button.pack(side="left", padx=5)
+
+        # Import / Export buttons --> bulk load deadlines from (or save them to) CSV or calendar files
+        self.import_button = ttk.Button(button_frame, text="Import...", command=self.import_tasks)
+        self.import_button.pack(side="left", padx=5)
+        self.export_button = ttk.Button(button_frame, text="Export...", command=self.export_tasks)
+        self.export_button.pack(side="left", padx=5)
+
+        # Shows import/export progress
+        self.io_status_label = ttk.Label(self.parent_frame, text="", font=("Arial", 10, "italic"))
+        self.io_status_label.pack()
 
 
 
@@ -45,7 +163,14 @@ class ActivitiesUI:
         """
         Opens a new dialog window to add a task.
         """
-        AddTaskDialog(self.parent_frame, self.user_id, self.refresh_task_list)
+        AddTaskDialog(self.parent_frame, self.db_manager, self.db_executor, self.user_id, self._task_added)
+
+
+
+    def _task_added(self):
+        # note: with an event bus the new row arrives as a "created" event instead
+        if not self.db_manager.event_bus:
+            self.refresh_task_list()
 
 
 
@@ -53,58 +178,334 @@ class ActivitiesUI:
     def refresh_task_list(self):
 
         """
-        Refreshes the displayed list of tasks by fetching them from the database.
+        Refreshes the displayed list of tasks by fetching the ones matching the
+        filter bar from the database. The query runs in the background, the rows
+        are updated when it finishes.
         """
 
-        # Clear existing tasks
-        for widget in self.task_list_frame.winfo_children():
-            widget.destroy()
+        if not self.task_list_frame.winfo_exists():
+            return # logged out
+        filters = self._current_filters()
+        if filters is None:
+            return # the custom date range is not valid, the label says why
+
+        # note: asks for one task more than we show, to find out if some were left out
+        self.db_executor.submit(
+            self.db_manager.query_tasks, self.user_id, **filters, limit=self.TASK_LIMIT + 1,
+            on_success=self._show_tasks
+        )
+
+
+
+    def _current_filters(self):
+
+        """
+        Turns the filter bar into query_tasks arguments.
+
+        Returns:
+            dict: Keyword arguments for query_tasks, or None if the custom date range is invalid.
+        """
+
+        status = STATUS_FILTERS[self.status_var.get()]
+        due_from, due_to = None, None
+        today = datetime.date.today()
+        due = self.due_var.get()
+
+        if due == "Overdue":
+            # overdue = due before today and not done yet
+            status = "open"
+            due_to = (today - datetime.timedelta(days=1)).isoformat()
+        elif due == "Due today":
+            due_from = due_to = today.isoformat()
+        elif due == "Due this week":
+            monday = today - datetime.timedelta(days=today.weekday())
+            due_from = monday.isoformat()
+            due_to = (monday + datetime.timedelta(days=6)).isoformat()
+        elif due == "Custom range":
+            due_from = self._read_date(self.due_from_entry)
+            due_to = self._read_date(self.due_to_entry)
+            if due_from is False or due_to is False:
+                self.filter_status_label.configure(text="Enter dates as YYYY-MM-DD.")
+                return None
+
+        return {
+            "status": status,
+            "due_from": due_from,
+            "due_to": due_to,
+            "text": self.search_entry.get().strip(),
+            "sort": SORT_OPTIONS[self.sort_var.get()],
+        }
+
+
+
+    def _read_date(self, entry):
+
+        """
+        Reads a date entry as 'YYYY-MM-DD'. Returns None if it is empty and
+        False if it isn't a date we understand.
+        """
+
+        text = entry.get().strip()
+        if not text:
+            return None
+        # note: same date parsing as imports, so 9/1/2025 works too
+        date = task_io.normalize_date(text)
+        try:
+            datetime.date.fromisoformat(date)
+        except ValueError:
+            return False
+        return date
+
+
+
+    def _on_filter_changed(self, event=None):
+        if self.due_var.get() == "Custom range":
+            self.custom_range_frame.pack(fill="x", padx=10, pady=(5, 0), before=self.filter_status_label)
+        else:
+            self.custom_range_frame.pack_forget()
+        self.refresh_task_list()
+
+
+
+    def _on_search_typed(self, event):
+
+        """
+        Waits for a short pause in typing before querying, so we don't run a
+        query for every key press.
+        """
+
+        if self._search_after_id is not None:
+            self.parent_frame.after_cancel(self._search_after_id)
+        self._search_after_id = self.parent_frame.after(self.SEARCH_DELAY_MS, self._run_search)
+
+    def _run_search(self):
+        self._search_after_id = None
+        self.refresh_task_list()
+
+
+
+    def _show_tasks(self, tasks):
+
+        """
+        Shows the fetched tasks.
+
+        Only rows that changed are touched: rows for removed tasks are destroyed,
+        rows whose task changed are updated in place, and rows are created only
+        for new tasks.
+        """
+
+        # The user may have logged out (destroying this tab) while the query ran
+        if not self.task_list_frame.winfo_exists():
+            return
+
+        # Only the first TASK_LIMIT tasks are listed (we asked for one more to find out)
+        self._list_truncated = len(tasks) > self.TASK_LIMIT
+        if self._list_truncated:
+            tasks = tasks[:self.TASK_LIMIT]
+            self.filter_status_label.configure(text=f"Showing the first {self.TASK_LIMIT} matching tasks. Narrow the filters to see the rest.")
+        else:
+            self.filter_status_label.configure(text="")
+
+        new_order = [task['id'] for task in tasks]
+        new_ids = set(new_order)
+
+        # --- Remove rows for tasks that are gone ---
+        for task_id in [task_id for task_id in self._row_order if task_id not in new_ids]:
+            self._task_rows.pop(task_id).destroy()
+        kept_order = [task_id for task_id in self._row_order if task_id in new_ids]
+
+        # --- Update changed rows, create rows for new tasks ---
+        new_rows = []
+        for task in tasks:
+            row = self._task_rows.get(task['id'])
+            if row is None:
+                self._task_rows[task['id']] = TaskRow(self.task_list_frame, task, self.mark_task_as_complete, self.delete_task)
+                new_rows.append(task['id'])
+            elif row.task != task:
+                row.update(task)
+
+        # --- Pack rows in order ---
+        if kept_order != [task_id for task_id in new_order if task_id not in new_rows]:
+            # existing rows changed order --> repack everything (rare)
+            for task_id in kept_order:
+                self._task_rows[task_id].container.pack_forget()
+            for task_id in new_order:
+                self._task_rows[task_id].pack()
+        else:
+            # only place the new rows, right before the row that follows them
+            # note: walks backwards so each row always knows which row comes after it
+            new_row_set = set(new_rows)
+            next_existing = None
+            for task_id in reversed(new_order):
+                if task_id in new_row_set:
+                    self._task_rows[task_id].pack(before=next_existing)
+                next_existing = self._task_rows[task_id].container
+
+        self._row_order = new_order
 
-        tasks = self.db_manager.get_tasks(self.user_id)
-        
         if tasks:
-            for task in tasks:
-                #Create a frame for each task to hold the label and buttons
-                task_container = ttk.Frame(self.task_list_frame)
-                task_container.pack(fill="x", padx=10, pady=5)
-                
-                # Use a style to show completed tasks differently
-                style = ttk.Style()
-                if task['is_completed']:
-                    style.configure("Completed.TLabel", foreground="gray", font=("Arial", 10, "italic"))
-                    # Combined all task info into one label
-                    task_text = f"✓ Task: {task['task_name']} | Due: {task['due_date']} | Description: {task['description']}"
-                    task_label = ttk.Label(task_container, text=task_text, style="Completed.TLabel")
-                else:
-                    # Combined all task info into one label
-                    task_text = f"☐ Task: {task['task_name']} | Due: {task['due_date']} | Description: {task['description']}"
-                    task_label = ttk.Label(task_container, text=task_text, font=("Arial", 10))
-
-
-                task_label.pack(side="left", padx=(0, 10))
-                
-
-                # --- Complete Button ---
-                if not task['is_completed']:
-                    complete_button = ttk.Button(
-                        task_container, 
-                        text="Complete", 
-                        command=lambda task_id=task['id']: self.mark_task_as_complete(task_id)
-                    )
-                    complete_button.pack(side="right")
-
-                # --- Delete Button ---
-                delete_button = ttk.Button(
-                    task_container, 
-                    text="Delete", 
-                    command=lambda task_id=task['id']: self.delete_task(task_id)
-                )
-                delete_button.pack(side="right", padx=(0, 5))
-                
+            self.no_tasks_label.pack_forget()
+        else:
+            filtered = any([self.status_var.get() != "All", self.due_var.get() != DUE_FILTERS[0], self.search_entry.get().strip()])
+            self.no_tasks_label.configure(text="No tasks match the filters." if filtered else "You don't have any tasks yet.")
+            self.no_tasks_label.pack(padx=10, pady=10)
+
+
+
+
+    def _apply_task_events(self, events):
+
+        """
+        Patches the listed tasks with change events from the event bus (tasks
+        created, completed or deleted anywhere in the app) without querying the
+        database again. The rows themselves are updated by _show_tasks.
+
+        Args:
+            events (list): ChangeEvents for the tasks table.
+        """
+
+        if not self.task_list_frame.winfo_exists():
+            return
+        filters = self._current_filters()
+        if filters is None:
+            return
+
+        # Many rows changed (e.g. an import), or the list is cut off and a removed
+        # row would have to be replaced by one we don't have --> query instead
+        if self._list_truncated or any(event.action == BULK for event in events):
+            self.refresh_task_list()
+            return
 
+        tasks = {task_id: self._task_rows[task_id].task for task_id in self._row_order}
+        changed = False
+        for event in events:
+            if event.action == DELETED:
+                changed = tasks.pop(event.row_id, None) is not None or changed
+            elif event.action == UPDATED and event.row_id in tasks:
+                tasks[event.row_id] = dict(tasks[event.row_id], **event.data)
+                changed = True
+            elif event.action == UPDATED:
+                # A task we don't show may match the filters now (e.g. completed while
+                # "Completed" is picked). The event only holds the changed columns --> query instead
+                self.refresh_task_list()
+                return
+            elif event.action == CREATED and event.data['user_id'] == self.user_id:
+                task = dict(event.data)
+                del task['user_id'] # the rows from query_tasks don't have it
+                tasks[event.row_id] = task
+                changed = True
+        if not changed:
+            return
+
+        # Keep only what the filters allow, in the same order the query would give
+        visible = [task for task in tasks.values() if self._task_matches(task, filters)]
+        if filters['sort'] == "name":
+            visible.sort(key=lambda task: (task['task_name'].translate(NOCASE), task['id']))
         else:
-            no_tasks_label = ttk.Label(self.task_list_frame, text="You don't have any tasks yet.")
-            no_tasks_label.pack(padx=10, pady=10)
+            # note: sqlite puts tasks without a due date (NULL) first
+            visible.sort(key=lambda task: (task['due_date'] is not None, task['due_date'] or "", task['id']))
+        self._show_tasks(visible)
+
+
+
+    def _task_matches(self, task, filters):
+
+        """
+        Checks a task against the filter bar, the same way query_tasks does.
+        """
+
+        if filters['status'] == "open" and task['is_completed']:
+            return False
+        if filters['status'] == "completed" and not task['is_completed']:
+            return False
+
+        due_date = task['due_date']
+        due_from = filters['due_from'] or ("0000-01-01" if filters['due_to'] else None)
+        if due_from and (due_date is None or due_date < due_from):
+            return False
+        if filters['due_to'] and (due_date is None or due_date > filters['due_to']):
+            return False
+
+        text = filters['text'].lower()
+        if text and text not in task['task_name'].lower() and text not in (task['description'] or "").lower():
+            return False
+        return True
+
+
+
+
+    def import_tasks(self):
+
+        """
+        Asks for a CSV or .ics file and imports its tasks in the background,
+        showing progress as it goes.
+        """
+
+        path = filedialog.askopenfilename(
+            parent=self.parent_frame,
+            title="Import Tasks",
+            filetypes=TASK_FILE_TYPES
+        )
+        if not path:
+            return
+
+        self._set_io_busy(True, "Importing tasks...")
+        self.db_executor.run_in_thread(
+            task_io.import_tasks, self.db_manager, self.user_id, path,
+            progress=lambda count: self.db_executor.call_in_ui(self._show_io_progress, f"Imported {count:,} tasks..."),
+            on_success=lambda count: self._io_finished(f"Imported {count:,} tasks.", refresh=True),
+            on_error=lambda error: self._io_failed("Import Failed", error)
+        )
+
+
+
+    def export_tasks(self):
+
+        """
+        Asks where to save and writes all tasks to a CSV or .ics file in the background.
+        """
+
+        path = filedialog.asksaveasfilename(
+            parent=self.parent_frame,
+            title="Export Tasks",
+            defaultextension=".csv",
+            filetypes=TASK_FILE_TYPES
+        )
+        if not path:
+            return
+
+        self._set_io_busy(True, "Exporting tasks...")
+        self.db_executor.run_in_thread(
+            task_io.export_tasks, self.db_manager, self.user_id, path,
+            progress=lambda count: self.db_executor.call_in_ui(self._show_io_progress, f"Exported {count:,} tasks..."),
+            on_success=lambda count: self._io_finished(f"Exported {count:,} tasks."),
+            on_error=lambda error: self._io_failed("Export Failed", error)
+        )
+
+
+
+    def _set_io_busy(self, busy, message=""):
+        state = ["disabled"] if busy else ["!disabled"]
+        self.import_button.state(state)
+        self.export_button.state(state)
+        self.io_status_label.configure(text=message)
+
+    def _show_io_progress(self, message):
+        if self.io_status_label.winfo_exists():
+            self.io_status_label.configure(text=message)
+
+    def _io_finished(self, message, refresh=False):
+        if not self.io_status_label.winfo_exists():
+            return
+        self._set_io_busy(False, message)
+        if refresh and not self.db_manager.event_bus: # with a bus the import's event refreshes the list
+            self.refresh_task_list()
+
+    def _io_failed(self, title, error):
+        if not self.io_status_label.winfo_exists():
+            return
+        self._set_io_busy(False)
+        messagebox.showerror(title, f"{error}")
 
 
 
@@ -115,9 +516,10 @@ class ActivitiesUI:
         Calls the database manager to mark a task as complete and refreshes the list.
         """
 
-        self.db_manager.mark_task_complete(task_id)
-        self.refresh_task_list()
-        messagebox.showinfo("Success", "Task marked as complete!")
+        self.db_executor.submit(
+            self.db_manager.mark_task_complete, task_id,
+            on_success=lambda result: self._after_change("Task marked as complete!")
+        )
 
 
 
@@ -129,9 +531,102 @@ class ActivitiesUI:
         """
 
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this task?"):
-            self.db_manager.delete_task(task_id)
+            self.db_executor.submit(
+                self.db_manager.delete_task, task_id,
+                on_success=lambda result: self._after_change("Task deleted!")
+            )
+
+
+
+    def _after_change(self, message):
+
+        """
+        Refreshes the list and tells the user once a change has been saved.
+        """
+
+        # note: with an event bus the change already patched the list
+        if not self.db_manager.event_bus:
             self.refresh_task_list()
-            messagebox.showinfo("Success", "Task deleted!")
+        messagebox.showinfo("Success", message)
+
+
+
+
+class TaskRow:
+
+    """
+    The widgets for one task in the task list. Kept alive between refreshes
+    so a changed task only updates its own labels and buttons.
+    """
+
+    def __init__(self, parent, task, on_complete, on_delete):
+
+        """
+        Initializes the TaskRow.
+
+        Args:
+            parent (ttk.Frame): The task list frame the row is placed in.
+            task (dict): The task dictionary shown by this row.
+            on_complete (function): Called with the task ID when Complete is clicked.
+            on_delete (function): Called with the task ID when Delete is clicked.
+        """
+
+        self.task = task
+
+        # Create a frame for each task to hold the label and buttons
+        self.container = ttk.Frame(parent)
+
+        self.task_label = ttk.Label(self.container)
+        self.task_label.pack(side="left", padx=(0, 10))
+
+        # --- Complete Button ---
+        self.complete_button = ttk.Button(
+            self.container, 
+            text="Complete", 
+            command=lambda: on_complete(self.task['id'])
+        )
+
+        # --- Delete Button ---
+        self.delete_button = ttk.Button(
+            self.container, 
+            text="Delete", 
+            command=lambda: on_delete(self.task['id'])
+        )
+        self.delete_button.pack(side="right", padx=(0, 5))
+
+        self.update(task)
+
+
+
+    def update(self, task):
+
+        """
+        Shows a (possibly changed) task in this row.
+        """
+
+        self.task = task
+
+        # Combined all task info into one label, completed tasks use the Completed style
+        if task['is_completed']:
+            task_text = f"✓ Task: {task['task_name']} | Due: {task['due_date']} | Description: {task['description']}"
+            self.task_label.configure(text=task_text, style="Completed.TLabel", font="")
+            self.complete_button.pack_forget()
+        else:
+            task_text = f"☐ Task: {task['task_name']} | Due: {task['due_date']} | Description: {task['description']}"
+            self.task_label.configure(text=task_text, style="TLabel", font=("Arial", 10))
+            # note: packed before Delete so it stays the right-most button
+            self.complete_button.pack(side="right", before=self.delete_button)
+
+
+
+    def pack(self, before=None):
+        if before is not None:
+            self.container.pack(fill="x", padx=10, pady=5, before=before)
+        else:
+            self.container.pack(fill="x", padx=10, pady=5)
+
+    def destroy(self):
+        self.container.destroy()
 
 
 
@@ -142,12 +637,13 @@ class AddTaskDialog(tk.Toplevel):
     A dialog window for adding a new task.
     """
 
-    def __init__(self, parent, user_id, on_task_added):
+    def __init__(self, parent, db_manager, db_executor, user_id, on_task_added):
         super().__init__(parent)
         self.parent = parent
+        self.db_manager = db_manager
+        self.db_executor = db_executor
         self.user_id = user_id
         self.on_task_added = on_task_added
-        self.db_manager = DatabaseManager(db_path="campuslink.db")
 
         self.title("Add New Task")
         self.geometry("400x250")
@@ -180,8 +676,8 @@ class AddTaskDialog(tk.Toplevel):
         self.due_date_entry.pack()
 
         # --- Add Task Button ---
-        add_button = ttk.Button(self, text="Add Task", command=self.add_task)
-        add_button.pack(pady=(20, 0))
+        self.add_button = ttk.Button(self, text="Add Task", command=self.add_task)
+        self.add_button.pack(pady=(20, 0))
 
     def add_task(self):
 
@@ -197,10 +693,21 @@ class AddTaskDialog(tk.Toplevel):
             messagebox.showerror("Input Error", "Task Name is required.")
             return
 
-        try:
-            self.db_manager.add_task(self.user_id, task_name, description, due_date)
-            messagebox.showinfo("Success", "Task added successfully!")
-            self.on_task_added() # Call the refresh function
-            self.destroy() # Close the dialog
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to add task: {e}")
+        # Save in the background --> button is disabled so the task can't be added twice
+        self.add_button.state(["disabled"])
+        self.db_executor.submit(
+            self.db_manager.add_task, self.user_id, task_name, description, due_date,
+            on_success=self._task_saved,
+            on_error=self._task_failed
+        )
+
+
+
+    def _task_saved(self, result):
+        messagebox.showinfo("Success", "Task added successfully!")
+        self.on_task_added() # Call the refresh function
+        self.destroy() # Close the dialog
+
+    def _task_failed(self, error):
+        self.add_button.state(["!disabled"])
+        messagebox.showerror("Error", f"Failed to add task: {error}")
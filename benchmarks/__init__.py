@@ -0,0 +1,7 @@
+# benchmarks/__init__.py
+
+# Tools for measuring CampusLink's performance:
+#   generate_data.py --> fills a campuslink.db-compatible file with fake campus data
+#   run_db.py        --> times every DatabaseManager operation against such a file
+#   run_ui.py        --> times the Tk views (login, task list, bulletin feed) on a virtual display
+# See the "Benchmarks" section of the README for how to run them.
@@ -0,0 +1,213 @@
+# benchmarks/generate_data.py
+
+# Fills a new database file with fake but realistic campus data (users,
+# tasks, posts, events) for benchmarking. The schema comes from the app's own
+# migrations, so the file can be opened by CampusLink like a real campuslink.db.
+#
+# The data is deterministic: the same seed and sizes always give exactly the
+# same users, tasks, posts and events (only the random password salts differ), so
+# benchmark runs on different machines (or before and after a change) measure
+# the same thing.
+#
+# Usage (from the project folder):
+#   python -m benchmarks.generate_data bench.db --users 50000 --tasks 2000000 --posts 1000000 --events 100000
+
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+from credentials import PasswordHasher
+from database_manager import DatabaseManager
+from records import make_snippet
+
+
+# Every user's password is password<number>, e.g. student000042 / password42
+USERNAME_FORMAT = "student{:06d}"
+PASSWORD_FORMAT = "password{}"
+
+# scrypt cost for the generated passwords
+# note: far below what the app uses (see credentials.py), so 50,000 users don't take
+# over an hour to hash. run_db checks them with this same cost, and the app itself
+# upgrades a user's hash the first time they log in
+GENERATED_HASH_N = 2 ** 4
+
+# Made-up data starts on this day (fixed so the data doesn't depend on when it was generated)
+START_DATE = datetime.date(2025, 8, 25)
+
+# Words the task names, post titles, post contents and event titles are made of
+TASK_VERBS = ["Finish", "Start", "Review", "Submit", "Read", "Study for", "Email", "Print", "Revise", "Prepare"]
+TASK_NOUNS = ["essay", "lab report", "problem set", "midterm", "final exam", "reading", "presentation",
+              "group project", "quiz", "thesis draft", "lecture notes", "internship application"]
+WORDS = ["campus", "library", "study", "group", "club", "meeting", "exam", "lecture", "professor", "room",
+         "free", "pizza", "tonight", "tomorrow", "weekend", "event", "volunteer", "lost", "found", "keys",
+         "textbook", "sale", "ride", "share", "housing", "roommate", "wanted", "tutoring", "math", "physics",
+         "chemistry", "biology", "history", "music", "concert", "game", "team", "practice", "workshop",
+         "career", "fair", "resume", "coffee", "hall", "parking", "shuttle", "schedule", "deadline", "help",
+         "question", "anyone", "please", "thanks", "welcome", "new", "students", "orientation", "gym", "yoga",
+         "hiking", "trip", "movie", "night", "bake", "charity", "scholarship", "application", "lab", "open"]
+EVENT_LOCATIONS = ["Student Union", "Main Library", "Science Hall 101", "Gym", "Auditorium", "Quad",
+                   "Engineering Building", "Art Center", "Cafeteria", "Online"]
+
+
+
+def generate(db_path, users=50000, tasks=2000000, posts=1000000, events=100000, seed=1, batch_size=10000, progress=print):
+
+    """
+    Creates a new database file full of generated users, tasks, posts and events.
+
+    Args:
+        db_path (str): The file to create. Must not exist yet.
+        users (int): Number of users.
+        tasks (int): Number of tasks (spread unevenly, some users have many).
+        posts (int): Number of bulletin posts.
+        events (int): Number of calendar events.
+        seed (int): Random seed --> the same seed always gives the same data.
+        batch_size (int): Rows inserted per transaction.
+        progress (function): Called with a status message now and then (None for silence).
+
+    Returns:
+        dict: How many rows of each kind were created.
+    """
+
+    if os.path.exists(db_path):
+        raise FileExistsError(f"{db_path} already exists, pick a new file name.")
+    if users < 1 and (tasks or posts or events):
+        raise ValueError("Tasks, posts and events need at least one user.")
+
+    rnd = random.Random(seed)
+    password_hasher = PasswordHasher(n=GENERATED_HASH_N)
+    db_manager = DatabaseManager(db_path, password_hasher=password_hasher)
+    try:
+        db_manager.create_tables()
+        _insert(db_manager, "INSERT INTO users (username, password_hash) VALUES (?, ?)",
+                _user_rows(password_hasher, users), users, batch_size, "users", progress)
+        _insert(db_manager, "INSERT INTO tasks (user_id, task_name, description, due_date, is_completed) VALUES (?, ?, ?, ?, ?)",
+                _task_rows(rnd, users, tasks), tasks, batch_size, "tasks", progress)
+        _insert(db_manager, "INSERT INTO posts (user_id, title, content, timestamp, snippet) VALUES (?, ?, ?, ?, ?)",
+                _post_rows(rnd, users, posts), posts, batch_size, "posts", progress)
+        _insert(db_manager, "INSERT INTO events (user_id, title, location, description, start_time, end_time) VALUES (?, ?, ?, ?, ?, ?)",
+                _event_rows(rnd, users, events), events, batch_size, "events", progress)
+    finally:
+        db_manager.close()
+        password_hasher.close()
+
+    return {"users": users, "tasks": tasks, "posts": posts, "events": events}
+
+
+
+def _insert(db_manager, sql, rows, total, batch_size, name, progress):
+
+    """
+    Inserts rows from a generator batch_size at a time, one transaction per batch.
+    """
+
+    started = time.perf_counter()
+    done = 0
+    while done < total:
+        batch = [next(rows) for _ in range(min(batch_size, total - done))]
+        with db_manager.transaction() as conn:
+            conn.executemany(sql, batch)
+        done += len(batch)
+        if progress and done < total and done % (batch_size * 10) == 0:
+            progress(f"  {name}: {done:,} / {total:,}")
+    if progress:
+        progress(f"{total:,} {name} in {time.perf_counter() - started:.1f} s")
+
+
+
+def _pick_user(rnd, users):
+    # note: squaring the random number makes low user ids much more likely,
+    # so like on a real campus a few users have lots of tasks/posts and most have a few
+    return int(users * rnd.random() ** 2) + 1
+
+
+
+def _user_rows(password_hasher, users):
+    # note: the salts are random, so unlike everything else the hashes differ between runs
+    for number in range(1, users + 1):
+        password_hash = password_hasher.hash_password(PASSWORD_FORMAT.format(number))
+        yield USERNAME_FORMAT.format(number), password_hash
+
+
+
+def _task_rows(rnd, users, tasks):
+
+    """
+    Yields (user_id, task_name, description, due_date, is_completed) rows.
+    """
+
+    # note: dates are made once up front, formatting a date per row is slow over millions of rows
+    due_dates = [(START_DATE + datetime.timedelta(days=offset)).isoformat() for offset in range(-60, 240)]
+    for number in range(tasks):
+        task_name = f"{rnd.choice(TASK_VERBS)} {rnd.choice(TASK_NOUNS)}"
+        description = " ".join(rnd.choices(WORDS, k=rnd.randint(5, 15))) if rnd.random() < 0.5 else ""
+        due_date = rnd.choice(due_dates) if rnd.random() < 0.95 else None
+        yield _pick_user(rnd, users), task_name, description, due_date, rnd.random() < 0.3
+
+
+
+def _post_rows(rnd, users, posts):
+
+    """
+    Yields (user_id, title, content, timestamp, snippet) rows, oldest post first,
+    spread over the year after START_DATE.
+    """
+
+    start = datetime.datetime.combine(START_DATE, datetime.time(8, 0))
+    seconds_per_post = 365 * 24 * 3600 / max(posts, 1)
+    for number in range(posts):
+        timestamp = start + datetime.timedelta(seconds=int(number * seconds_per_post))
+        title = " ".join(rnd.choices(WORDS, k=rnd.randint(3, 7))).capitalize()
+        content = " ".join(rnd.choices(WORDS, k=rnd.randint(20, 60)))
+        yield _pick_user(rnd, users), title, content, timestamp.strftime("%Y-%m-%d %H:%M:%S"), make_snippet(content)
+
+
+
+def _event_rows(rnd, users, events):
+
+    """
+    Yields (user_id, title, location, description, start_time, end_time) rows,
+    starting on quarter hours between 8:00 and 21:00 over the year after
+    START_DATE. Most last one to three hours, a few run over several days.
+    """
+
+    start = datetime.datetime.combine(START_DATE, datetime.time(8, 0))
+    for _ in range(events):
+        begins = start + datetime.timedelta(days=rnd.randrange(365), minutes=15 * rnd.randrange(13 * 4))
+        if rnd.random() < 0.02:
+            length = datetime.timedelta(days=rnd.randint(2, 5))
+        else:
+            length = datetime.timedelta(minutes=rnd.choice([30, 60, 60, 90, 120, 180]))
+        title = " ".join(rnd.choices(WORDS, k=rnd.randint(2, 5))).capitalize()
+        description = " ".join(rnd.choices(WORDS, k=rnd.randint(5, 20))) if rnd.random() < 0.5 else ""
+        yield (_pick_user(rnd, users), title, rnd.choice(EVENT_LOCATIONS), description,
+               begins.strftime("%Y-%m-%d %H:%M"), (begins + length).strftime("%Y-%m-%d %H:%M"))
+
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a CampusLink database full of fake campus data.")
+    parser.add_argument("db_path", help="the database file to create (must not exist)")
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--tasks", type=int, default=2000000)
+    parser.add_argument("--posts", type=int, default=1000000)
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    try:
+        generate(args.db_path, args.users, args.tasks, args.posts, args.events, args.seed, args.batch_size)
+    except (FileExistsError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
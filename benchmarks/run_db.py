@@ -0,0 +1,371 @@
+# benchmarks/run_db.py
+
+# Times every DatabaseManager operation against a generated database and
+# reports p50/p95/p99 latency and throughput as JSON.
+#
+# The database is copied to a temporary folder first, so the write benchmarks
+# (add/delete/...) never change the file you pass in and every run starts
+# from the same data.
+#
+# Usage (from the project folder):
+#   python -m benchmarks.generate_data bench.db
+#   python -m benchmarks.run_db bench.db --output baseline.json
+#   ... make a change ...
+#   python -m benchmarks.run_db bench.db --output new.json --baseline baseline.json
+#
+# With --baseline the run is compared to the stored results and every
+# operation whose p95 got more than --threshold slower is reported as a
+# regression (the exit code is then 1, handy for scripts).
+
+
+import argparse
+import contextlib
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+from credentials import PasswordHasher
+from database_manager import DatabaseManager
+from benchmarks.generate_data import USERNAME_FORMAT, PASSWORD_FORMAT, WORDS, GENERATED_HASH_N, START_DATE
+
+
+BATCH_SIZE = 1000 # rows per call for the batch operations (add_tasks, delete_posts, ...)
+
+
+
+class BenchmarkContext:
+
+    """
+    What the benchmarks need to know about the database: the manager itself,
+    how many rows there are, and a seeded random generator for picking
+    arguments (so every run picks the same ones).
+    """
+
+    def __init__(self, db_manager, seed):
+        self.db_manager = db_manager
+        self.rnd = random.Random(seed)
+        with db_manager.connections.reader() as conn:
+            self.user_count = conn.execute("SELECT COALESCE(MAX(id), 0) FROM users").fetchone()[0]
+            self.task_count = conn.execute("SELECT COALESCE(MAX(id), 0) FROM tasks").fetchone()[0]
+            self.post_count = conn.execute("SELECT COALESCE(MAX(id), 0) FROM posts").fetchone()[0]
+        self._used_ids = {"tasks": set(), "posts": set()} # ids already deleted by an earlier benchmark
+        self._counter = 0
+
+    def user_id(self):
+        return self.rnd.randint(1, self.user_count)
+
+    def username(self):
+        return USERNAME_FORMAT.format(self.user_id())
+
+    def unique_name(self, prefix):
+        self._counter += 1
+        return f"{prefix}_{self._counter:06d}"
+
+    def words(self, count):
+        return " ".join(self.rnd.sample(WORDS, count))
+
+    def fresh_ids(self, table, count):
+
+        """
+        Returns ids of existing rows no earlier benchmark deleted or changed.
+        """
+
+        total = self.task_count if table == "tasks" else self.post_count
+        used = self._used_ids[table]
+        ids = []
+        while len(ids) < count and len(used) < total:
+            row_id = self.rnd.randint(1, total)
+            if row_id not in used:
+                used.add(row_id)
+                ids.append(row_id)
+        return ids
+
+    def feed_cursor(self):
+        # the (timestamp, id) of a post somewhere in the feed, to start a deep page from
+        post_id = self.rnd.randint(1, self.post_count)
+        with self.db_manager.connections.reader() as conn:
+            row = conn.execute("SELECT timestamp, id FROM posts WHERE id >= ? ORDER BY id LIMIT 1", (post_id,)).fetchone()
+        return tuple(row) if row else None
+
+    def calendar_range(self, days):
+        # a (first day, day after the last) window somewhere in the generated year of events
+        first_day = START_DATE + datetime.timedelta(days=self.rnd.randrange(365 - days))
+        return first_day, first_day + datetime.timedelta(days=days)
+
+
+
+# Every benchmark: (name, iterations, rows per call, make_args(ctx), operation(db_manager, args))
+# Arguments are all made before the timing starts, so only the operation itself is timed.
+# note: reads come first, the writes after them change the data
+BENCHMARKS = [
+    # --- users ---
+    ("get_user_id", 500, 1, lambda ctx: ctx.username(),
+        lambda db, name: (db.identity_cache.invalidate(username=name), db.get_user_id(name))),
+    ("get_user_id (cached)", 500, 1, lambda ctx: USERNAME_FORMAT.format(1),
+        lambda db, name: db.get_user_id(name)),
+    ("get_username_by_id", 500, 1, lambda ctx: ctx.user_id(),
+        lambda db, user_id: (db.identity_cache.invalidate(user_id=user_id), db.get_username_by_id(user_id))),
+    ("check_user", 200, 1, lambda ctx: ctx.user_id(),
+        lambda db, number: db.check_user(USERNAME_FORMAT.format(number), PASSWORD_FORMAT.format(number))),
+
+    # --- tasks (reads) ---
+    ("get_tasks", 200, 1, lambda ctx: ctx.user_id(),
+        lambda db, user_id: db.get_tasks(user_id)),
+    ("get_tasks (busiest user)", 50, 1, lambda ctx: 1,
+        lambda db, user_id: db.get_tasks(user_id)),
+    ("query_tasks open+week", 200, 1, lambda ctx: ctx.user_id(),
+        lambda db, user_id: db.query_tasks(user_id, status="open", due_from="2025-10-06", due_to="2025-10-12")),
+    ("query_tasks text", 200, 1, lambda ctx: ctx.user_id(),
+        lambda db, user_id: db.query_tasks(user_id, text="exam")),
+    ("query_tasks by name limit 100", 200, 1, lambda ctx: ctx.user_id(),
+        lambda db, user_id: db.query_tasks(user_id, sort="name", limit=100)),
+    ("iter_tasks (busiest user)", 20, 1, lambda ctx: 1,
+        lambda db, user_id: sum(1 for task in db.iter_tasks(user_id))),
+
+    # --- posts (reads) ---
+    ("get_feed_page first", 200, 1, lambda ctx: None,
+        lambda db, before: db.get_feed_page(before=before)),
+    ("get_feed_page deep", 200, 1, lambda ctx: ctx.feed_cursor(),
+        lambda db, before: db.get_feed_page(before=before)),
+    ("get_feed_markers", 500, 1, lambda ctx: None,
+        lambda db, args: db.get_feed_markers()),
+    ("get_posts_since (20 new)", 500, 1, lambda ctx: max(ctx.post_count - 20, 0),
+        lambda db, after_id: db.get_posts_since(after_id, 0)),
+    ("search_posts one word", 200, 1, lambda ctx: ctx.words(1),
+        lambda db, query: db.search_posts(query)),
+    ("search_posts two words", 200, 1, lambda ctx: ctx.words(2),
+        lambda db, query: db.search_posts(query)),
+    ("search_posts prefix", 200, 1, lambda ctx: ctx.words(1)[:3],
+        lambda db, query: db.search_posts(query)),
+    ("get_posts (whole board)", 3, 1, lambda ctx: None,
+        lambda db, args: db.get_posts()),
+    ("iter_posts (whole board)", 3, 1, lambda ctx: None,
+        lambda db, args: sum(1 for post in db.iter_posts())),
+
+    # --- events (reads) ---
+    ("get_events_between month view", 100, 1, lambda ctx: ctx.calendar_range(42),
+        lambda db, window: db.get_events_between(*window)),
+    ("get_events_between week", 200, 1, lambda ctx: ctx.calendar_range(7),
+        lambda db, window: db.get_events_between(*window)),
+
+    # --- writes ---
+    ("add_user", 200, 1, lambda ctx: ctx.unique_name("bench_user"),
+        lambda db, name: db.add_user(name, "benchmark")),
+    ("rename_user", 200, 1, lambda ctx: (ctx.user_id(), ctx.unique_name("renamed_user")),
+        lambda db, args: db.rename_user(*args)),
+    ("add_task", 500, 1, lambda ctx: ctx.user_id(),
+        lambda db, user_id: db.add_task(user_id, "Benchmark task", "made by run_db", "2025-10-01")),
+    ("add_tasks", 20, BATCH_SIZE, lambda ctx: [(ctx.user_id(), "Benchmark task", "", "2025-10-01") for _ in range(BATCH_SIZE)],
+        lambda db, rows: db.add_tasks(rows)),
+    ("mark_task_complete", 500, 1, lambda ctx: ctx.fresh_ids("tasks", 1)[0],
+        lambda db, task_id: db.mark_task_complete(task_id)),
+    ("mark_tasks_complete", 20, BATCH_SIZE, lambda ctx: ctx.fresh_ids("tasks", BATCH_SIZE),
+        lambda db, task_ids: db.mark_tasks_complete(task_ids)),
+    ("delete_task", 500, 1, lambda ctx: ctx.fresh_ids("tasks", 1)[0],
+        lambda db, task_id: db.delete_task(task_id)),
+    ("delete_tasks", 20, BATCH_SIZE, lambda ctx: ctx.fresh_ids("tasks", BATCH_SIZE),
+        lambda db, task_ids: db.delete_tasks(task_ids)),
+    ("add_post", 500, 1, lambda ctx: (ctx.user_id(), ctx.words(4), ctx.words(30)),
+        lambda db, args: db.add_post(*args)),
+    ("add_posts", 20, BATCH_SIZE, lambda ctx: [(ctx.user_id(), ctx.words(4), ctx.words(30)) for _ in range(BATCH_SIZE)],
+        lambda db, rows: db.add_posts(rows)),
+    ("delete_post", 500, 1, lambda ctx: ctx.fresh_ids("posts", 1)[0],
+        lambda db, post_id: db.delete_post(post_id)),
+    ("delete_posts", 20, BATCH_SIZE, lambda ctx: ctx.fresh_ids("posts", BATCH_SIZE),
+        lambda db, post_ids: db.delete_posts(post_ids)),
+]
+
+
+
+def percentile(sorted_values, percent):
+
+    """
+    Returns the given percentile (nearest-rank) of an already sorted list.
+    """
+
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+
+def run_benchmark(ctx, name, iterations, rows_per_call, make_args, operation, scale=1.0):
+
+    """
+    Runs one benchmark and summarizes its timings.
+
+    Returns:
+        dict: iterations, p50/p95/p99/mean/max in milliseconds, ops_per_sec and rows_per_sec.
+    """
+
+    iterations = max(1, int(iterations * scale))
+    all_args = [make_args(ctx) for _ in range(iterations)]
+    db_manager = ctx.db_manager
+
+    timings = []
+    # note: the DatabaseManager prints a line for every write, that would flood the terminal
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for args in all_args:
+            started = time.perf_counter()
+            operation(db_manager, args)
+            timings.append(time.perf_counter() - started)
+
+    total = sum(timings)
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "p50_ms": round(percentile(timings, 50) * 1000, 4),
+        "p95_ms": round(percentile(timings, 95) * 1000, 4),
+        "p99_ms": round(percentile(timings, 99) * 1000, 4),
+        "mean_ms": round(total / iterations * 1000, 4),
+        "max_ms": round(timings[-1] * 1000, 4),
+        "ops_per_sec": round(iterations / total, 1) if total else None,
+        "rows_per_sec": round(iterations * rows_per_call / total, 1) if total else None,
+    }
+
+
+
+def run_all(db_path, seed=1, scale=1.0, only=None, progress=print):
+
+    """
+    Runs the benchmarks on a temporary copy of db_path.
+
+    Args:
+        db_path (str): A database made by generate_data (or a real campuslink.db).
+        seed (int): Random seed for picking arguments.
+        scale (float): Multiplies every benchmark's iteration count (e.g. 0.1 for a quick run).
+        only (list): Names (or parts of names) of the benchmarks to run, None for all.
+        progress (function): Called with each benchmark's summary line (None for silence).
+
+    Returns:
+        dict: {"meta": {...}, "results": {benchmark name: summary}}.
+    """
+
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"{db_path} does not exist, create it with benchmarks.generate_data first.")
+
+    work_dir = tempfile.mkdtemp(prefix="campuslink-bench-")
+    try:
+        copy_path = os.path.join(work_dir, "bench.db")
+        shutil.copyfile(db_path, copy_path)
+
+        # note: passwords are checked with the generated data's (tiny) scrypt cost, so
+        # check_user/add_user time the database work, not the deliberately slow hashing
+        password_hasher = PasswordHasher(n=GENERATED_HASH_N)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            db_manager = DatabaseManager(copy_path, password_hasher=password_hasher)
+            db_manager.create_tables() # brings an older file up to the current schema
+        try:
+            ctx = BenchmarkContext(db_manager, seed)
+            results = {}
+            for name, iterations, rows_per_call, make_args, operation in BENCHMARKS:
+                if only and not any(part in name for part in only):
+                    continue
+                results[name] = run_benchmark(ctx, name, iterations, rows_per_call, make_args, operation, scale)
+                if progress:
+                    summary = results[name]
+                    progress(f"{name:<32} p50 {summary['p50_ms']:>9.3f} ms   p95 {summary['p95_ms']:>9.3f} ms   "
+                             f"p99 {summary['p99_ms']:>9.3f} ms   {summary['rows_per_sec']:>12,.0f} rows/s")
+            meta = {
+                "database": os.path.abspath(db_path),
+                "users": ctx.user_count,
+                "tasks": ctx.task_count,
+                "posts": ctx.post_count,
+                "seed": seed,
+                "scale": scale,
+                "python": platform.python_version(),
+                "sqlite": sqlite3.sqlite_version,
+                "platform": platform.platform(),
+                "started": datetime.datetime.now().isoformat(timespec="seconds"),
+            }
+        finally:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                db_manager.close()
+            password_hasher.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {"meta": meta, "results": results}
+
+
+
+def compare(results, baseline, threshold=0.2, min_delta_ms=0.05):
+
+    """
+    Compares a run with a stored baseline run.
+
+    An operation counts as a regression when its p95 latency is more than
+    threshold (0.2 = 20%) slower than in the baseline AND at least min_delta_ms
+    slower (so tiny timings that jitter by a few microseconds don't count).
+
+    Returns:
+        list: One dict per regression (name, baseline_p95_ms, p95_ms, change).
+    """
+
+    regressions = []
+    for name, summary in results["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if old is None:
+            continue
+        before, after = old["p95_ms"], summary["p95_ms"]
+        if after - before >= min_delta_ms and after > before * (1 + threshold):
+            regressions.append({
+                "name": name,
+                "baseline_p95_ms": before,
+                "p95_ms": after,
+                "change": round(after / before - 1, 3) if before else None,
+            })
+    return regressions
+
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every DatabaseManager operation.")
+    parser.add_argument("db_path", help="database made by benchmarks.generate_data")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with the results stored in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p95 slowdown that counts as a regression (0.2 = 20%%)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every iteration count (e.g. 0.1 for a quick run)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", nargs="*", help="only run benchmarks whose name contains one of these")
+    args = parser.parse_args(argv)
+
+    try:
+        results = run_all(args.db_path, seed=args.seed, scale=args.scale, only=args.only)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        return 2
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, threshold=args.threshold)
+        results["regressions"] = regressions
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(results, file, indent=2)
+        if regressions:
+            print(f"{len(regressions)} regression(s) compared to {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression['name']}: p95 {regression['baseline_p95_ms']:.3f} ms -> "
+                      f"{regression['p95_ms']:.3f} ms ({regression['change']:+.0%})")
+            return 1
+        print(f"No regressions compared to {args.baseline}.")
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
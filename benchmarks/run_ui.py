@@ -0,0 +1,365 @@
+# benchmarks/run_ui.py
+
+# Times the Tk views: the login --> main view switch, refreshing the task list
+# and the bulletin feed, scrolling the feed all the way down, and moving the
+# events calendar to the next month. Every timing
+# runs until the view has "settled": the background queries are delivered and
+# Tk has nothing left to draw. Widget counts and the memory used (RSS) are
+# recorded next to the timings.
+#
+# Tk needs a display. Without one (e.g. on a server) a virtual X display is
+# started with Xvfb if it is installed; otherwise the run is skipped.
+#
+# Usage (from the project folder):
+#   python -m benchmarks.run_ui --sizes 100 1000 10000 --output ui_baseline.json
+#   python -m benchmarks.run_ui --sizes 100 1000 10000 --baseline ui_baseline.json
+#
+# Each size N creates a fresh database with one user owning N tasks, N posts and N events.
+# note: the task list only ever shows ActivitiesUI.TASK_LIMIT tasks, bigger sizes
+# measure the query and the "not all tasks listed" path.
+
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import datetime
+import tkinter as tk
+from tkinter import messagebox
+
+from benchmarks.generate_data import generate, USERNAME_FORMAT, START_DATE
+from benchmarks.run_db import percentile, compare
+
+
+SETTLE_TIMEOUT = 120 # seconds a view may take to settle before the run gives up
+WINDOW_SIZE = "1024x768"
+
+
+
+def start_virtual_display():
+
+    """
+    Makes sure Tk has a display to draw on.
+
+    Returns:
+        subprocess.Popen: The Xvfb process that was started (stop it when done),
+            or None if a display was already available.
+
+    Raises:
+        RuntimeError: There is no display and Xvfb isn't installed (or didn't start).
+    """
+
+    if os.environ.get("DISPLAY"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if not xvfb:
+        raise RuntimeError("no DISPLAY and Xvfb is not installed (e.g. apt install xvfb)")
+
+    # Use the first display number that isn't taken
+    number = 99
+    while os.path.exists(f"/tmp/.X11-unix/X{number}") or os.path.exists(f"/tmp/.X{number}-lock"):
+        number += 1
+    process = subprocess.Popen([xvfb, f":{number}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    # Wait for its socket to show up
+    deadline = time.monotonic() + 10
+    while not os.path.exists(f"/tmp/.X11-unix/X{number}"):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            raise RuntimeError("Xvfb did not start")
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = f":{number}"
+    return process
+
+
+
+def settle(app):
+
+    """
+    Runs the Tk event loop until every background query has been delivered
+    and nothing is left to draw.
+    """
+
+    deadline = time.perf_counter() + SETTLE_TIMEOUT
+    while True:
+        app.update()
+        if app.db_executor.is_idle():
+            app.update_idletasks()
+            # note: drawing can ask for more data (e.g. the next page), only stop when it didn't
+            if app.db_executor.is_idle():
+                return
+        if time.perf_counter() > deadline:
+            raise TimeoutError("the view did not settle")
+        time.sleep(0.0005)
+
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+
+def rss_mb():
+
+    """
+    Returns the memory this process uses right now in MB (None if unknown).
+    """
+
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # note: linux reports KB, mac reports bytes (and this is the peak, not the current use)
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    except ImportError:
+        return None
+
+
+
+def summarize(timings, app):
+
+    """
+    Summarizes the timings of one scenario (and the state of the window after it).
+    """
+
+    total = sum(timings)
+    timings = sorted(timings)
+    return {
+        "iterations": len(timings),
+        "p50_ms": round(percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(percentile(timings, 95) * 1000, 3),
+        "p99_ms": round(percentile(timings, 99) * 1000, 3),
+        "mean_ms": round(total / len(timings) * 1000, 3),
+        "max_ms": round(timings[-1] * 1000, 3),
+        "widgets": count_widgets(app),
+        "rss_mb": rss_mb(),
+    }
+
+
+
+def timed(app, action):
+
+    """
+    Runs action() and waits for the window to settle.
+
+    Returns:
+        float: Seconds from the call until the view settled.
+    """
+
+    started = time.perf_counter()
+    action()
+    settle(app)
+    return time.perf_counter() - started
+
+
+
+def scroll_to_end(app):
+
+    """
+    Keeps scrolling the feed to the bottom until no more posts load.
+
+    Returns:
+        int: How many posts were loaded in the end.
+    """
+
+    view = app.bulletin_ui.post_list_view
+    source = app.bulletin_ui.feed_source
+    while True:
+        before = source.row_count()
+        view.canvas.yview_moveto(1.0)
+        settle(app)
+        if source.row_count() == before:
+            return before
+
+
+
+def run_size(work_dir, size, repeat, progress=print):
+
+    """
+    Runs every scenario on a new database with one user owning size tasks, posts and events.
+
+    Returns:
+        dict: {scenario name: summary}.
+    """
+
+    from main import CampusLinkApp # note: imported late, only once we know there is a display
+
+    size_dir = os.path.join(work_dir, f"size_{size}")
+    os.makedirs(size_dir)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        generate(os.path.join(size_dir, "campuslink.db"), users=1, tasks=size, posts=size, events=size, progress=None)
+
+    results = {}
+    old_cwd = os.getcwd()
+    # note: the welcome box after login would wait for a click
+    old_showinfo = messagebox.showinfo
+    messagebox.showinfo = lambda *args, **kwargs: "ok"
+    os.chdir(size_dir) # the app opens campuslink.db in the current folder
+    try:
+        app = CampusLinkApp()
+        try:
+            app.geometry(WINDOW_SIZE)
+            settle(app)
+            label = f"({size} tasks, {size} posts)"
+
+            # --- login --> main view (builds the Activities tab and loads its tasks, the other tabs are built when opened) ---
+            timings = []
+            for number in range(repeat):
+                if number:
+                    app.show_login_view()
+                    settle(app)
+                timings.append(timed(app, lambda: app.show_main_app_view(USERNAME_FORMAT.format(1), 1)))
+            results[f"login_to_main_view {label}"] = summarize(timings, app)
+
+            # --- task list ---
+            app.notebook.select(app.activities_frame)
+            settle(app)
+            activities = app.activities_ui
+            timings = [timed(app, activities.refresh_task_list) for _ in range(repeat)]
+            results[f"refresh_task_list unchanged {label}"] = summarize(timings, app)
+
+            # switching the sort order moves every row
+            timings = []
+            for number in range(repeat):
+                activities.sort_var.set("Name" if number % 2 == 0 else "Due date")
+                timings.append(timed(app, activities.refresh_task_list))
+            results[f"refresh_task_list resorted {label}"] = summarize(timings, app)
+
+            # --- bulletin feed ---
+            app.notebook.select(app.bulletin_frame)
+            settle(app)
+            bulletin = app.bulletin_ui
+            timings = [timed(app, bulletin.refresh_post_list) for _ in range(repeat)]
+            results[f"refresh_post_list {label}"] = summarize(timings, app)
+
+            timings = []
+            for _ in range(repeat):
+                bulletin.refresh_post_list()
+                settle(app)
+                started = time.perf_counter()
+                loaded = scroll_to_end(app)
+                timings.append(time.perf_counter() - started)
+            results[f"scroll_feed_to_end {label}"] = summarize(timings, app)
+            results[f"scroll_feed_to_end {label}"]["posts_loaded"] = loaded
+
+            # --- events calendar (the generated events start on START_DATE) ---
+            app.notebook.select(app.events_frame)
+            settle(app)
+            events = app.events_ui
+            events.shown_date = events.selected_date = START_DATE
+            events.show_period()
+            settle(app)
+            timings = [timed(app, lambda: events.move(1)) for _ in range(repeat)]
+            results[f"events_next_month ({size} events)"] = summarize(timings, app)
+
+            if progress:
+                for name, summary in results.items():
+                    progress(f"{name:<58} p50 {summary['p50_ms']:>10.1f} ms   max {summary['max_ms']:>10.1f} ms   "
+                             f"{summary['widgets']:>6} widgets   {summary['rss_mb']} MB")
+        finally:
+            app.on_close()
+    finally:
+        os.chdir(old_cwd)
+        messagebox.showinfo = old_showinfo
+
+    return results
+
+
+
+def run_all(sizes, repeat=5, progress=print):
+
+    """
+    Runs the UI benchmarks for every size.
+
+    Returns:
+        dict: {"meta": {...}, "results": {scenario name: summary}}, or with a
+            "skipped" reason and no results if there is no display to draw on.
+    """
+
+    meta = {
+        "sizes": sizes,
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "tk": tk.TkVersion,
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "started": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+
+    try:
+        display = start_virtual_display()
+    except RuntimeError as e:
+        return {"meta": meta, "skipped": str(e), "results": {}}
+
+    work_dir = tempfile.mkdtemp(prefix="campuslink-ui-bench-")
+    try:
+        results = {}
+        for size in sizes:
+            results.update(run_size(work_dir, size, repeat, progress))
+    except tk.TclError as e:
+        return {"meta": meta, "skipped": f"Tk could not open a window ({e})", "results": {}}
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        if display:
+            display.terminate()
+            display.wait()
+
+    meta["display"] = "Xvfb" if display else os.environ.get("DISPLAY")
+    return {"meta": meta, "results": results}
+
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the CampusLink Tk views (needs a display or Xvfb).")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="number of tasks and posts to run the views with")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per scenario")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with the results stored in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p95 slowdown that counts as a regression (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = run_all(args.sizes, max(1, args.repeat))
+    if "skipped" in results:
+        print(f"Skipped the UI benchmarks: {results['skipped']}")
+
+    if args.baseline and results["results"]:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        # note: UI timings are in whole milliseconds, smaller differences are noise
+        results["regressions"] = compare(results, baseline, threshold=args.threshold, min_delta_ms=1.0)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"Results written to {args.output}")
+
+    regressions = results.get("regressions")
+    if regressions:
+        print(f"{len(regressions)} regression(s) compared to {args.baseline}:")
+        for regression in regressions:
+            print(f"  {regression['name']}: p95 {regression['baseline_p95_ms']:.1f} ms -> "
+                  f"{regression['p95_ms']:.1f} ms ({regression['change']:+.0%})")
+        return 1
+    if args.baseline and results["results"]:
+        print(f"No regressions compared to {args.baseline}.")
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
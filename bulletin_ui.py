@@ -3,6 +3,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from database_manager import DatabaseManager # Import the DatabaseManager
+from virtual_list import VirtualListView
+from records import make_snippet
+from event_bus import CREATED, DELETED, BULK
 
 class BulletinUI:
     
@@ -10,8 +13,13 @@ class BulletinUI:
     Manages the user interface for the Bulletin Board tab.
     This class handles displaying posts and opening a dialog to create new ones.
     """
+
+    POST_CARD_HEIGHT = 150 # every post card is drawn at this fixed height (pixels)
+    SEARCH_DELAY_MS = 250 # search runs once the user stops typing for this long
+    POLL_INTERVAL_MS = 5000 # how often the board checks for posts made elsewhere (without a ChangeMonitor)
+    FEED_EMPTY_TEXT = "No posts on the bulletin board yet."
     
-    def __init__(self, parent_frame, db_manager, user_id):
+    def __init__(self, parent_frame, db_manager, db_executor, user_id, change_monitor=None):
       
         """
         Initializes the BulletinUI.
@@ -19,17 +27,41 @@ class BulletinUI:
         Args:
             parent_frame (ttk.Frame): The frame to place the UI widgets on.
             db_manager (DatabaseManager): An instance of the DatabaseManager.
+            db_executor (DatabaseExecutor): Runs the database calls off the Tk thread.
             user_id (int): The ID of the currently logged-in user.
+            change_monitor (ChangeMonitor): Tells us when posts are changed by another
+                CampusLink window. If None the board checks for new posts on a timer instead.
         """
        
         self.parent_frame = parent_frame
         self.db_manager = db_manager
+        self.db_executor = db_executor
         self.user_id = user_id
+
+        # Posts are pulled from the database a page at a time (in the background)
+        # as the list needs them. The list is redrawn whenever a page arrives
+        self.feed_source = FeedDataSource(self.db_manager, self.db_executor, on_rows_loaded=self._on_posts_loaded)
+        self.search_source = None # SearchDataSource while a search is shown, None = the feed
+        self._search_after_id = None # pending (debounced) search
         
         # Call the method to set up the UI
         self._create_widgets()
         self.refresh_post_list()
 
+        # Keep the board up to date --> only the changes since the last check are fetched
+        if change_monitor:
+            # checks only when another window really changed the posts table
+            monitor_token = change_monitor.subscribe("posts", lambda table: self.check_for_new_posts())
+            self.post_list_view.bind("<Destroy>", lambda event: change_monitor.unsubscribe(monitor_token), add="+")
+        else:
+            self.parent_frame.after(self.POLL_INTERVAL_MS, self._poll_for_new_posts)
+
+        # Posts created or deleted anywhere in this app are applied as patches (no re-query)
+        event_bus = self.db_manager.event_bus
+        if event_bus:
+            bus_token = event_bus.subscribe("posts", self._apply_post_events)
+            self.post_list_view.bind("<Destroy>", lambda event: event_bus.unsubscribe(bus_token), add="+")
+
 
 
     def _create_widgets(self):
@@ -42,13 +74,30 @@ class BulletinUI:
         header = ttk.Label(self.parent_frame, text="Community Bulletin Board", font=("Arial", 18, "bold"))
         header.pack(pady=10)
 
-        # Frame for post list
-        self.post_list_frame = ttk.Frame(self.parent_frame)
-        self.post_list_frame.pack(fill="both", expand=True, padx=10, pady=5)
-        
+        # Search box --> results update as you type
+        search_frame = ttk.Frame(self.parent_frame)
+        search_frame.pack(fill="x", padx=10)
+        ttk.Label(search_frame, text="Search:").pack(side="left")
+        self.search_entry = ttk.Entry(search_frame)
+        self.search_entry.pack(side="left", fill="x", expand=True, padx=5)
+        self.search_entry.bind("<KeyRelease>", self._on_search_typed)
+        self.search_entry.bind("<Escape>", lambda event: self._clear_search())
+        ttk.Button(search_frame, text="Clear", command=self._clear_search).pack(side="left")
+
         # Add Post button
+        # note: packed before the list (at the bottom) so the list can't push it off screen
         self.add_post_button = ttk.Button(self.parent_frame, text="Create New Post", command=self._open_add_post_dialog)
-        self.add_post_button.pack(pady=10)
+        self.add_post_button.pack(side="bottom", pady=10)
+
+        # Post list --> only the cards that fit on screen exist, they are reused while scrolling
+        self.post_list_view = VirtualListView(
+            self.parent_frame,
+            data_source=self.feed_source,
+            row_factory=lambda parent: PostCard(parent, self.user_id, self._delete_post, self._open_post),
+            row_height=self.POST_CARD_HEIGHT,
+            empty_text=self.FEED_EMPTY_TEXT
+        )
+        self.post_list_view.pack(fill="both", expand=True, padx=10, pady=5)
 
 
 
@@ -56,51 +105,164 @@ class BulletinUI:
         """
         Opens a new dialog window to add a post.
         """
-        AddPostDialog(self.parent_frame, self.db_manager, self.user_id, self.refresh_post_list)
+        # note: a new post only needs the posts-since check, not a full reload
+        AddPostDialog(self.parent_frame, self.db_manager, self.db_executor, self.user_id, self._post_added)
+
+
+
+    def _open_post(self, post):
+        """
+        Opens a window with the whole post (the card only shows its snippet).
+        """
+        PostDialog(self.parent_frame, self.db_manager, self.db_executor, post)
+
+
+
+    def _post_added(self):
+        # note: with an event bus the new post arrives as a "created" event instead
+        if not self.db_manager.event_bus:
+            self.check_for_new_posts()
 
     def refresh_post_list(self):
        
         """
-        Refreshes the displayed list of posts by fetching them from the database.
+        Refreshes the displayed list of posts, starting again from the newest post.
+        Older posts are loaded as the user scrolls down.
         """
-       
-        # Clear existing posts
-        for widget in self.post_list_frame.winfo_children():
-            widget.destroy()
 
-        posts = self.db_manager.get_posts() # Note: We get all posts, not just for one user.
-        
-        if posts:
-            for post in posts:
-                # Create a frame for each post
-                post_container = ttk.Frame(self.post_list_frame, relief="solid", borderwidth=1, padding=10)
-                post_container.pack(fill="x", padx=10, pady=5)
-
-                # Fetch username for the post
-                username = self.db_manager.get_username_by_id(post['user_id'])
-                
-                # Post Title and Author
-                title_label = ttk.Label(post_container, text=f"Title: {post['title']}", font=("Arial", 12, "bold"))
-                title_label.pack(anchor="w")
-
-                author_label = ttk.Label(post_container, text=f"By: {username or 'Unknown User'}", font=("Arial", 10, "italic"))
-                author_label.pack(anchor="w")
-                
-                # Post Content
-                content_label = ttk.Label(post_container, text=post['content'], wraplength=500)
-                content_label.pack(anchor="w", pady=(5, 10))
-
-                # Delete button for the post author only --> only you can delete your posts not someone else
-                if post['user_id'] == self.user_id:
-                    delete_button = ttk.Button(
-                        post_container,
-                        text="Delete",
-                        command=lambda post_id=post['id']: self._delete_post(post_id)
-                    )
-                    delete_button.pack(side="right")
-        else:
-            no_posts_label = ttk.Label(self.post_list_frame, text="No posts on the bulletin board yet.")
-            no_posts_label.pack(padx=10, pady=10)
+        self.feed_source.reset()
+        if self.search_source:
+            self.search_source.reset() # a new post may match the search too
+        self.post_list_view.reset()
+
+
+
+    def check_for_new_posts(self):
+
+        """
+        Fetches just the posts added (and deleted) since the feed was last
+        loaded or checked, and puts the new ones on top of the list.
+        """
+
+        if self.post_list_view.winfo_exists():
+            self.feed_source.check_for_new_posts(on_done=self._on_new_posts)
+
+
+
+    def _poll_for_new_posts(self):
+
+        """
+        Checks for new posts every POLL_INTERVAL_MS while the tab exists.
+        """
+
+        # note: the tab frame outlives a logout, the list inside it doesn't
+        if not self.post_list_view.winfo_exists():
+            return # logged out --> stop polling
+        self.check_for_new_posts()
+        self.parent_frame.after(self.POLL_INTERVAL_MS, self._poll_for_new_posts)
+
+
+
+    def _on_new_posts(self, added, deleted):
+
+        """
+        Called once the feed has applied the changes from the database.
+
+        Args:
+            added (int): Posts put on top of the feed, or None if too much changed
+                and the feed has to be reloaded.
+            deleted (list): IDs of posts that were deleted.
+        """
+
+        if not self.post_list_view.winfo_exists():
+            return
+        if added is None:
+            self.refresh_post_list()
+            return
+
+        if self.search_source:
+            # new posts only show up in search results on the next search, deleted ones go now
+            removed = 0
+            for post_id in deleted:
+                removed += self.search_source.remove(post_id)
+            if removed:
+                self.post_list_view.refresh()
+        elif added or deleted:
+            self.post_list_view.refresh(rows_inserted_above=added)
+
+
+
+    def _apply_post_events(self, events):
+
+        """
+        Patches the loaded posts with change events from the event bus.
+
+        Args:
+            events (list): ChangeEvents for the posts table.
+        """
+
+        if not self.post_list_view.winfo_exists():
+            return
+        if any(event.action == BULK for event in events):
+            self.check_for_new_posts() # many new posts --> fetch them in one go
+            return
+
+        added, deleted = self.feed_source.apply_events(events)
+        self._on_new_posts(added, deleted)
+
+
+
+    def _on_search_typed(self, event):
+
+        """
+        Waits for a short pause in typing before searching, so we don't run a
+        query for every key press.
+        """
+
+        if self._search_after_id is not None:
+            self.parent_frame.after_cancel(self._search_after_id)
+        self._search_after_id = self.parent_frame.after(self.SEARCH_DELAY_MS, self._run_search)
+
+
+
+    def _run_search(self):
+
+        """
+        Shows the posts matching the search box (or the whole feed when it is empty).
+        """
+
+        self._search_after_id = None
+        query = self.search_entry.get().strip()
+
+        if not query:
+            if self.search_source:
+                # Back to the feed --> its loaded pages were kept, so this is instant
+                self.search_source = None
+                self.post_list_view.set_data_source(self.feed_source, empty_text=self.FEED_EMPTY_TEXT)
+            return
+        if self.search_source and self.search_source.query == query:
+            return # e.g. an arrow key was pressed, the text didn't change
+
+        self.search_source = SearchDataSource(self.db_manager, self.db_executor, self._on_posts_loaded, query)
+        self.post_list_view.set_data_source(self.search_source, empty_text=f"No posts match '{query}'.")
+
+
+
+    def _clear_search(self):
+        self.search_entry.delete(0, tk.END)
+        self._run_search()
+
+
+
+    def _on_posts_loaded(self):
+
+        """
+        Called when a page of posts arrives from the database.
+        """
+
+        # The user may have logged out (destroying this tab) while the page loaded
+        if self.post_list_view.winfo_exists():
+            self.post_list_view.refresh()
 
 
 
@@ -111,9 +273,475 @@ class BulletinUI:
         """
        
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this post?"):
-            self.db_manager.delete_post(post_id)
-            self.refresh_post_list()
-            messagebox.showinfo("Success", "Post deleted!")
+            self.db_executor.submit(
+                self.db_manager.delete_post, post_id,
+                on_success=lambda result: self._post_deleted(post_id)
+            )
+
+
+
+    def _post_deleted(self, post_id):
+
+        """
+        Called once the post has been deleted from the database.
+        """
+
+        # Drop just this post from the loaded rows instead of reloading the feed
+        # note: with an event bus the "deleted" event already did this
+        if not self.db_manager.event_bus:
+            self.feed_source.remove(post_id)
+            if self.search_source:
+                self.search_source.remove(post_id)
+            self.post_list_view.refresh()
+        messagebox.showinfo("Success", "Post deleted!")
+
+
+
+
+class PagedPostSource:
+
+    """
+    Supplies bulletin posts to the VirtualListView. Posts are fetched from the
+    database one page at a time only when the list scrolls near the end of what
+    has been loaded so far. Pages are fetched in the background; on_rows_loaded
+    is called (on the Tk thread) each time one arrives.
+
+    Subclasses say which query to run for the next page (_next_page_request)
+    and remember where the last page ended (_page_position).
+    """
+
+    def __init__(self, db_manager, db_executor, on_rows_loaded, page_size=50):
+
+        """
+        Initializes the data source.
+
+        Args:
+            db_manager (DatabaseManager): An instance of the DatabaseManager.
+            db_executor (DatabaseExecutor): Runs the page queries off the Tk thread.
+            on_rows_loaded (function): Called after a page of posts has been added.
+            page_size (int): Number of posts fetched per page.
+        """
+
+        self.db_manager = db_manager
+        self.db_executor = db_executor
+        self.on_rows_loaded = on_rows_loaded
+        self.page_size = page_size
+        self._generation = 0 # bumped by reset() so pages requested before it are ignored
+        self.reset()
+
+
+
+    def reset(self):
+
+        """
+        Forgets every loaded post so the next request starts again at the first page.
+        """
+
+        self._posts = []
+        self._position = None # where the last loaded page ended, None = start at the first page
+        self._exhausted = False # True once the database has no more posts to give
+        self._loading = False # True while a page request is running
+        self._generation += 1
+
+
+
+    def row_count(self):
+        return len(self._posts)
+
+    def get_row(self, index):
+        return self._posts[index]
+
+
+
+    def ensure_loaded(self, index):
+
+        """
+        Requests the next page if the post at the given position isn't loaded yet.
+        The list is redrawn when the page arrives, which asks again if it still needs more.
+        """
+
+        if index < len(self._posts) or self._exhausted or self._loading:
+            return
+
+        self._loading = True
+        generation = self._generation
+        func, kwargs = self._next_page_request()
+        self.db_executor.submit(
+            func, **kwargs,
+            on_success=lambda posts: self._page_loaded(generation, posts),
+            on_error=lambda error: self._page_failed(generation, error)
+        )
+
+
+
+    def _next_page_request(self):
+
+        """
+        Returns (function, keyword arguments) for the query that loads the next page.
+        """
+
+        raise NotImplementedError
+
+
+
+    def _page_position(self, posts):
+
+        """
+        Returns where the next page starts, given the page that just loaded.
+        """
+
+        raise NotImplementedError
+
+
+
+    def _page_loaded(self, generation, posts):
+
+        """
+        Adds a fetched page to the loaded posts.
+        """
+
+        if generation != self._generation:
+            return # the source was reset while this page was loading
+        self._loading = False
+        self._posts.extend(posts)
+
+        if posts:
+            self._position = self._page_position(posts)
+        # a short page means there is nothing left to load
+        if len(posts) < self.page_size:
+            self._exhausted = True
+
+        self.on_rows_loaded()
+
+
+
+    def _page_failed(self, generation, error):
+        if generation == self._generation:
+            self._loading = False
+        print(f"Error loading posts: {error}")
+
+
+
+    def remove(self, post_id):
+
+        """
+        Removes a post from the loaded rows (e.g. after it was deleted).
+
+        Returns:
+            int: 1 if the post was loaded (and is now removed), otherwise 0.
+        """
+
+        count = len(self._posts)
+        self._posts = [post for post in self._posts if post['id'] != post_id]
+        return count - len(self._posts)
+
+
+
+
+class FeedDataSource(PagedPostSource):
+
+    """
+    The bulletin feed, newest post first. Pages follow on from the
+    (timestamp, id) of the last loaded post (keyset paging).
+
+    It also remembers the newest post id and tombstone id at the time it was
+    loaded, so check_for_new_posts can fetch only what changed since then.
+    """
+
+    def reset(self):
+        super().reset()
+        self._markers = None # (newest post id, newest tombstone id), None until known
+        self._checking = False # True while a posts-since check is running
+
+        # note: asked for before the first page (the executor runs jobs in order), so a
+        # post made in between shows up in the first check and is skipped as a duplicate
+        generation = self._generation
+        self.db_executor.submit(
+            self.db_manager.get_feed_markers,
+            on_success=lambda markers: self._markers_loaded(generation, markers)
+        )
+
+
+
+    def _markers_loaded(self, generation, markers):
+        if generation == self._generation:
+            self._markers = markers
+
+
+
+    def check_for_new_posts(self, on_done):
+
+        """
+        Fetches the posts added and deleted since the last check in the background
+        and applies them to the loaded posts.
+
+        Args:
+            on_done (function): Called with (number of posts added at the top, deleted ids)
+                once they are applied, or with (None, []) if the feed needs a full reload.
+        """
+
+        # Wait for the first page --> until then there is nothing to add to
+        if self._markers is None or self._checking or (self._position is None and not self._exhausted):
+            return
+
+        self._checking = True
+        generation = self._generation
+        after_id, deleted_since = self._markers
+        self.db_executor.submit(
+            self.db_manager.get_posts_since, after_id, deleted_since,
+            on_success=lambda changes: self._changes_loaded(generation, changes, on_done),
+            on_error=lambda error: self._changes_failed(generation, error)
+        )
+
+
+
+    def _changes_loaded(self, generation, changes, on_done):
+
+        """
+        Puts new posts on top of the loaded ones and drops deleted ones.
+        """
+
+        if generation != self._generation:
+            return # the feed was reset while checking
+        self._checking = False
+        if changes is None:
+            return
+        if changes['truncated']:
+            on_done(None, [])
+            return
+
+        self._markers = (changes['latest_id'], changes['deleted_marker'])
+
+        deleted = set(changes['deleted'])
+        if deleted:
+            self._posts = [post for post in self._posts if post['id'] not in deleted]
+
+        loaded_ids = {post['id'] for post in self._posts[:len(changes['posts'])]}
+        new_posts = [post for post in changes['posts'] if post['id'] not in loaded_ids and post['id'] not in deleted]
+        self._posts[:0] = new_posts
+
+        on_done(len(new_posts), changes['deleted'])
+
+
+
+    def apply_events(self, events):
+
+        """
+        Applies created/deleted events from the event bus to the loaded posts.
+
+        Returns:
+            tuple: (number of posts added at the top, ids of every deleted post).
+            note: all of them, like the tombstone check, a post shown in search
+            results may not be in the loaded feed pages
+        """
+
+        deleted = [event.row_id for event in events if event.action == DELETED]
+        deleted_ids = set(deleted)
+        if deleted:
+            self._posts = [post for post in self._posts if post['id'] not in deleted_ids]
+
+        # note: before the first page arrives new posts are left to it (it will include them)
+        added = 0
+        if self._position is not None or self._exhausted:
+            created = [event.data for event in events if event.action == CREATED]
+            loaded_ids = {post['id'] for post in self._posts[:len(created)]}
+            new_posts = [post for post in reversed(created) if post['id'] not in loaded_ids and post['id'] not in deleted_ids]
+            self._posts[:0] = new_posts # newest first, like the feed
+            added = len(new_posts)
+
+        return added, deleted
+
+
+
+    def _changes_failed(self, generation, error):
+        if generation == self._generation:
+            self._checking = False
+        print(f"Error checking for new posts: {error}")
+
+
+
+    def _next_page_request(self):
+        return self.db_manager.get_feed_page, {"before": self._position, "limit": self.page_size}
+
+    def _page_position(self, posts):
+        last = posts[-1]
+        return (last['timestamp'], last['id'])
+
+
+
+
+class SearchDataSource(PagedPostSource):
+
+    """
+    The posts matching a search, best match first. Relevance order has no
+    stable key to page from, so pages follow on by offset.
+    """
+
+    def __init__(self, db_manager, db_executor, on_rows_loaded, query, page_size=50):
+        self.query = query
+        super().__init__(db_manager, db_executor, on_rows_loaded, page_size)
+
+    def _next_page_request(self):
+        # note: a deleted post leaves both the loaded rows and the database's
+        # results, so the number of loaded rows is always the right offset
+        offset = len(self._posts)
+        return self.db_manager.search_posts, {"query": self.query, "limit": self.page_size, "offset": offset}
+
+    def _page_position(self, posts):
+        return len(self._posts)
+
+
+
+
+class PostCard(ttk.Frame):
+
+    """
+    A single post card in the bulletin feed. Cards are reused by the
+    VirtualListView, so show() may be called many times with different posts.
+
+    A card only shows the post's snippet (see records.make_snippet), so every
+    card costs the same to lay out however long the post is. "Read more"
+    opens the whole post.
+    """
+
+    def __init__(self, parent, user_id, on_delete, on_open):
+
+        """
+        Initializes the PostCard.
+
+        Args:
+            parent (tk.Widget): The widget the card is placed in.
+            user_id (int): The ID of the currently logged-in user.
+            on_delete (function): Called with the post ID when Delete is clicked.
+            on_open (function): Called with the post dictionary when Read more is clicked.
+        """
+
+        super().__init__(parent, relief="solid", borderwidth=1, padding=10)
+        self.user_id = user_id
+        self.on_delete = on_delete
+        self.on_open = on_open
+        self.post_id = None
+        self.post = None
+
+        # Post Title and Delete button share the top line
+        top_line = ttk.Frame(self)
+        top_line.pack(fill="x")
+        self.title_label = ttk.Label(top_line, font=("Arial", 12, "bold"))
+        self.title_label.pack(side="left", anchor="w")
+        self.delete_button = ttk.Button(top_line, text="Delete", command=lambda: self.on_delete(self.post_id))
+        self.open_button = ttk.Button(top_line, text="Read more", command=lambda: self.on_open(self.post))
+
+        # Post Author
+        self.author_label = ttk.Label(self, font=("Arial", 10, "italic"))
+        self.author_label.pack(anchor="w")
+
+        # Post Content
+        self.content_label = ttk.Label(self, wraplength=500)
+        self.content_label.pack(anchor="w", pady=(5, 0))
+
+
+
+    def show(self, post):
+
+        """
+        Fills the card with a post's data.
+
+        Args:
+            post (dict): A post dictionary from get_feed_page or search_posts.
+        """
+
+        self.post_id = post['id']
+        self.post = post
+        self.title_label.configure(text=f"Title: {post['title']}")
+        self.author_label.configure(text=f"By: {post['username'] or 'Unknown User'}")
+
+        # Feed posts show their stored snippet, search results the part of the post that matched
+        # note: make_snippet again so even an odd search snippet fits the fixed card height
+        snippet = make_snippet(post['snippet'])
+        self.content_label.configure(text=snippet)
+
+        # Delete button for the post author only --> only you can delete your posts not someone else
+        # note: both are unpacked first so they always come back in the same order
+        self.delete_button.pack_forget()
+        self.open_button.pack_forget()
+        if post['user_id'] == self.user_id:
+            self.delete_button.pack(side="right")
+
+        # Read more only when the snippet left something out (it starts or ends with "...")
+        if snippet.startswith("...") or snippet.endswith("..."):
+            self.open_button.pack(side="right", padx=(0, 5))
+
+
+
+
+class PostDialog(tk.Toplevel):
+
+    """
+    A window showing one whole post. The feed only has the post's snippet, so
+    the full text is loaded (in the background) when the window opens.
+    """
+
+    def __init__(self, parent, db_manager, db_executor, post):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.db_executor = db_executor
+        self.post = post
+
+        self.title(post['title'])
+        self.geometry("550x400")
+
+        self._create_widgets()
+
+        self.db_executor.submit(
+            self.db_manager.get_post_content, post['id'],
+            on_success=self._content_loaded,
+            on_error=lambda error: self._show_text(f"Could not load the post: {error}")
+        )
+
+
+
+    def _create_widgets(self):
+
+        """
+        Creates the title, author and a read-only text box for the content.
+        """
+
+        frame = ttk.Frame(self, padding="10")
+        frame.pack(fill="both", expand=True)
+
+        ttk.Label(frame, text=self.post['title'], font=("Arial", 12, "bold"), wraplength=500).pack(anchor="w")
+        ttk.Label(frame, text=f"By: {self.post['username'] or 'Unknown User'}  -  {self.post['timestamp']}",
+                  font=("Arial", 10, "italic")).pack(anchor="w", pady=(0, 10))
+
+        ttk.Button(frame, text="Close", command=self.destroy).pack(side="bottom", pady=(10, 0))
+
+        text_frame = ttk.Frame(frame)
+        text_frame.pack(fill="both", expand=True)
+        self.content_text = tk.Text(text_frame, wrap="word", width=60, height=15)
+        scrollbar = ttk.Scrollbar(text_frame, orient="vertical", command=self.content_text.yview)
+        self.content_text.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.content_text.pack(side="left", fill="both", expand=True)
+        self._show_text("Loading...")
+
+
+
+    def _content_loaded(self, content):
+        if content is None:
+            self._show_text("This post has been deleted.")
+        else:
+            self._show_text(content)
+
+
+
+    def _show_text(self, text):
+        # note: the window may have been closed while the content was loading
+        if not self.winfo_exists():
+            return
+        self.content_text.configure(state="normal")
+        self.content_text.delete("1.0", tk.END)
+        self.content_text.insert("1.0", text)
+        self.content_text.configure(state="disabled")
 
 
 
@@ -124,10 +752,11 @@ class AddPostDialog(tk.Toplevel):
     A dialog window for adding a new bulletin board post.
     """
 
-    def __init__(self, parent, db_manager, user_id, on_post_added):
+    def __init__(self, parent, db_manager, db_executor, user_id, on_post_added):
         super().__init__(parent)
         self.parent = parent
         self.db_manager = db_manager
+        self.db_executor = db_executor
         self.user_id = user_id
         self.on_post_added = on_post_added
 
@@ -160,8 +789,8 @@ class AddPostDialog(tk.Toplevel):
         self.content_text.pack(pady=(0, 10), fill="both", expand=True)
 
         # --- Create Post Button ---
-        create_button = ttk.Button(frame, text="Create Post", command=self._add_post)
-        create_button.pack(pady=(10, 0))
+        self.create_button = ttk.Button(frame, text="Create Post", command=self._add_post)
+        self.create_button.pack(pady=(10, 0))
 
 
 
@@ -178,10 +807,21 @@ class AddPostDialog(tk.Toplevel):
             messagebox.showerror("Input Error", "Title and content are required.")
             return
 
-        try:
-            self.db_manager.add_post(self.user_id, title, content)
-            messagebox.showinfo("Success", "Post created successfully!")
-            self.on_post_added()  # Call the refresh function
-            self.destroy() # Close the dialog
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to add post: {e}")
+        # Save in the background --> button is disabled so the post can't be sent twice
+        self.create_button.state(["disabled"])
+        self.db_executor.submit(
+            self.db_manager.add_post, self.user_id, title, content,
+            on_success=self._post_saved,
+            on_error=self._post_failed
+        )
+
+
+
+    def _post_saved(self, result):
+        messagebox.showinfo("Success", "Post created successfully!")
+        self.on_post_added()  # Call the refresh function
+        self.destroy() # Close the dialog
+
+    def _post_failed(self, error):
+        self.create_button.state(["!disabled"])
+        messagebox.showerror("Error", f"Failed to add post: {error}")
@@ -0,0 +1,179 @@
+# change_monitor.py
+
+import sqlite3 # imports library for working with SQLite databases
+import threading
+
+
+class ChangeMonitor(threading.Thread):
+
+    """
+    Background thread that notices when the database was changed, including
+    by other CampusLink windows running on the same database file, and tells
+    whoever subscribed which tables changed.
+
+    Every interval it reads PRAGMA data_version on its own idle connection.
+    sqlite bumps that number whenever any OTHER connection commits, so when
+    it hasn't moved nothing has changed and the check costs next to nothing.
+    Only when it moved does the monitor read the per-table counters in
+    table_versions (migration 6) to find out which tables changed.
+
+    The app's own writes reach its views through the event bus already. With
+    local_counters (DatabaseManager.read_change_counters) the monitor leaves
+    those out and only reports tables that changed more than this app changed
+    them, i.e. changes from other processes.
+
+    Usage:
+        monitor = ChangeMonitor(db_path, deliver=db_executor.call_in_ui,
+                                local_counters=db_manager.read_change_counters)
+        monitor.start()
+        token = monitor.subscribe("posts", self.check_for_new_posts)
+        ...
+        monitor.unsubscribe(token)
+    """
+
+    def __init__(self, db_path, deliver=None, interval=1.0, local_counters=None):
+
+        """
+        Initializes the ChangeMonitor. Call start() to begin watching.
+
+        Args:
+            db_path (str): The full file path to the SQLite database file.
+            deliver (function): Called as deliver(callback, table) to run a subscriber's
+                callback, e.g. DatabaseExecutor.call_in_ui so callbacks run on the Tk
+                thread. If None, callbacks run on the monitor thread.
+            interval (float): Seconds between checks.
+            local_counters (function): Returns {table: (version, changes made by this app)}.
+                If None every change is reported, this app's own ones too.
+        """
+
+        super().__init__(name="change-monitor", daemon=True)
+        self.db_path = db_path
+        self.deliver = deliver
+        self.interval = interval
+        self.local_counters = local_counters
+
+        self._subscribers = {} # token -> (table, callback)
+        self._next_token = 0
+        self._lock = threading.Lock() # protects _subscribers
+        self._stop_event = threading.Event()
+        self._data_version = None
+        self._versions = {} # table name -> (last counter seen, how much of it was this app)
+        self.check_count = 0 # how many checks ran (handy when debugging)
+        self.change_count = 0 # how many of them found a change
+
+
+
+    def subscribe(self, table, callback):
+
+        """
+        Registers callback(table) to be called whenever the table changes.
+
+        Args:
+            table (str): 'users', 'tasks', 'posts' or 'events'.
+            callback (function): Called with the table name after a change.
+
+        Returns:
+            int: A token to pass to unsubscribe().
+        """
+
+        with self._lock:
+            self._next_token += 1
+            self._subscribers[self._next_token] = (table, callback)
+            return self._next_token
+
+
+
+    def unsubscribe(self, token):
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+
+
+    def run(self):
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA query_only = 1")
+            # Remember where things stand now, only later changes are reported
+            self._data_version = self._read_data_version(conn)
+            self._versions = self._read_versions(conn)
+        except sqlite3.Error as e:
+            print(f"Error starting the change monitor: {e}")
+            return
+
+        try:
+            while not self._stop_event.wait(self.interval):
+                self.check(conn)
+        finally:
+            conn.close()
+
+
+
+    def check(self, conn):
+
+        """
+        Runs one check and notifies the subscribers of every table that changed.
+
+        Returns:
+            list: The names of the tables that changed.
+        """
+
+        try:
+            self.check_count += 1
+            data_version = self._read_data_version(conn)
+            if data_version == self._data_version:
+                return [] # nobody committed anything since the last check
+            self._data_version = data_version
+
+            versions = self._read_versions(conn)
+        except sqlite3.Error as e:
+            print(f"Error checking for database changes: {e}")
+            return []
+
+        changed = [table for table, counters in versions.items() if self._changed_elsewhere(table, *counters)]
+        self._versions = versions
+        if changed:
+            self.change_count += 1
+            for table in changed:
+                self._notify(table)
+        return changed
+
+
+
+    def _read_data_version(self, conn):
+        return conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _read_versions(self, conn):
+        if self.local_counters:
+            return self.local_counters()
+        return {table: (version, 0) for table, version in conn.execute("SELECT table_name, version FROM table_versions")}
+
+    def _changed_elsewhere(self, table, version, local):
+        # note: if the counter went up by more than this app's own writes, someone else changed the table too
+        if table not in self._versions:
+            return True
+        last_version, last_local = self._versions[table]
+        return version - last_version > local - last_local
+
+
+
+    def _notify(self, table):
+
+        """
+        Calls every subscriber of a table (through deliver, if given).
+        """
+
+        with self._lock:
+            callbacks = [callback for subscribed, callback in self._subscribers.values() if subscribed == table]
+        for callback in callbacks:
+            if self.deliver:
+                self.deliver(callback, table)
+            else:
+                try:
+                    callback(table)
+                except Exception as e:
+                    print(f"Error in change callback: {e}")
+
+
+
+    def stop(self):
+        self._stop_event.set()
@@ -0,0 +1,404 @@
+# connection_manager.py
+
+import os
+import sqlite3 # imports library for working with SQLite databases
+import threading # locks so connections can be shared safely
+from contextlib import contextmanager
+
+
+
+class PerformanceProfile:
+
+    """
+    The SQLite settings (PRAGMAs) applied to every connection the
+    ConnectionManager opens, plus the background WAL checkpoint policy.
+
+    The default profile uses WAL journaling with synchronous=NORMAL: a commit
+    only appends to the -wal file instead of fsyncing the database several
+    times, and readers no longer wait behind writers. Use SAFE_PROFILE for
+    setups where WAL can't work (e.g. the database is on a network drive).
+    """
+
+    def __init__(self, journal_mode="WAL", synchronous="NORMAL", mmap_size=256 * 1024 * 1024,
+                 cache_size=-64000, temp_store="MEMORY", busy_timeout=5000,
+                 checkpoint_interval=2.0, wal_size_limit=64 * 1024 * 1024):
+
+        """
+        Args:
+            journal_mode (str): 'WAL' or one of sqlite's rollback journal modes ('DELETE', ...).
+            synchronous (str): 'OFF', 'NORMAL' or 'FULL'. NORMAL is crash-safe in WAL mode.
+            mmap_size (int): Bytes of the database file to memory-map (0 turns it off).
+            cache_size (int): Page cache size. Negative means KiB (-64000 = about 64 MB).
+            temp_store (str): Where temporary tables/indexes for sorting go ('MEMORY' or 'FILE').
+            busy_timeout (int): Milliseconds to wait for a lock before giving up.
+            checkpoint_interval (float): Seconds between background WAL checkpoints
+                (None turns off background checkpointing).
+            wal_size_limit (int): Bytes the -wal file may grow to before the background
+                checkpoint truncates it.
+        """
+
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.mmap_size = mmap_size
+        self.cache_size = cache_size
+        self.temp_store = temp_store
+        self.busy_timeout = busy_timeout
+        self.checkpoint_interval = checkpoint_interval
+        self.wal_size_limit = wal_size_limit
+
+    @property
+    def uses_wal(self):
+        return self.journal_mode.upper() == "WAL"
+
+
+
+    def apply(self, conn, writer=False):
+
+        """
+        Applies the profile's PRAGMAs to a connection.
+
+        Args:
+            conn (sqlite3.Connection): The connection to configure.
+            writer (bool): True for the writer connection. The journal mode is stored
+                in the database file, so only the writer sets it.
+        """
+
+        # note: PRAGMAs can't take ? parameters, every value here comes from our own settings
+        if writer:
+            conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+            conn.execute(f"PRAGMA journal_size_limit = {int(self.wal_size_limit)}")
+            if self.uses_wal and self.checkpoint_interval:
+                # The background checkpointer keeps the WAL short, so commits
+                # never have to stop and checkpoint themselves
+                conn.execute("PRAGMA wal_autocheckpoint = 0")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size = {int(self.cache_size)}")
+        conn.execute(f"PRAGMA temp_store = {self.temp_store}")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+
+
+
+# The profile used unless the app asks for another one
+DEFAULT_PROFILE = PerformanceProfile()
+
+# Plain rollback journal with full fsyncs (sqlite's own defaults), no background checkpoints
+SAFE_PROFILE = PerformanceProfile(journal_mode="DELETE", synchronous="FULL", checkpoint_interval=None)
+
+
+
+class WalCheckpointer(threading.Thread):
+
+    """
+    Background thread that checkpoints the WAL (copies its pages back into the
+    database file) every few seconds, so the -wal file can't grow without bound.
+    It uses its own connection so checkpoints never hold up the writer.
+    """
+
+    def __init__(self, db_path, profile):
+        super().__init__(name="wal-checkpointer", daemon=True)
+        self.db_path = db_path
+        self.profile = profile
+        self._stop_event = threading.Event()
+        self.checkpoint_count = 0 # how many checkpoints ran (handy when debugging)
+
+
+
+    def run(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute(f"PRAGMA busy_timeout = {int(self.profile.busy_timeout)}")
+            while not self._stop_event.wait(self.profile.checkpoint_interval):
+                self.checkpoint(conn)
+        finally:
+            conn.close()
+
+
+
+    def checkpoint(self, conn):
+
+        """
+        Runs one checkpoint. PASSIVE never blocks readers or the writer. Once the
+        WAL is over the size limit we use TRUNCATE, which also shrinks the file.
+        """
+
+        try:
+            wal_path = self.db_path + "-wal"
+            wal_size = os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+            if wal_size == 0:
+                return
+            mode = "TRUNCATE" if wal_size > self.profile.wal_size_limit else "PASSIVE"
+            conn.execute(f"PRAGMA wal_checkpoint({mode})")
+            self.checkpoint_count += 1
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error checkpointing the database: {e}")
+
+
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class ConnectionManager:
+
+    """
+    Owns every SQLite connection the CampusLink app uses.
+
+    There is exactly one writer connection (all INSERT/UPDATE/DELETE go through it,
+    one caller at a time) plus a small pool of read connections that are handed
+    out and returned. The main app creates one ConnectionManager at startup and
+    closes it on shutdown, so the number of open connections never grows no
+    matter how many times users log in and out or open dialogs.
+    """
+
+    def __init__(self, db_path, read_pool_size=2, profile=None):
+
+        """
+        Constructor. Opens the writer connection. Read connections are opened
+        the first time they are needed.
+
+        Args:
+            db_path (str): The full file path to the SQLite database file.
+            read_pool_size (int): The maximum number of read connections.
+            profile (PerformanceProfile): SQLite settings for every connection
+                (DEFAULT_PROFILE if None).
+        """
+
+        self.db_path = db_path
+        self.read_pool_size = read_pool_size
+        self.profile = profile or DEFAULT_PROFILE
+        self.checkpointer = None
+
+        self._writer_lock = threading.RLock() # only one writer at a time
+        self._local = threading.local() # per-thread transaction() nesting depth
+        self._pool_lock = threading.Condition() # protects the reader pool below
+        self._idle_readers = [] # read connections not currently handed out
+        self._reader_count = 0 # read connections opened so far
+        self._closed = False
+        self._trace_callback = None # set_trace_callback() --> sees every statement on every connection
+
+        # The writer connection is opened right away so problems show up at startup
+        # note: check_same_thread=False lets background threads use the connection,
+        # the locks above make sure only one thread uses it at a time
+        self.writer_connection = None
+        try:
+            self.writer_connection = self._connect(writer=True)
+            print(f"Database connection established to {db_path}")
+        except sqlite3.Error as e:
+            print(f"Error connecting to the database: {e}")
+            return
+
+        # Keep the WAL from growing without bound (an in-memory database has no WAL)
+        if self.profile.uses_wal and self.profile.checkpoint_interval and db_path != ":memory:":
+            self.checkpointer = WalCheckpointer(db_path, self.profile)
+            self.checkpointer.start()
+
+
+
+    def _connect(self, writer=False):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.profile.apply(conn, writer=writer)
+        if not writer:
+            # read connections can never change anything by accident
+            conn.execute("PRAGMA query_only = 1")
+        return conn
+
+
+
+    @contextmanager
+    def writer(self):
+
+        """
+        Context manager that hands out the writer connection, blocking until no
+        one else is using it.
+
+        Usage:
+            with connection_manager.writer() as conn:
+                conn.execute(...)
+                conn.commit()
+        """
+
+        with self._writer_lock:
+            try:
+                yield self.writer_connection
+            except Exception:
+                # Don't leave a half-finished transaction open on the shared connection
+                # note: inside transaction() the failed statement was already undone by
+                # sqlite, the transaction itself decides whether to roll back
+                if self.writer_connection and self.writer_connection.in_transaction and not self.in_transaction_block:
+                    self.writer_connection.rollback()
+                raise
+
+
+
+    @contextmanager
+    def transaction(self):
+
+        """
+        Context manager that holds the writer connection for several writes and
+        commits them together as ONE transaction (one fsync instead of one per write).
+        Rolls everything back if the block raises. Nested blocks join the outer one.
+
+        Usage:
+            with connection_manager.transaction() as conn:
+                conn.execute(...)
+                conn.execute(...)
+        """
+
+        with self.writer() as conn:
+            outermost = not self.in_transaction_block
+            self._local.transaction_depth = getattr(self._local, "transaction_depth", 0) + 1
+            try:
+                if outermost and not conn.in_transaction:
+                    conn.execute("BEGIN")
+                yield conn
+                if outermost:
+                    conn.commit()
+            except BaseException:
+                if outermost and conn.in_transaction:
+                    conn.rollback()
+                raise
+            finally:
+                self._local.transaction_depth -= 1
+
+
+
+    @property
+    def in_transaction_block(self):
+
+        """
+        True while the calling thread is inside a transaction() block. Writes
+        made then must not commit on their own.
+        """
+
+        return getattr(self._local, "transaction_depth", 0) > 0
+
+
+
+    @contextmanager
+    def reader(self):
+
+        """
+        Context manager that borrows a read connection from the pool and gives
+        it back afterwards. Waits if every read connection is in use.
+        """
+
+        # An in-memory database only exists inside its own connection,
+        # so reads have to share the writer connection
+        if self.db_path == ":memory:":
+            with self.writer() as conn:
+                yield conn
+            return
+
+        conn = self._checkout_reader()
+        try:
+            yield conn
+        finally:
+            self._return_reader(conn)
+
+
+
+    def _checkout_reader(self):
+
+        """
+        Takes an idle read connection, opens a new one if the pool is not full,
+        or waits for one to be returned.
+        """
+
+        with self._pool_lock:
+            while True:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Connection manager is closed.")
+                if self._idle_readers:
+                    conn = self._idle_readers.pop()
+                    # note: done here rather than in set_trace_callback(), a borrowed
+                    # connection may be busy on another thread at that moment
+                    conn.set_trace_callback(self._trace_callback)
+                    return conn
+                if self._reader_count < self.read_pool_size:
+                    conn = self._connect()
+                    conn.set_trace_callback(self._trace_callback)
+                    self._reader_count += 1
+                    return conn
+                self._pool_lock.wait()
+
+
+
+    def _return_reader(self, conn):
+
+        """
+        Puts a read connection back in the pool (or closes it if we are shutting down).
+        """
+
+        with self._pool_lock:
+            if self._closed:
+                conn.close()
+                self._reader_count -= 1
+            else:
+                self._idle_readers.append(conn)
+            self._pool_lock.notify()
+
+
+
+    def set_trace_callback(self, callback):
+
+        """
+        Installs an sqlite trace callback on every connection: the writer right
+        away, read connections the next time they are handed out. callback(sql)
+        is called on the thread running each statement as it starts (used by
+        QueryStats). None removes it again.
+        """
+
+        self._trace_callback = callback
+        with self._writer_lock:
+            if self.writer_connection:
+                self.writer_connection.set_trace_callback(callback)
+
+
+
+    def open_connection_count(self):
+
+        """
+        Returns how many connections are open right now (writer + readers).
+        Useful for checking that nothing leaks.
+        """
+
+        with self._pool_lock:
+            return self._reader_count + (1 if self.writer_connection else 0)
+
+
+
+    def close(self):
+
+        """
+        Closes every connection. Read connections that are still borrowed are
+        closed as soon as they are returned.
+        """
+
+        with self._pool_lock:
+            if self._closed:
+                return
+            self._closed = True
+            for conn in self._idle_readers:
+                conn.close()
+                self._reader_count -= 1
+            self._idle_readers = []
+            self._pool_lock.notify_all()
+
+        # Stop the background checkpointer before the final checkpoint
+        if self.checkpointer:
+            self.checkpointer.stop()
+            self.checkpointer.join()
+            self.checkpointer = None
+
+        with self._writer_lock:
+            if self.writer_connection:
+                # Fold the WAL back into the database file so it is left tidy
+                if self.profile.uses_wal:
+                    try:
+                        self.writer_connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                    except sqlite3.Error as e:
+                        print(f"Error checkpointing the database: {e}")
+                self.writer_connection.close()
+                self.writer_connection = None
+                print("Database connection closed.")
@@ -0,0 +1,228 @@
+# credentials.py
+
+import hashlib # scrypt (and sha256 for old accounts)
+import hmac # constant-time comparison
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Stored password hashes look like: scrypt$<n>$<r>$<p>$<salt hex>$<hash hex>
+# Accounts created before this module have a plain 64-character SHA-256 hex
+# digest instead; those are upgraded the next time the user logs in.
+SCHEME = "scrypt"
+
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+# Limits for the calibrated cost factor n (always a power of two)
+# note: 2**14 is the least we accept even on a slow machine, 2**17 already needs 128 MB per hash
+MIN_N = 2 ** 14
+MAX_N = 2 ** 17
+
+# Cost for initial secrets made in bulk at the start of a term (roster.py)
+# note: below MIN_N on purpose, about 8 ms per hash, so 20,000 accounts take around
+# 20 s on 8 cores instead of minutes. These hashes never stay: the app's own cost is
+# never below MIN_N, so verify_password reports them as needing a rehash and
+# check_user stores a full-cost hash the first time the student logs in.
+PROVISIONING_N = 2 ** 11
+
+
+
+class PasswordHasher:
+
+    """
+    Hashes and checks passwords with scrypt, a salted and memory-hard key
+    derivation function: guessing passwords from a stolen database costs an
+    attacker real time and memory for every single guess.
+
+    The cost factor n is calibrated on this machine the first time it is
+    needed, so one hash takes about target_ms. Hashing runs on a small pool of
+    worker threads (hashlib.scrypt releases the GIL while it works), and the
+    pool size also limits how much memory concurrent logins can use.
+
+    Usage:
+        hasher = PasswordHasher()
+        stored = hasher.hash_password("secret")
+        matches, needs_rehash = hasher.verify_password("secret", stored)
+    """
+
+    def __init__(self, target_ms=100, n=None, r=8, p=1, max_workers=2):
+
+        """
+        Initializes the PasswordHasher. The worker pool starts on first use.
+
+        Args:
+            target_ms (float): How long one hash should take on this machine (used to calibrate n).
+            n (int): A fixed cost factor (power of two) instead of calibrating one.
+            r (int): scrypt block size.
+            p (int): scrypt parallelization.
+            max_workers (int): Most hashes computed at the same time.
+        """
+
+        self.target_ms = target_ms
+        self.r = r
+        self.p = p
+        self._n = n
+        self._calibrate_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+
+
+
+    @property
+    def n(self):
+
+        """
+        The cost factor new hashes are made with (calibrated on first use).
+        """
+
+        if self._n is None:
+            with self._calibrate_lock:
+                if self._n is None:
+                    self._n = self.calibrate()
+        return self._n
+
+
+
+    def calibrate(self):
+
+        """
+        Times one hash at MIN_N and picks the largest power of two that stays
+        within target_ms on this machine (between MIN_N and MAX_N).
+
+        Returns:
+            int: The cost factor.
+        """
+
+        started = time.perf_counter()
+        _scrypt("calibration", os.urandom(SALT_BYTES), MIN_N, self.r, self.p)
+        took_ms = (time.perf_counter() - started) * 1000
+
+        # note: scrypt's time grows linearly with n
+        n = MIN_N
+        while n * 2 <= MAX_N and took_ms * (n * 2 // MIN_N) <= self.target_ms:
+            n *= 2
+        print(f"Password hashing calibrated: scrypt n={n} (about {took_ms * n / MIN_N:.0f} ms per hash).")
+        return n
+
+
+
+    def hash_password(self, password):
+
+        """
+        Hashes a password with a new random salt (on the worker pool, waits for the result).
+
+        Returns:
+            str: The string to store in users.password_hash.
+        """
+
+        return self.submit_hash(password).result()
+
+
+
+    def verify_password(self, password, stored_hash):
+
+        """
+        Checks a password against a stored hash (on the worker pool, waits for the result).
+
+        Returns:
+            tuple: (matches, needs_rehash). needs_rehash is True when the password
+                matched but the stored hash is an old SHA-256 one or was made with a
+                lower cost than we use now --> store a fresh hash_password().
+        """
+
+        return self.submit_verify(password, stored_hash).result()
+
+
+
+    def submit_hash(self, password):
+
+        """
+        Like hash_password(), but returns a Future instead of waiting.
+        """
+
+        return self._pool.submit(self._hash, password)
+
+
+
+    def submit_verify(self, password, stored_hash):
+
+        """
+        Like verify_password(), but returns a Future instead of waiting.
+        """
+
+        return self._pool.submit(self._verify, password, stored_hash)
+
+
+
+    def _hash(self, password):
+        return make_hash(password, self.n, self.r, self.p)
+
+
+
+    def _verify(self, password, stored_hash):
+        if is_legacy_hash(stored_hash):
+            legacy = hashlib.sha256(password.encode()).hexdigest()
+            matches = hmac.compare_digest(legacy, stored_hash.lower())
+            return matches, matches
+
+        try:
+            scheme, n, r, p, salt, expected = stored_hash.split("$")
+            if scheme != SCHEME:
+                raise ValueError(f"unknown hash scheme '{scheme}'")
+            derived = _scrypt(password, bytes.fromhex(salt), int(n), int(r), int(p), len(bytes.fromhex(expected)))
+            expected = bytes.fromhex(expected)
+            n, r, p = int(n), int(r), int(p)
+        except ValueError as e:
+            # note: a damaged or unknown hash never matches
+            print(f"Error checking password: the stored hash can't be used ({e}).")
+            return False, False
+
+        matches = hmac.compare_digest(derived, expected)
+        weaker = n < self.n or r != self.r or p != self.p
+        return matches, matches and weaker
+
+
+
+    def close(self):
+
+        """
+        Stops the worker pool (hashes already running finish first).
+        """
+
+        self._pool.shutdown(wait=True)
+
+
+
+def make_hash(password, n, r=8, p=1):
+
+    """
+    Hashes a password with a new random salt and the given scrypt cost, right
+    here on the calling thread. Most code should use a PasswordHasher instead
+    (calibrated cost, worker pool); this is for worker processes (see roster.py).
+
+    Returns:
+        str: The string to store in users.password_hash.
+    """
+
+    salt = os.urandom(SALT_BYTES)
+    derived = _scrypt(password, salt, n, r, p)
+    return f"{SCHEME}${n}${r}${p}${salt.hex()}${derived.hex()}"
+
+
+
+def is_legacy_hash(stored_hash):
+
+    """
+    Returns True for a hash from before scrypt: a bare 64-character SHA-256 hex digest.
+    """
+
+    return len(stored_hash) == 64 and "$" not in stored_hash
+
+
+
+def _scrypt(password, salt, n, r, p, length=HASH_BYTES):
+    # note: scrypt needs about 128 * r * n bytes, maxmem has to allow that (the default is only 32 MB)
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=128 * r * (n + p + 2) + 1024 * 1024, dklen=length)
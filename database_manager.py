@@ -2,39 +2,86 @@
 
 
 import sqlite3 # imports library for working with SQLite databases
-import hashlib # Used for securely hashing passwords
 import os
+import re # for splitting search text into words
+import calendar # for event times in minutes (see get_events_between)
 import datetime # for timestamps on posts
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from connection_manager import ConnectionManager
+from credentials import PasswordHasher
+from group_commit import GroupCommitter
+from identity_cache import IdentityCache
+from records import TaskRecord, PostRecord, make_snippet
+from event_bus import ChangeEvent, CREATED, UPDATED, DELETED, BULK
+from migrations import LATEST_VERSION, add_local_change_counters, apply_migrations, get_schema_version
+
+# How event start/end times are stored (and compared, as text)
+EVENT_TIME_FORMAT = "%Y-%m-%d %H:%M"
 
 class DatabaseManager:
     """
     Manages all database interactions for the CampusLink app, including
     creating tables, adding users, and verifying credentials.
     """
+
+    POST_CONTENT_CACHE_SIZE = 32 # full post bodies kept after get_post_content (most recently opened)
   
-    def __init__(self, db_path):
+    def __init__(self, db_path=None, connection_manager=None, event_bus=None, password_hasher=None):
         
         """
         Constructor. Initializes the database connection.
         
         Args:
             db_path (str): The full file path to the SQLite database file.
+                Only used when no connection_manager is given.
+            connection_manager (ConnectionManager): The app's shared connection manager.
+                If None, the DatabaseManager opens (and later closes) its own.
+            event_bus (EventBus): If given, every created/updated/deleted row is
+                published on it so open views can update themselves.
+            password_hasher (PasswordHasher): Hashes and checks passwords. If None,
+                the DatabaseManager makes (and later closes) its own.
         """
         
+        # Use the shared connection manager if one was passed in, otherwise make our own
+        # note: the main app owns one ConnectionManager and passes it to everything,
+        # so logging in/out or opening dialogs never opens extra connections
+        self._owns_connections = connection_manager is None
+        if connection_manager is None:
+            connection_manager = ConnectionManager(db_path)
+        self.connections = connection_manager
+
         # Create variable to hold database connection
-        self.conn = None # initializes instance variable None
-        
-        # Define error handling block to catch any problems that might occur when trying to connect
-        # to the database. if something goes wrong we'll print error message
-        try:
-            # Connect to the database file
-            self.conn = sqlite3.connect(db_path)
-            # Create a cursor object to execute SQL commands
-            self.cursor = self.conn.cursor()
-            print(f"Database connection established to {db_path}")
+        # note: this is the writer connection, None if connecting failed
+        self.conn = self.connections.writer_connection
 
-        except sqlite3.Error as e:
-            print(f"Error connecting to the database: {e}")
+        # Set by enable_group_commit() --> merges single-row writes into shared commits
+        self.group_committer = None
+
+        # Set by enable_query_stats() --> times every call and statement, logs slow ones
+        self.query_stats = None
+        self._timed_methods = []
+
+        # Where row change events go (None = nobody is listening)
+        self.event_bus = event_bus
+        self._local = threading.local() # events held back until a transaction() block commits
+
+        # Remembers user id <-> username so repeated lookups don't touch the database
+        self.identity_cache = IdentityCache()
+
+        # Which full-text search indexes exist (each looked up on its first search)
+        self._search_indexes = {}
+
+        # Full text of the posts opened last, post id -> content (least recently used first)
+        # note: posts are never edited and ids never reused (AUTOINCREMENT), so an
+        # entry can only go stale by its post being deleted
+        self._post_contents = OrderedDict()
+        self._post_contents_lock = threading.Lock()
+
+        # Salted scrypt password hashing on its own worker threads (see credentials.py)
+        self._owns_password_hasher = password_hasher is None
+        self.password_hasher = password_hasher or PasswordHasher()
 
 
 
@@ -42,8 +89,9 @@ class DatabaseManager:
     def create_tables(self):
         
         """
-        Creates the necessary tables for the application if they don't exist.
-        This includes a 'users' table for authentication.
+        Brings the database schema up to date by applying any pending migrations
+        (see migrations.py). This creates the tables on a new database.
+        When the schema is already current, no DDL runs at all.
         """
         
         # Check connection to db, if none stop
@@ -53,90 +101,14 @@ class DatabaseManager:
 
 
         try:
-
-            # ----- Table for user authentication ---
-
-            # SQL to create the users table
-            # We store a hashed password instead of the plain-text password 
-            # for security.
-            
-            # 1. creates table named "users" only if doesnt exist already
-            # columns:
-            # 2. id : creates a unique id for each user --> auto increments 
-            # for every user
-            #    note: serves as "primary key". identifies each row (user)
-            # 3. username: stores the username as text
-            #    note: NOT NULL means it cant be empty 
-            #    note: UNIQUE means no two users can have same username
-            # 4. password_hash: stores the hased password as non empty text
-
-
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT NOT NULL UNIQUE,
-                    password_hash TEXT NOT NULL
-                )
-            ''')
-
-
-
-            # --- Table for the user's activities and tasks ---
-            
-            # SQL to crete table for users actvities and tasks
-            # Defining tasks table (linked to the users table via user id)
-
-            # 1. creates table named "tasks" only if it doesnt exist already
-            # columns: 
-            # 2. id: unique identifier for each task ("name" of first column)
-            # 3. user_id: will store the ID of the user who "owns" the task
-            # thus linking this task back to a specific entry in the users table
-            # 4. task_name: will store the title or name of the task
-            #    note: stored as text with rule preventing empty task entry
-            # 5. description: for storing details of task
-            #    note: stored as text but optional (can be left empty)
-            # 6. due_date: for storing the due data of a task
-            # 7. is_completed: track the completion status of the task
-            #    note: 0 - false (not completed)
-            #    note: 1 - true (completed)
-            #    note: every task must have a completion status
-            #    note: each task is auto set to 0 (not completed)
-            # 8. declares user_id as 'FOREIGN_KEY'
-            #    note: links tables
-            #    note: tells db that user_id in this table must coorespond to
-            # existing id in the users table. preventing tasks from being
-            # created by users that dont exist
-
-
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS tasks (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    task_name TEXT NOT NULL,
-                    description TEXT,
-                    due_date TEXT,
-                    is_completed BOOLEAN NOT NULL DEFAULT 0,
-                    FOREIGN KEY (user_id) REFERENCES users(id)
-                )
-            ''')
-
-
-            
-            # ----- Table for bulletin board posts -----
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS posts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    title TEXT NOT NULL,
-                    content TEXT NOT NULL,
-                    timestamp TEXT NOT NULL,
-                    FOREIGN KEY (user_id) REFERENCES users(id)
-                )
-            ''')
-        
-
-            self.conn.commit() # commits changes to table
-            print("Tables created successfully.")
+            with self.connections.writer() as conn:
+                # Cheap check first --> a single header read when nothing needs to change
+                if get_schema_version(conn) >= LATEST_VERSION:
+                    print("Database schema is up to date.")
+                    return
+
+                applied = apply_migrations(conn)
+                print(f"Tables created successfully (schema version {applied[-1] if applied else LATEST_VERSION}).")
         
         except sqlite3.Error as e:
             print(f"Error creating tables: {e}")
@@ -158,11 +130,20 @@ class DatabaseManager:
 
         if self.conn is None:
             return None
+
+        user_id = self.identity_cache.get_user_id(username)
+        if user_id is not None:
+            return user_id
         
         try:
-            self.cursor.execute("SELECT id FROM users WHERE username = ?", (username,))
-            result = self.cursor.fetchone()
-            return result[0] if result else None
+            with self.connections.reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT id FROM users WHERE username = ?", (username,))
+                result = cursor.fetchone()
+                if not result:
+                    return None
+                self.identity_cache.put(result[0], username)
+                return result[0]
 
         except sqlite3.Error as e:
             print(f"Error getting user ID: {e}")
@@ -182,10 +163,20 @@ class DatabaseManager:
         """
         if self.conn is None:
             return None
+
+        username = self.identity_cache.get_username(user_id)
+        if username is not None:
+            return username
+
         try:
-            self.cursor.execute("SELECT username FROM users WHERE id = ?", (user_id,))
-            result = self.cursor.fetchone()
-            return result[0] if result else None
+            with self.connections.reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT username FROM users WHERE id = ?", (user_id,))
+                result = cursor.fetchone()
+                if not result:
+                    return None
+                self.identity_cache.put(user_id, result[0])
+                return result[0]
         except sqlite3.Error as e:
             print(f"Error getting username by ID: {e}")
             return None
@@ -196,6 +187,7 @@ class DatabaseManager:
         """
         Adds a new user to the database (USERS table). The password is first hashed
         for security before being stored.
+        note: hashing takes about 100 ms on purpose, call this off the Tk thread
         
         Args:
             username (str): The new user's username.
@@ -210,13 +202,15 @@ class DatabaseManager:
             print("Database connection is not active.")
             return False
 
-        # Hash the password using a secure hashing algorithm (SHA-256)
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
+        # Hash the password with a random salt (scrypt, on the password hasher's worker threads)
+        password_hash = self.password_hasher.hash_password(password)
         
         # Insert and commit data (new user) into db
         try:
-            self.cursor.execute("INSERT INTO users (username, password_hash) VALUES (?, ?)", (username, password_hash))
-            self.conn.commit()
+            user_id, rowcount = self._execute_write("INSERT INTO users (username, password_hash) VALUES (?, ?)", (username, password_hash))
+            # the new user is very likely to log in next --> cache them right away
+            self.identity_cache.put(user_id, username)
+            self._emit("users", CREATED, user_id, {"id": user_id, "username": username})
             print(f"User '{username}' added successfully.")
             return True
         
@@ -233,11 +227,127 @@ class DatabaseManager:
 
 
 
+    def rename_user(self, user_id, new_username):
+
+        """
+        Changes a user's username.
+
+        Args:
+            user_id (int): The ID of the user to rename.
+            new_username (str): The new username (must not be taken).
+
+        Returns:
+            bool: True if the user was renamed, False otherwise.
+        """
+
+        if self.conn is None:
+            print("Database connection is not active.")
+            return False
+
+        try:
+            lastrowid, rowcount = self._execute_write(
+                "UPDATE users SET username = ? WHERE id = ?",
+                (new_username, user_id)
+            )
+        except sqlite3.IntegrityError:
+            print(f"User '{new_username}' already exists.")
+            return False
+        except sqlite3.Error as e:
+            print(f"Error renaming user: {e}")
+            return False
+        finally:
+            # Drop the old name even if the update failed, the next lookup re-reads it
+            self.identity_cache.invalidate(user_id=user_id, username=new_username)
+
+        if rowcount == 0:
+            print(f"User ID {user_id} not found.")
+            return False
+        self.identity_cache.put(user_id, new_username)
+        self._emit("users", UPDATED, user_id, {"username": new_username})
+        print(f"User ID {user_id} renamed to '{new_username}'.")
+        return True
+
+
+
+
+    def find_existing_usernames(self, usernames):
+
+        """
+        Returns which of the given usernames are already taken.
+
+        Args:
+            usernames (list): The usernames to look up.
+
+        Returns:
+            set: The usernames that exist (empty if the lookup failed).
+        """
+
+        if self.conn is None:
+            return set()
+
+        existing = set()
+        try:
+            with self.connections.reader() as conn:
+                # note: sqlite limits how many ? one statement may have, so ask in chunks
+                for start in range(0, len(usernames), 500):
+                    chunk = usernames[start:start + 500]
+                    placeholders = ", ".join("?" * len(chunk))
+                    cursor = conn.execute(f"SELECT username FROM users WHERE username IN ({placeholders})", chunk)
+                    existing.update(row[0] for row in cursor)
+        except sqlite3.Error as e:
+            print(f"Error looking up usernames: {e}")
+        return existing
+
+
+
+    def add_hashed_users(self, users):
+
+        """
+        Adds many users whose passwords are already hashed (see roster.py), all
+        in one transaction. A username that is already taken is skipped and
+        reported instead of failing the whole batch.
+
+        Args:
+            users (iterable): (username, password_hash) tuples.
+
+        Returns:
+            list: The usernames that were skipped because they already exist
+                (None if the batch failed and nothing was added).
+        """
+
+        if self.conn is None:
+            print("Database connection is not active.")
+            return None
+
+        skipped = []
+        added = 0
+        try:
+            with self.transaction() as conn:
+                for username, password_hash in users:
+                    try:
+                        conn.execute("INSERT INTO users (username, password_hash) VALUES (?, ?)", (username, password_hash))
+                        added += 1
+                    except sqlite3.IntegrityError:
+                        # note: only this row is undone, the rest of the transaction goes on
+                        skipped.append(username)
+                if added:
+                    self._emit("users", BULK)
+        except sqlite3.Error as e:
+            print(f"Error adding users: {e}")
+            return None
+
+        print(f"{added} users added successfully.")
+        return skipped
+
+
+
     def check_user(self, username, password):
         
         """
         Checks if a user's credentials are correct by hashing the provided
-        password and comparing it to the stored hash.
+        password and comparing it to the stored hash. An account with an old
+        (unsalted SHA-256) or weaker hash gets a fresh one after a successful check.
+        note: hashing takes about 100 ms on purpose, call this off the Tk thread
         
         Args:
             username (str): The username to check.
@@ -251,40 +361,54 @@ class DatabaseManager:
         if self.conn is None:
             return False
 
-        # Hash the provided password to compare with the stored hash
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
-        
         # Query db for password of username provided and gets data from one row (password hash, if found)
         try:
-            self.cursor.execute("SELECT password_hash FROM users WHERE username = ?", (username,))
-            result = self.cursor.fetchone() # attempts to retrieve stored hash for given username
-            # note: result will return either return tuple i.e. user found or false i.e not found
-            #       result[0] gets actual hash string from tuple            
-
-            """
-            # Check if a user was found and if the password hashes match
-            if result and result[0] == password_hash:
-                return True
-            else:
-                return False
-            """
-            
-            if not result:
-                # This means the query returned no rows, so the user doesn't exist.
-                return "user_not_found"
-            
-            if result[0] == password_hash:
-                # The password hash matches the one in the database.
-                return "success"
-            else:
-                # The user exists, but the password hashes don't match.
-                return "incorrect_password"
-
-        
+            with self.connections.reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT password_hash FROM users WHERE username = ?", (username,))
+                result = cursor.fetchone() # attempts to retrieve stored hash for given username
+                # note: result will return either return tuple i.e. user found or false i.e not found
+                #       result[0] gets actual hash string from tuple
         except sqlite3.Error as e:
             print(f"Error checking user credentials: {e}")
             return False
 
+        if not result:
+            # This means the query returned no rows, so the user doesn't exist.
+            return "user_not_found"
+
+        # note: the reader connection is already back in the pool while the (slow) hash runs
+        matches, needs_rehash = self.password_hasher.verify_password(password, result[0])
+        if not matches:
+            # The user exists, but the password doesn't match.
+            return "incorrect_password"
+
+        if needs_rehash:
+            self._upgrade_password_hash(username, password, result[0])
+        # The password matches the stored hash.
+        return "success"
+
+
+
+    def _upgrade_password_hash(self, username, password, old_hash):
+
+        """
+        Replaces an old or weaker password hash with a fresh one. Only done
+        right after a successful login (the only time we know the password).
+        A failure here doesn't fail the login, it is tried again next time.
+        """
+
+        try:
+            new_hash = self.password_hasher.hash_password(password)
+            # note: only if nobody changed the hash in the meantime
+            self._execute_write(
+                "UPDATE users SET password_hash = ? WHERE username = ? AND password_hash = ?",
+                (new_hash, username, old_hash)
+            )
+            print(f"Password hash for user '{username}' upgraded.")
+        except sqlite3.Error as e:
+            print(f"Error upgrading password hash: {e}")
+
 
 
 
@@ -292,12 +416,223 @@ class DatabaseManager:
 
         """
         Closes the database connection.
+        note: only if this DatabaseManager opened it. A shared connection manager
+        is closed by whoever owns it (the main app).
         """
         
-        # Checks if connected
-        if self.conn:
-            self.conn.close() # closes connection
-            print("Database connection closed.")
+        self.disable_group_commit()
+        self.disable_query_stats()
+        if self._owns_password_hasher:
+            self.password_hasher.close()
+
+        # Checks if we own the connections
+        if self._owns_connections:
+            self.connections.close() # closes every connection
+            self.conn = None
+
+
+
+
+    def _execute_write(self, sql, params=()):
+
+        """
+        Runs one INSERT/UPDATE/DELETE and commits it. Every single-row write goes
+        through here.
+
+        - inside a transaction() block, the write joins that transaction (no commit)
+        - with group commit on, the write is merged with others arriving at the
+          same time and this call returns once their shared commit is done
+        - otherwise it runs and commits on its own
+
+        Returns:
+            tuple: (lastrowid, rowcount) of the statement.
+        """
+
+        if self.group_committer and not self.connections.in_transaction_block:
+            return self.group_committer.submit(sql, params).result()
+
+        with self.connections.writer() as conn:
+            cursor = conn.execute(sql, params)
+            if not self.connections.in_transaction_block:
+                conn.commit()
+            return cursor.lastrowid, cursor.rowcount
+
+
+
+    def _execute_write_many(self, sql, rows):
+
+        """
+        Runs one statement for every row with executemany, all in a single transaction.
+
+        Returns:
+            int: The total number of rows changed.
+        """
+
+        with self.connections.transaction() as conn:
+            return conn.executemany(sql, rows).rowcount
+
+
+
+    @contextmanager
+    def transaction(self):
+
+        """
+        Context manager that groups several writes into ONE transaction, so they
+        are committed together (or not at all if something fails).
+
+        Usage:
+            with db_manager.transaction():
+                db_manager.add_task(user_id, "Read chapter 1", "", "2025-09-01")
+                db_manager.add_task(user_id, "Read chapter 2", "", "2025-09-08")
+
+        note: the writer connection is held for the whole block, so keep it short
+        note: change events for writes in the block are only published once it commits
+        """
+
+        outermost = getattr(self._local, "held_events", None) is None
+        if outermost:
+            self._local.held_events = []
+        try:
+            with self.connections.transaction() as conn:
+                yield conn
+            held = self._local.held_events if outermost else []
+        finally:
+            if outermost:
+                self._local.held_events = None
+
+        for event in held:
+            self.event_bus.publish(event)
+
+
+
+    def _emit(self, table, action, row_id=None, data=None):
+
+        """
+        Publishes a row change on the event bus (if there is one). Inside a
+        transaction() block the event waits until the block commits, so
+        nobody hears about a change that gets rolled back.
+        """
+
+        if self.event_bus is None:
+            return
+        event = ChangeEvent(table, action, row_id, data)
+        held = getattr(self._local, "held_events", None)
+        if held is not None:
+            held.append(event)
+        else:
+            self.event_bus.publish(event)
+
+
+
+    def enable_group_commit(self, window_ms=5):
+
+        """
+        Turns on group commit: single-row writes (add_task, add_post, ...) that
+        arrive within window_ms of each other from different threads share one
+        transaction and one commit.
+        """
+
+        if self.group_committer is None and self.conn is not None:
+            self.group_committer = GroupCommitter(self.connections, window_ms=window_ms)
+
+
+
+    def disable_group_commit(self):
+
+        """
+        Turns group commit off again (after committing anything still queued).
+        """
+
+        if self.group_committer is not None:
+            self.group_committer.close()
+            self.group_committer = None
+
+
+
+    def enable_query_stats(self, slow_threshold_ms=50):
+
+        """
+        Turns on query instrumentation: every public method call and every SQL
+        statement is timed into latency histograms, and calls slower than
+        slow_threshold_ms are kept in a slow query log (see QueryStats).
+
+        Returns:
+            QueryStats: The stats object (also available as self.query_stats).
+        """
+
+        if self.query_stats is None:
+            from query_stats import QueryStats # note: only imported when diagnostics are turned on
+            self.query_stats = QueryStats(slow_threshold_ms=slow_threshold_ms)
+            self._timed_methods = self.query_stats.instrument(self)
+            # note: this connection manager may be shared, its statements are only
+            # counted while one of our timed methods is running on that thread
+            self.connections.set_trace_callback(self.query_stats.on_statement)
+        return self.query_stats
+
+
+
+    def disable_query_stats(self):
+
+        """
+        Turns query instrumentation off again (the collected stats are dropped).
+        """
+
+        if self.query_stats is not None:
+            self.connections.set_trace_callback(None)
+            self.query_stats.uninstrument(self, self._timed_methods)
+            self._timed_methods = []
+            self.query_stats = None
+
+
+
+
+    def track_local_changes(self):
+
+        """
+        Starts counting the changes this app makes itself, next to the counters
+        in table_versions that count everyone's (see add_local_change_counters).
+        A ChangeMonitor given read_change_counters then only reports changes made
+        by other processes, the app's own ones already reach the views through
+        the event bus.
+        """
+
+        if self.conn is None:
+            print("Database connection is not active.")
+            return
+
+        try:
+            with self.connections.writer() as conn:
+                add_local_change_counters(conn)
+        except sqlite3.Error as e:
+            print(f"Error setting up local change counters: {e}")
+
+
+
+    def read_change_counters(self):
+
+        """
+        Reads every table's change counter together with how much of it came
+        from this app (0 until track_local_changes() was called).
+        note: read on the writer connection, the only one whose changes are
+        counted as ours, and in one statement so both numbers match
+
+        Returns:
+            dict: table name -> (version, changes made by this app).
+
+        Raises:
+            sqlite3.Error: If the counters can't be read (the ChangeMonitor handles it).
+        """
+
+        with self.connections.writer() as conn:
+            tracked = conn.execute("SELECT 1 FROM sqlite_temp_master WHERE name = 'local_versions'").fetchone()
+            if tracked is None:
+                rows = conn.execute("SELECT table_name, version, 0 FROM table_versions").fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT v.table_name, v.version, coalesce(l.version, 0) FROM table_versions v "
+                    "LEFT JOIN local_versions l ON l.table_name = v.table_name"
+                ).fetchall()
+        return {table: (version, local) for table, version, local in rows}
 
 
 
@@ -319,11 +654,18 @@ class DatabaseManager:
             return
         
         try:
-            self.cursor.execute(
+            task_id, rowcount = self._execute_write(
                 "INSERT INTO tasks (user_id, task_name, description, due_date) VALUES (?, ?, ?, ?)",
                 (user_id, task_name, description, due_date)
             )
-            self.conn.commit()
+            self._emit("tasks", CREATED, task_id, {
+                "id": task_id,
+                "user_id": user_id,
+                "task_name": task_name,
+                "description": description,
+                "due_date": due_date,
+                "is_completed": False
+            })
             print(f"Task '{task_name}' added successfully for user ID {user_id}.")
         except sqlite3.Error as e:
             print(f"Error adding task: {e}")
@@ -331,10 +673,42 @@ class DatabaseManager:
 
 
 
+    def add_tasks(self, tasks):
+
+        """
+        Adds many tasks at once in a single transaction (much faster than calling
+        add_task in a loop, which commits once per task).
+
+        Args:
+            tasks (iterable): (user_id, task_name, description, due_date) tuples.
+
+        Returns:
+            int: The number of tasks added (0 if it failed).
+        """
+
+        if self.conn is None:
+            print("Database connection is not active.")
+            return 0
+
+        try:
+            count = self._execute_write_many(
+                "INSERT INTO tasks (user_id, task_name, description, due_date) VALUES (?, ?, ?, ?)",
+                tasks
+            )
+            self._emit("tasks", BULK)
+            print(f"{count} tasks added successfully.")
+            return count
+        except sqlite3.Error as e:
+            print(f"Error adding tasks: {e}")
+            return 0
+
+
+
+
     def get_tasks(self, user_id):
 
         """
-        Retrieves all tasks for a specific user.
+        Retrieves all tasks for a specific user, soonest due date first.
         
         Args:
             user_id (int): The ID of the user whose tasks to retrieve.
@@ -343,30 +717,119 @@ class DatabaseManager:
             list: A list of task dictionaries, or an empty list if no tasks are found.
         """
 
+        return self.query_tasks(user_id)
+
+
+
+    def query_tasks(self, user_id, status=None, due_from=None, due_to=None, text=None, sort="due_date", limit=None):
+
+        """
+        Retrieves a filtered, sorted slice of a user's tasks.
+
+        Every filter is optional and they can be combined. Due dates are compared
+        as 'YYYY-MM-DD' text, so tasks whose due date is empty or free text
+        (e.g. "next week") never fall inside a due-date window.
+
+        Args:
+            user_id (int): The ID of the user whose tasks to retrieve.
+            status (str): 'open', 'completed' or None for both.
+            due_from (str): Only tasks due on or after this date ('YYYY-MM-DD').
+            due_to (str): Only tasks due on or before this date ('YYYY-MM-DD').
+            text (str): Only tasks whose name or description contains this text (any case).
+            sort (str): 'due_date' (soonest first) or 'name' (A to Z).
+            limit (int): The maximum number of tasks to return (None for all).
+
+        Returns:
+            list: A list of task dictionaries, or an empty list if no tasks match.
+        """
+
+        return [task.as_dict() for task in self.iter_tasks(user_id, status, due_from, due_to, text, sort, limit)]
+
+
+
+    def iter_tasks(self, user_id, status=None, due_from=None, due_to=None, text=None, sort="due_date", limit=None, batch_size=500):
+
+        """
+        Streams a user's tasks one at a time, with the same filters and sorting
+        as query_tasks(). Rows are read from sqlite batch_size at a time with
+        fetchmany, so the first task is there right away and only one batch is
+        in memory at any time.
+
+        Args:
+            user_id, status, due_from, due_to, text, sort, limit: See query_tasks().
+            batch_size (int): Rows fetched from sqlite per round trip.
+
+        Yields:
+            TaskRecord: One per matching task.
+
+        note: holds a read connection until the loop finishes (or the generator is closed)
+        """
+
         if self.conn is None:
             print("Database connection is not active.")
-            return []
-            
+            return
+
+        # Build the WHERE clause from the filters that were given
+        # note: user_id always comes first so every query can use one of the
+        # (user_id, ...) indexes from migrations 2 and 4
+        conditions = ["user_id = ?"]
+        params = [user_id]
+
+        if status == "open":
+            conditions.append("is_completed = 0")
+        elif status == "completed":
+            conditions.append("is_completed = 1")
+        elif status is not None:
+            raise ValueError(f"Unknown task status '{status}'.")
+
+        if due_to and not due_from:
+            # note: without a lower bound '' (no due date) would count as "before" every date
+            due_from = "0000-01-01"
+        if due_from:
+            conditions.append("due_date >= ?")
+            params.append(due_from)
+        if due_to:
+            conditions.append("due_date <= ?")
+            params.append(due_to)
+
+        if sort == "due_date":
+            order_by = "due_date, id"
+        elif sort == "name":
+            order_by = "task_name COLLATE NOCASE, id"
+        else:
+            raise ValueError(f"Unknown task sort '{sort}'.")
+
         try:
-            self.cursor.execute(
-                "SELECT id, task_name, description, due_date, is_completed FROM tasks WHERE user_id = ?",
-                (user_id,)
-            )
-            tasks = []
-            for row in self.cursor.fetchall():
-                task_data = {
-                    "id": row[0],
-                    "task_name": row[1],
-                    "description": row[2],
-                    "due_date": row[3],
-                    "is_completed": bool(row[4])
-                }
-                tasks.append(task_data)
-            return tasks
+            with self.connections.reader() as conn:
+                text = (text or "").strip()
+                if text:
+                    # The trigram index can only look up 3+ characters, shorter text is
+                    # checked row by row (still only over this user's already-filtered tasks)
+                    if len(text) >= 3 and self._has_search_index(conn, "tasks_fts"):
+                        conditions.append("id IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?)")
+                        params.append('"' + text.replace('"', '""') + '"')
+                    else:
+                        pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                        conditions.append("(task_name LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\')")
+                        params.extend([pattern, pattern])
+
+                sql = (
+                    "SELECT id, task_name, description, due_date, is_completed FROM tasks "
+                    f"WHERE {' AND '.join(conditions)} ORDER BY {order_by}"
+                )
+                if limit is not None:
+                    sql += " LIMIT ?"
+                    params.append(limit)
+
+                cursor = conn.execute(sql, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield TaskRecord(*row)
         except sqlite3.Error as e:
             print(f"Error getting tasks: {e}")
-            return []
-
 
 
 
@@ -384,17 +847,50 @@ class DatabaseManager:
             return
             
         try:
-            self.cursor.execute(
+            lastrowid, rowcount = self._execute_write(
                 "UPDATE tasks SET is_completed = 1 WHERE id = ?",
                 (task_id,)
             )
-            self.conn.commit()
+            if rowcount:
+                self._emit("tasks", UPDATED, task_id, {"is_completed": True})
             print(f"Task ID {task_id} marked as complete.")
         except sqlite3.Error as e:
             print(f"Error marking task as complete: {e}")
 
 
 
+    def mark_tasks_complete(self, task_ids):
+
+        """
+        Marks many tasks as completed in a single transaction.
+
+        Args:
+            task_ids (iterable): The IDs of the tasks to update.
+
+        Returns:
+            int: The number of tasks updated.
+        """
+
+        if self.conn is None:
+            print("Database connection is not active.")
+            return 0
+
+        try:
+            task_ids = list(task_ids) # read twice: for the update and for the events
+            count = self._execute_write_many(
+                "UPDATE tasks SET is_completed = 1 WHERE id = ?",
+                ((task_id,) for task_id in task_ids)
+            )
+            for task_id in task_ids:
+                self._emit("tasks", UPDATED, task_id, {"is_completed": True})
+            print(f"{count} tasks marked as complete.")
+            return count
+        except sqlite3.Error as e:
+            print(f"Error marking tasks as complete: {e}")
+            return 0
+
+
+
     def delete_task(self, task_id):
 
         """
@@ -409,17 +905,50 @@ class DatabaseManager:
             return
         
         try:
-            self.cursor.execute(
+            lastrowid, rowcount = self._execute_write(
                 "DELETE FROM tasks WHERE id = ?",
                 (task_id,)
             )
-            self.conn.commit()
+            if rowcount:
+                self._emit("tasks", DELETED, task_id)
             print(f"Task ID {task_id} deleted successfully.")
         except sqlite3.Error as e:
             print(f"Error deleting task: {e}")
 
 
 
+    def delete_tasks(self, task_ids):
+
+        """
+        Deletes many tasks in a single transaction.
+
+        Args:
+            task_ids (iterable): The IDs of the tasks to delete.
+
+        Returns:
+            int: The number of tasks deleted.
+        """
+
+        if self.conn is None:
+            print("Database connection is not active.")
+            return 0
+
+        try:
+            task_ids = list(task_ids) # read twice: for the delete and for the events
+            count = self._execute_write_many(
+                "DELETE FROM tasks WHERE id = ?",
+                ((task_id,) for task_id in task_ids)
+            )
+            for task_id in task_ids:
+                self._emit("tasks", DELETED, task_id)
+            print(f"{count} tasks deleted successfully.")
+            return count
+        except sqlite3.Error as e:
+            print(f"Error deleting tasks: {e}")
+            return 0
+
+
+
     def add_post(self, user_id, title, content):
         
         """
@@ -431,17 +960,59 @@ class DatabaseManager:
             return
         try:
             timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.cursor.execute(
-                "INSERT INTO posts (user_id, title, content, timestamp) VALUES (?, ?, ?, ?)",
-                (user_id, title, content, timestamp)
+            # note: the preview is made once here, the feed never reads the full text
+            snippet = make_snippet(content)
+            post_id, rowcount = self._execute_write(
+                "INSERT INTO posts (user_id, title, content, timestamp, snippet) VALUES (?, ?, ?, ?, ?)",
+                (user_id, title, content, timestamp, snippet)
             )
-            self.conn.commit()
+            if self.event_bus:
+                self._emit("posts", CREATED, post_id, {
+                    "id": post_id,
+                    "user_id": user_id,
+                    "title": title,
+                    "snippet": snippet,
+                    "timestamp": timestamp,
+                    "username": self.get_username_by_id(user_id) # from the identity cache
+                })
             print(f"Post '{title}' added successfully for user ID {user_id}.")
         except sqlite3.Error as e:
             print(f"Error adding post: {e}")
 
 
 
+    def add_posts(self, posts):
+
+        """
+        Adds many posts at once in a single transaction. All of them get the
+        current time as their timestamp.
+
+        Args:
+            posts (iterable): (user_id, title, content) tuples.
+
+        Returns:
+            int: The number of posts added (0 if it failed).
+        """
+
+        if self.conn is None:
+            print("Database connection is not active.")
+            return 0
+
+        try:
+            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            count = self._execute_write_many(
+                "INSERT INTO posts (user_id, title, content, timestamp, snippet) VALUES (?, ?, ?, ?, ?)",
+                ((user_id, title, content, timestamp, make_snippet(content)) for user_id, title, content in posts)
+            )
+            self._emit("posts", BULK)
+            print(f"{count} posts added successfully.")
+            return count
+        except sqlite3.Error as e:
+            print(f"Error adding posts: {e}")
+            return 0
+
+
+
     def get_posts(self):
         
         """
@@ -451,26 +1022,341 @@ class DatabaseManager:
             list: A list of post dictionaries, or an empty list.
         """
         
+        return [post.as_dict() for post in self.iter_posts()]
+
+
+
+    def iter_posts(self, batch_size=500):
+
+        """
+        Streams every post, newest first, one at a time. Rows are read from
+        sqlite batch_size at a time with fetchmany, so scanning the whole board
+        never holds more than one batch in memory.
+
+        Args:
+            batch_size (int): Rows fetched from sqlite per round trip.
+
+        Yields:
+            PostRecord: One per post.
+
+        note: holds a read connection until the loop finishes (or the generator is closed)
+        """
+
         if self.conn is None:
             print("Database connection is not active.")
-            return []
+            return
         try:
-            self.cursor.execute("SELECT id, user_id, title, content, timestamp FROM posts ORDER BY timestamp DESC")
-            posts = []
-            for row in self.cursor.fetchall():
-                post_data = {
-                    "id": row[0],
-                    "user_id": row[1],
-                    "title": row[2],
-                    "content": row[3],
-                    "timestamp": row[4]
-                }
-                posts.append(post_data)
-            return posts
+            with self.connections.reader() as conn:
+                cursor = conn.execute("SELECT id, user_id, title, content, timestamp FROM posts ORDER BY timestamp DESC")
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield PostRecord(*row)
         except sqlite3.Error as e:
             print(f"Error getting posts: {e}")
+
+
+
+    def get_feed_page(self, before=None, limit=50):
+
+        """
+        Retrieves one page of the bulletin feed, newest first, with each post
+        already joined to its author's username.
+
+        Uses keyset pagination on (timestamp, id) instead of OFFSET so that
+        loading page 1000 costs the same as loading page 1. Posts come with
+        their snippet only, the full text is loaded by get_post_content() when
+        a post is opened.
+
+        Args:
+            before (tuple): The (timestamp, id) of the last post on the previous
+                page, or None to start at the newest post.
+            limit (int): The maximum number of posts to return.
+
+        Returns:
+            list: A list of post dictionaries ('id', 'user_id', 'title', 'snippet',
+                'timestamp' and 'username'), or an empty list.
+        """
+
+        if self.conn is None:
+            print("Database connection is not active.")
+            return []
+
+        # note: every posts column used here is in idx_posts_feed (migration 7), so
+        # sqlite reads the page from the index alone and never the post bodies
+        # note: the row value comparison (timestamp, id) < (?, ?) lets sqlite
+        # seek straight to where the previous page ended. the id breaks ties
+        # between posts made within the same second
+        query = (
+            "SELECT p.id, p.user_id, p.title, p.snippet, p.timestamp, u.username "
+            "FROM posts p LEFT JOIN users u ON u.id = p.user_id "
+        )
+        params = []
+        if before is not None:
+            query += "WHERE (p.timestamp, p.id) < (?, ?) "
+            params.extend(before)
+        query += "ORDER BY p.timestamp DESC, p.id DESC LIMIT ?"
+        params.append(limit)
+
+        try:
+            with self.connections.reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                posts = []
+                for row in cursor.fetchall():
+                    post_data = {
+                        "id": row[0],
+                        "user_id": row[1],
+                        "title": row[2],
+                        "snippet": row[3],
+                        "timestamp": row[4],
+                        "username": row[5]
+                    }
+                    posts.append(post_data)
+                    # the page already has every author's name, remember them for later lookups
+                    self.identity_cache.put(row[1], row[5])
+                return posts
+        except sqlite3.Error as e:
+            print(f"Error getting feed page: {e}")
+            return []
+
+
+
+    def get_post_content(self, post_id):
+
+        """
+        Loads the full text of one post (when its card is opened). The last
+        POST_CONTENT_CACHE_SIZE posts opened are kept in memory, so opening
+        one again doesn't touch the database.
+
+        Args:
+            post_id (int): The ID of the post.
+
+        Returns:
+            str: The post's content, or None if the post doesn't exist (or the lookup failed).
+        """
+
+        with self._post_contents_lock:
+            if post_id in self._post_contents:
+                self._post_contents.move_to_end(post_id)
+                return self._post_contents[post_id]
+
+        if self.conn is None:
+            print("Database connection is not active.")
+            return None
+
+        try:
+            with self.connections.reader() as conn:
+                row = conn.execute("SELECT content FROM posts WHERE id = ?", (post_id,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error getting post content: {e}")
+            return None
+        if row is None:
+            return None
+
+        with self._post_contents_lock:
+            self._post_contents[post_id] = row[0]
+            self._post_contents.move_to_end(post_id)
+            while len(self._post_contents) > self.POST_CONTENT_CACHE_SIZE:
+                self._post_contents.popitem(last=False)
+        return row[0]
+
+
+
+    def get_feed_markers(self):
+
+        """
+        Returns where the feed stands right now, for a client that is about to load
+        it and later wants to ask get_posts_since what changed.
+
+        Returns:
+            tuple: (newest post id, newest tombstone id), 0 for either if there is none.
+        """
+
+        if self.conn is None:
+            print("Database connection is not active.")
+            return (0, 0)
+
+        try:
+            with self.connections.reader() as conn:
+                # note: MAX of an INTEGER PRIMARY KEY is a single lookup, not a scan
+                latest_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM posts").fetchone()[0]
+                deleted_marker = conn.execute("SELECT COALESCE(MAX(id), 0) FROM post_tombstones").fetchone()[0]
+                return (latest_id, deleted_marker)
+        except sqlite3.Error as e:
+            print(f"Error getting feed markers: {e}")
+            return (0, 0)
+
+
+
+    def get_posts_since(self, after_id, deleted_since=0, limit=100):
+
+        """
+        Returns only what changed in the feed since a client last looked: the posts
+        added after the newest post id it holds and the ids of posts deleted after
+        its tombstone marker. Both are looked up by primary key, so the cost depends
+        on how much changed, not on how many posts there are.
+
+        Args:
+            after_id (int): The newest post id the client already has.
+            deleted_since (int): The newest tombstone id the client already has.
+            limit (int): The most new posts (and deletions) to return. If more changed
+                than that, 'truncated' is True and the client should reload the feed instead.
+
+        Returns:
+            dict: 'posts' (new post dictionaries like get_feed_page's, newest first),
+                'deleted' (ids of deleted posts), 'latest_id' and 'deleted_marker' (the
+                markers to pass next time), and 'truncated'. None if the query failed.
+        """
+
+        if self.conn is None:
+            print("Database connection is not active.")
+            return None
+
+        try:
+            with self.connections.reader() as conn:
+                # note: one extra row is fetched to find out whether there were more than limit
+                # note: NOT INDEXED stops sqlite from walking the whole (timestamp, id) index
+                # for the ORDER BY, it looks up the new ids by primary key and sorts just those
+                cursor = conn.execute(
+                    "SELECT p.id, p.user_id, p.title, p.snippet, p.timestamp, u.username "
+                    "FROM posts p NOT INDEXED LEFT JOIN users u ON u.id = p.user_id "
+                    "WHERE p.id > ? ORDER BY p.timestamp DESC, p.id DESC LIMIT ?",
+                    (after_id, limit + 1)
+                )
+                rows = cursor.fetchall()
+                tombstones = conn.execute(
+                    "SELECT id, post_id FROM post_tombstones WHERE id > ? ORDER BY id LIMIT ?",
+                    (deleted_since, limit + 1)
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error getting new posts: {e}")
+            return None
+
+        posts = []
+        for row in rows[:limit]:
+            post_data = {
+                "id": row[0],
+                "user_id": row[1],
+                "title": row[2],
+                "snippet": row[3],
+                "timestamp": row[4],
+                "username": row[5]
+            }
+            posts.append(post_data)
+            self.identity_cache.put(row[1], row[5])
+
+        return {
+            "posts": posts,
+            "deleted": [post_id for tombstone_id, post_id in tombstones[:limit]],
+            "latest_id": max([after_id] + [post["id"] for post in posts]),
+            "deleted_marker": tombstones[min(len(tombstones), limit) - 1][0] if tombstones else deleted_since,
+            "truncated": len(rows) > limit or len(tombstones) > limit
+        }
+
+
+
+    def search_posts(self, query, limit=20, offset=0):
+
+        """
+        Full-text search over post titles and content, best matches first.
+
+        Matches are ranked with BM25 (a title match counts more than a content
+        match) and come with a short snippet of the content around the match.
+        Matched words are wrapped in [brackets] in the title and snippet.
+        Every word typed is matched as a prefix, so results update while typing.
+
+        Args:
+            query (str): The text the user typed.
+            limit (int): The maximum number of results to return.
+            offset (int): How many results to skip (for the next page).
+
+        Returns:
+            list: Post dictionaries (id, user_id, title, timestamp, username, snippet),
+                or an empty list. Like the feed they leave out the full text, a result
+                that is opened loads it with get_post_content().
+        """
+
+        if self.conn is None:
+            print("Database connection is not active.")
             return []
 
+        # Turn what the user typed into an FTS5 query: every word becomes a quoted
+        # prefix search ("exam"*), all of them must match
+        # note: quoting keeps characters like - or " from being read as FTS5 syntax
+        words = re.findall(r"\w+", query)
+        if not words:
+            return []
+
+        try:
+            with self.connections.reader() as conn:
+                if not self._has_search_index(conn, "posts_fts"):
+                    return self._search_posts_without_index(conn, words, limit, offset)
+
+                match = " ".join(f'"{word}"*' for word in words)
+                cursor = conn.execute(
+                    "SELECT p.id, p.user_id, highlight(posts_fts, 0, '[', ']'), p.timestamp, u.username, "
+                    "snippet(posts_fts, 1, '[', ']', '...', 16) "
+                    "FROM posts_fts JOIN posts p ON p.id = posts_fts.rowid "
+                    "LEFT JOIN users u ON u.id = p.user_id "
+                    "WHERE posts_fts MATCH ? "
+                    "ORDER BY bm25(posts_fts, 5.0, 1.0) LIMIT ? OFFSET ?",
+                    (match, limit, offset)
+                )
+                return [self._search_result(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Error searching posts: {e}")
+            return []
+
+
+
+    def _has_search_index(self, conn, name):
+
+        """
+        Checks (once per index) whether a full-text index (posts_fts or tasks_fts) or
+        the events interval index (events_rtree) exists.
+        """
+
+        if name not in self._search_indexes:
+            row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone()
+            self._search_indexes[name] = row is not None
+        return self._search_indexes[name]
+
+
+
+    def _search_posts_without_index(self, conn, words, limit, offset):
+
+        """
+        Fallback search for sqlite builds without FTS5 --> a LIKE scan, newest first.
+        The stored preview (posts.snippet) stands in for the snippet around the match.
+        """
+
+        conditions = " AND ".join("(p.title LIKE ? OR p.content LIKE ?)" for word in words)
+        params = []
+        for word in words:
+            params.extend([f"%{word}%", f"%{word}%"])
+        cursor = conn.execute(
+            "SELECT p.id, p.user_id, p.title, p.timestamp, u.username, p.snippet "
+            "FROM posts p LEFT JOIN users u ON u.id = p.user_id "
+            f"WHERE {conditions} ORDER BY p.timestamp DESC, p.id DESC LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        )
+        return [self._search_result(row) for row in cursor.fetchall()]
+
+
+
+    def _search_result(self, row):
+        return {
+            "id": row[0],
+            "user_id": row[1],
+            "title": row[2],
+            "timestamp": row[3],
+            "username": row[4],
+            "snippet": row[5]
+        }
+
 
 
     def delete_post(self, post_id):
@@ -483,12 +1369,277 @@ class DatabaseManager:
             print("Database connection is not active.")
             return
         try:
-            self.cursor.execute(
+            lastrowid, rowcount = self._execute_write(
                 "DELETE FROM posts WHERE id = ?",
                 (post_id,)
             )
-            self.conn.commit()
+            self._forget_post_contents([post_id])
+            if rowcount:
+                self._emit("posts", DELETED, post_id)
             print(f"Post ID {post_id} deleted successfully.")
         except sqlite3.Error as e:
             print(f"Error deleting post: {e}")
 
+
+
+    def delete_posts(self, post_ids):
+
+        """
+        Deletes many posts in a single transaction.
+
+        Args:
+            post_ids (iterable): The IDs of the posts to delete.
+
+        Returns:
+            int: The number of posts deleted.
+        """
+
+        if self.conn is None:
+            print("Database connection is not active.")
+            return 0
+
+        try:
+            post_ids = list(post_ids) # read twice: for the delete and for the events
+            count = self._execute_write_many(
+                "DELETE FROM posts WHERE id = ?",
+                ((post_id,) for post_id in post_ids)
+            )
+            self._forget_post_contents(post_ids)
+            for post_id in post_ids:
+                self._emit("posts", DELETED, post_id)
+            print(f"{count} posts deleted successfully.")
+            return count
+        except sqlite3.Error as e:
+            print(f"Error deleting posts: {e}")
+            return 0
+
+
+
+    def _forget_post_contents(self, post_ids):
+        # Drops deleted posts from the get_post_content cache
+        with self._post_contents_lock:
+            for post_id in post_ids:
+                self._post_contents.pop(post_id, None)
+
+
+
+
+    def add_event(self, user_id, title, start_time, end_time, location="", description=""):
+
+        """
+        Adds a new event to the calendar.
+
+        Args:
+            user_id (int): The ID of the user who creates the event.
+            title (str): The event's name.
+            start_time: When it starts, a datetime or 'YYYY-MM-DD HH:MM' text.
+            end_time: When it ends (after start_time), same forms as start_time.
+            location (str): Where it takes place.
+            description (str): More details.
+
+        Returns:
+            int: The new event's ID, or None if it couldn't be saved.
+
+        Raises:
+            ValueError: If a time can't be read or the event ends before it starts.
+        """
+
+        start_time, end_time = self._event_times(start_time, end_time)
+
+        if self.conn is None:
+            print("Database connection is not active.")
+            return None
+
+        try:
+            event_id, rowcount = self._execute_write(
+                "INSERT INTO events (user_id, title, location, description, start_time, end_time) VALUES (?, ?, ?, ?, ?, ?)",
+                (user_id, title, location, description, start_time, end_time)
+            )
+            if self.event_bus:
+                self._emit("events", CREATED, event_id, {
+                    "id": event_id,
+                    "user_id": user_id,
+                    "title": title,
+                    "location": location,
+                    "description": description,
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "username": self.get_username_by_id(user_id) # from the identity cache
+                })
+            print(f"Event '{title}' added successfully for user ID {user_id}.")
+            return event_id
+        except sqlite3.Error as e:
+            print(f"Error adding event: {e}")
+            return None
+
+
+
+    def add_events(self, events):
+
+        """
+        Adds many events at once in a single transaction.
+
+        Args:
+            events (iterable): (user_id, title, start_time, end_time, location, description) tuples.
+
+        Returns:
+            int: The number of events added (0 if it failed).
+
+        Raises:
+            ValueError: If any event has a bad time (nothing is added then).
+        """
+
+        if self.conn is None:
+            print("Database connection is not active.")
+            return 0
+
+        rows = []
+        for user_id, title, start_time, end_time, location, description in events:
+            start_time, end_time = self._event_times(start_time, end_time)
+            rows.append((user_id, title, location, description, start_time, end_time))
+
+        try:
+            count = self._execute_write_many(
+                "INSERT INTO events (user_id, title, location, description, start_time, end_time) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._emit("events", BULK)
+            print(f"{count} events added successfully.")
+            return count
+        except sqlite3.Error as e:
+            print(f"Error adding events: {e}")
+            return 0
+
+
+
+    def get_events_between(self, range_start, range_end):
+
+        """
+        Retrieves every event that overlaps a time range (e.g. the days a month
+        view shows), earliest first. An event overlaps when it starts before
+        range_end and ends after range_start, so events that began earlier but
+        are still running are included.
+
+        The overlapping events are found through the events_rtree interval
+        index (migration 8), so the cost depends on how many events are in the
+        range, not on how many there are in total.
+
+        Args:
+            range_start: Start of the range, a datetime/date or 'YYYY-MM-DD[ HH:MM]' text.
+            range_end: End of the range (not included), same forms as range_start.
+
+        Returns:
+            list: A list of event dictionaries (including the creator's 'username'), or an empty list.
+        """
+
+        range_start, range_end = self._event_time(range_start), self._event_time(range_end)
+
+        if self.conn is None:
+            print("Database connection is not active.")
+            return []
+
+        columns = "e.id, e.user_id, e.title, e.location, e.description, e.start_time, e.end_time, u.username"
+        try:
+            with self.connections.reader() as conn:
+                if self._has_search_index(conn, "events_rtree"):
+                    cursor = conn.execute(
+                        f"SELECT {columns} FROM events_rtree r JOIN events e ON e.id = r.id "
+                        "LEFT JOIN users u ON u.id = e.user_id "
+                        "WHERE r.start_minute < ? AND r.end_minute > ? ORDER BY e.start_time, e.id",
+                        (_event_minutes(range_end), _event_minutes(range_start))
+                    )
+                else:
+                    # note: without the interval index every event that starts before the range is checked
+                    cursor = conn.execute(
+                        f"SELECT {columns} FROM events e LEFT JOIN users u ON u.id = e.user_id "
+                        "WHERE e.start_time < ? AND e.end_time > ? ORDER BY e.start_time, e.id",
+                        (range_end, range_start)
+                    )
+                events = []
+                for row in cursor.fetchall():
+                    event_data = {
+                        "id": row[0],
+                        "user_id": row[1],
+                        "title": row[2],
+                        "location": row[3],
+                        "description": row[4],
+                        "start_time": row[5],
+                        "end_time": row[6],
+                        "username": row[7]
+                    }
+                    events.append(event_data)
+                return events
+        except sqlite3.Error as e:
+            print(f"Error getting events: {e}")
+            return []
+
+
+
+    def delete_event(self, event_id):
+
+        """
+        Deletes an event from the calendar.
+
+        Args:
+            event_id (int): The ID of the event to delete.
+        """
+
+        if self.conn is None:
+            print("Database connection is not active.")
+            return
+
+        try:
+            lastrowid, rowcount = self._execute_write(
+                "DELETE FROM events WHERE id = ?",
+                (event_id,)
+            )
+            if rowcount:
+                self._emit("events", DELETED, event_id)
+            print(f"Event ID {event_id} deleted successfully.")
+        except sqlite3.Error as e:
+            print(f"Error deleting event: {e}")
+
+
+
+    def _event_times(self, start_time, end_time):
+        # Reads an event's start and end and checks that it ends after it starts
+        start_time, end_time = self._event_time(start_time), self._event_time(end_time)
+        if end_time <= start_time:
+            raise ValueError("An event has to end after it starts.")
+        return start_time, end_time
+
+
+
+    def _event_time(self, value):
+
+        """
+        Turns a datetime, a date or 'YYYY-MM-DD[ HH:MM]' text into the stored
+        'YYYY-MM-DD HH:MM' form (a date alone means midnight).
+
+        Raises:
+            ValueError: If the text isn't a valid date/time.
+        """
+
+        if isinstance(value, datetime.datetime):
+            return value.strftime(EVENT_TIME_FORMAT)
+        if isinstance(value, datetime.date):
+            return value.strftime("%Y-%m-%d 00:00")
+        value = str(value).strip()
+        for time_format in (EVENT_TIME_FORMAT, "%Y-%m-%d"):
+            try:
+                return datetime.datetime.strptime(value, time_format).strftime(EVENT_TIME_FORMAT)
+            except ValueError:
+                pass
+        raise ValueError(f"'{value}' is not a valid date/time (use YYYY-MM-DD HH:MM).")
+
+
+
+def _event_minutes(event_time):
+
+    """
+    Minutes since 1970 for a stored event time, the same way migration 8's
+    triggers put it into events_rtree (strftime('%s') / 60, read as UTC).
+    """
+
+    moment = datetime.datetime.strptime(event_time, EVENT_TIME_FORMAT)
+    return calendar.timegm(moment.timetuple()) // 60
@@ -0,0 +1,213 @@
+# db_executor.py
+
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class DatabaseExecutor:
+
+    """
+    Runs database calls on a background worker thread so a slow disk or a
+    locked database never freezes the window.
+
+    Tkinter widgets may only be touched from the main (Tk) thread, so results
+    are not handed over directly. The worker puts finished callbacks on a
+    queue and the Tk main loop picks them up with after() and runs them.
+
+    Jobs run one at a time in the order they were submitted, so a refresh
+    submitted after a write always sees that write.
+
+    Usage:
+        executor.submit(db_manager.get_tasks, user_id, on_success=self.show_tasks)
+    """
+
+    def __init__(self, root, busy_poll_ms=10, idle_poll_ms=100):
+
+        """
+        Initializes the DatabaseExecutor and starts its worker thread.
+        Must be created on the Tk thread.
+
+        Args:
+            root (tk.Tk): The app's main window (used for after()).
+            busy_poll_ms (int): How often results are picked up while jobs are running.
+            idle_poll_ms (int): How often the (empty) result queue is checked otherwise.
+        """
+
+        self.root = root
+        self.busy_poll_ms = busy_poll_ms
+        self.idle_poll_ms = idle_poll_ms
+
+        self._jobs = queue.Queue() # (future, func, args, kwargs) waiting for the worker, None = stop
+        self._ui_calls = queue.Queue() # (func, args) waiting to run on the Tk thread
+        self._pending = 0 # jobs submitted but not yet delivered (only touched on the Tk thread)
+        self._after_id = None
+        self._shut_down = False
+
+        self._worker = threading.Thread(target=self._run_jobs, name="db-executor", daemon=True)
+        self._worker.start()
+        self._poll()
+
+
+
+    def submit(self, func, *args, on_success=None, on_error=None, **kwargs):
+
+        """
+        Queues func(*args, **kwargs) to run on the worker thread.
+
+        Args:
+            func (function): The (database) function to run.
+            on_success (function): Called on the Tk thread with the result.
+            on_error (function): Called on the Tk thread with the exception if func raised.
+                If None, the error is printed.
+
+        Returns:
+            Future: A concurrent.futures.Future for the result.
+        """
+
+        future = Future()
+        if self._shut_down:
+            future.set_exception(RuntimeError("Database executor is shut down."))
+            return future
+
+        self._pending += 1
+        future.add_done_callback(lambda f: self.call_in_ui(self._deliver, f, on_success, on_error))
+        self._jobs.put((future, func, args, kwargs))
+        return future
+
+
+
+    def run_in_thread(self, func, *args, on_success=None, on_error=None, **kwargs):
+
+        """
+        Like submit(), but runs func on its own thread instead of the ordered
+        worker. Use it for long jobs (e.g. importing a big file) so normal queries
+        don't have to wait behind them. Callbacks are still delivered on the Tk thread.
+
+        Returns:
+            Future: A concurrent.futures.Future for the result.
+        """
+
+        future = Future()
+        if self._shut_down:
+            future.set_exception(RuntimeError("Database executor is shut down."))
+            return future
+
+        self._pending += 1
+        future.add_done_callback(lambda f: self.call_in_ui(self._deliver, f, on_success, on_error))
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name="db-background-job", daemon=True).start()
+        return future
+
+
+
+    def call_in_ui(self, func, *args):
+
+        """
+        Runs func(*args) on the Tk thread at the next poll. Safe to call from
+        any thread (e.g. to report progress from inside a job).
+        """
+
+        self._ui_calls.put((func, args))
+
+
+
+    def is_idle(self):
+
+        """
+        Returns True when every submitted job has been delivered and no UI calls
+        are waiting (e.g. benchmarks use it to tell when a view has settled).
+        """
+
+        return self._pending == 0 and self._ui_calls.empty()
+
+
+
+    def _run_jobs(self):
+
+        """
+        Worker thread loop --> runs queued jobs one by one until shutdown.
+        """
+
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            future, func, args, kwargs = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+
+
+    def _deliver(self, future, on_success, on_error):
+
+        """
+        Runs on the Tk thread once a job is done and calls its callback.
+        """
+
+        self._pending -= 1
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            if on_error:
+                on_error(error)
+            else:
+                print(f"Error in background database call: {error}")
+        elif on_success:
+            on_success(future.result())
+
+
+
+    def _poll(self):
+
+        """
+        Runs every callback the worker has queued, then schedules the next check.
+        Checks quickly while jobs are running and slowly when idle.
+        """
+
+        self._after_id = None
+        while True:
+            try:
+                func, args = self._ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"Error in database callback: {e}")
+
+        if not self._shut_down:
+            delay = self.busy_poll_ms if self._pending else self.idle_poll_ms
+            self._after_id = self.root.after(delay, self._poll)
+
+
+
+    def shutdown(self, wait=True):
+
+        """
+        Stops the worker thread. Jobs already queued still run first when wait is True.
+        Callbacks for them are no longer delivered.
+        """
+
+        if self._shut_down:
+            return
+        self._shut_down = True
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._jobs.put(None)
+        if wait:
+            self._worker.join()
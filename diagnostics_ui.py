@@ -0,0 +1,172 @@
+# diagnostics_ui.py
+
+import json
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+
+class DiagnosticsUI:
+
+    """
+    Manages the Diagnostics tab: shows the QueryStats collected while the app
+    runs (how long every database call and SQL statement takes, and the slow
+    query log) so a stalling call can be found on the machine where it happens.
+
+    The tab only exists when the app was started with query stats turned on
+    (CAMPUSLINK_DIAGNOSTICS=1, see main.py).
+    """
+
+    REFRESH_INTERVAL_MS = 2000 # how often the tables update while the tab exists
+
+    def __init__(self, parent_frame, query_stats):
+
+        """
+        Initializes the DiagnosticsUI.
+
+        Args:
+            parent_frame (ttk.Frame): The frame to place the UI widgets on.
+            query_stats (QueryStats): The stats to show (DatabaseManager.query_stats).
+        """
+
+        self.parent_frame = parent_frame
+        self.query_stats = query_stats
+
+        self._create_widgets()
+        self.refresh()
+        self.parent_frame.after(self.REFRESH_INTERVAL_MS, self._auto_refresh)
+
+
+
+    def _create_widgets(self):
+
+        """
+        Creates the three tables (calls, statements, slow queries) and the buttons.
+        """
+
+        header = ttk.Label(self.parent_frame, text="Database Diagnostics", font=("Arial", 18, "bold"))
+        header.pack(pady=10)
+
+        self.summary_label = ttk.Label(self.parent_frame, text="", font=("Arial", 10, "italic"))
+        self.summary_label.pack()
+
+        # Buttons along the bottom
+        # note: packed before the tables (at the bottom) so the tables can't push them off screen
+        button_frame = ttk.Frame(self.parent_frame)
+        button_frame.pack(side="bottom", pady=10)
+        ttk.Button(button_frame, text="Refresh", command=self.refresh).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Reset", command=self._reset).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Save as JSON...", command=self._save).pack(side="left", padx=5)
+
+        # One sub-tab per table
+        tables = ttk.Notebook(self.parent_frame)
+        tables.pack(fill="both", expand=True, padx=10, pady=5)
+
+        latency_columns = [("count", "Calls", 60), ("mean", "Mean ms", 80), ("p50", "p50 ms", 70),
+                           ("p95", "p95 ms", 70), ("p99", "p99 ms", 70), ("max", "Max ms", 80), ("total", "Total ms", 90)]
+        self.methods_tree = self._create_tree(tables, "Calls", ("Method", 200), latency_columns)
+        self.statements_tree = self._create_tree(tables, "Statements", ("SQL", 400), latency_columns)
+        self.slow_tree = self._create_tree(tables, "Slow queries", ("Method", 160),
+                                           [("ms", "ms", 80), ("at", "When", 170), ("thread", "Thread", 110),
+                                            ("slowest", "Slowest statement", 400)])
+
+
+
+    def _create_tree(self, notebook, title, first_column, columns):
+
+        """
+        Creates a Treeview with a scrollbar as a new sub-tab.
+
+        Args:
+            notebook (ttk.Notebook): Where the sub-tab goes.
+            title (str): The sub-tab's title.
+            first_column (tuple): (heading, width) of the tree column.
+            columns (list): (id, heading, width) of every other column.
+        """
+
+        frame = ttk.Frame(notebook)
+        notebook.add(frame, text=title)
+
+        tree = ttk.Treeview(frame, columns=[column[0] for column in columns])
+        tree.heading("#0", text=first_column[0])
+        tree.column("#0", width=first_column[1], stretch=True)
+        for column_id, heading, width in columns:
+            tree.heading(column_id, text=heading)
+            tree.column(column_id, width=width, anchor="e" if column_id != "at" else "w", stretch=False)
+
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        tree.pack(side="left", fill="both", expand=True)
+        return tree
+
+
+
+    def refresh(self):
+
+        """
+        Reloads all three tables from the current stats.
+        """
+
+        snapshot = self.query_stats.snapshot()
+
+        # Most total time first --> the calls worth looking at are on top
+        self._fill_latency_tree(self.methods_tree, snapshot["methods"])
+        self._fill_latency_tree(self.statements_tree, snapshot["statements"])
+
+        self.slow_tree.delete(*self.slow_tree.get_children())
+        for entry in reversed(snapshot["slow_queries"]): # newest first
+            slowest = max(entry["statements"], key=lambda statement: statement["ms"], default=None)
+            slowest_text = f"{slowest['ms']:.1f} ms  {slowest['sql']}" if slowest else ""
+            self.slow_tree.insert("", "end", text=entry["method"],
+                                  values=(f"{entry['ms']:.1f}", entry["at"], entry["thread"], slowest_text))
+
+        calls = sum(stats["count"] for stats in snapshot["methods"].values())
+        self.summary_label.config(
+            text=f"{calls} calls since {snapshot['since']}, "
+                 f"{len(snapshot['slow_queries'])} slower than {snapshot['slow_threshold_ms']} ms"
+        )
+
+
+
+    def _fill_latency_tree(self, tree, stats):
+        tree.delete(*tree.get_children())
+        for name, summary in sorted(stats.items(), key=lambda item: item[1]["total_ms"], reverse=True):
+            tree.insert("", "end", text=name, values=(
+                summary["count"], f"{summary['mean_ms']:.2f}", summary["p50_ms"], summary["p95_ms"],
+                summary["p99_ms"], f"{summary['max_ms']:.2f}", f"{summary['total_ms']:.1f}"
+            ))
+
+
+
+    def _auto_refresh(self):
+        # note: stops by itself once the tab's widgets are gone (e.g. the window closed)
+        if not self.methods_tree.winfo_exists():
+            return
+        self.refresh()
+        self.parent_frame.after(self.REFRESH_INTERVAL_MS, self._auto_refresh)
+
+
+
+    def _reset(self):
+        self.query_stats.reset()
+        self.refresh()
+
+
+
+    def _save(self):
+
+        """
+        Saves everything collected so far to a JSON file (to attach to a bug report).
+        """
+
+        path = filedialog.asksaveasfilename(
+            parent=self.parent_frame, title="Save Diagnostics",
+            defaultextension=".json", filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            with open(path, "w") as file:
+                json.dump(self.query_stats.snapshot(), file, indent=2)
+        except OSError as e:
+            messagebox.showerror("Save Failed", f"Could not save the diagnostics: {e}", parent=self.parent_frame)
@@ -0,0 +1,170 @@
+# event_bus.py
+
+import threading
+from collections import namedtuple
+
+
+# What happened to a row
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+BULK = "bulk" # many rows changed at once (e.g. an import) --> re-query instead of patching
+
+# One change to one row.
+# table: 'users', 'tasks', 'posts' or 'events'
+# action: CREATED, UPDATED, DELETED or BULK
+# row_id: the id of the row (None for BULK)
+# data: for CREATED the new row as a dictionary, for UPDATED just the columns
+#       that changed, None otherwise
+ChangeEvent = namedtuple("ChangeEvent", ["table", "action", "row_id", "data"], defaults=[None, None])
+
+
+
+class EventBus:
+
+    """
+    Lets the parts of the app tell each other about data changes without
+    knowing about each other. DatabaseManager publishes an event for every
+    row it creates, updates or deletes; any view that shows that table
+    subscribes and patches what it shows instead of querying again.
+
+    Events can be published from any thread (database calls run on the
+    executor's worker). They are collected and handed to subscribers on the
+    Tk thread in one go, so a burst of N writes turns into one call per
+    subscriber (one UI update) instead of N. Events for the same row in one
+    burst are merged (e.g. created then deleted = nothing happened).
+
+    Usage:
+        bus = EventBus(schedule=db_executor.call_in_ui)
+        token = bus.subscribe("tasks", self.apply_task_events)
+        bus.publish(ChangeEvent("tasks", UPDATED, 12, {"is_completed": True}))
+    """
+
+    def __init__(self, schedule=None):
+
+        """
+        Initializes the EventBus.
+
+        Args:
+            schedule (function): Called as schedule(func) to run func later on the Tk
+                thread (e.g. DatabaseExecutor.call_in_ui). If None, events are
+                delivered right away on the publishing thread.
+        """
+
+        self.schedule = schedule
+        self._subscribers = {} # token -> (table, callback)
+        self._next_token = 0
+        self._pending = [] # events published since the last delivery
+        self._flush_scheduled = False
+        self._lock = threading.Lock() # protects everything above
+
+
+
+    def subscribe(self, table, callback):
+
+        """
+        Registers callback(events) for a table. events is a list of ChangeEvents
+        for that table, already merged, in the order they happened.
+
+        Returns:
+            int: A token to pass to unsubscribe().
+        """
+
+        with self._lock:
+            self._next_token += 1
+            self._subscribers[self._next_token] = (table, callback)
+            return self._next_token
+
+
+
+    def unsubscribe(self, token):
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+
+
+    def publish(self, event):
+
+        """
+        Queues an event. Safe to call from any thread.
+        """
+
+        with self._lock:
+            self._pending.append(event)
+            # note: only the first event of a burst schedules a delivery, the rest ride along
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+
+        if self.schedule:
+            self.schedule(self.flush)
+        else:
+            self.flush()
+
+
+
+    def flush(self):
+
+        """
+        Delivers every queued event: one call per subscriber with all events for its table.
+        """
+
+        with self._lock:
+            events = self._pending
+            self._pending = []
+            self._flush_scheduled = False
+            subscribers = list(self._subscribers.values())
+
+        by_table = {}
+        for event in coalesce(events):
+            by_table.setdefault(event.table, []).append(event)
+
+        for table, callback in subscribers:
+            if table in by_table:
+                try:
+                    callback(by_table[table])
+                except Exception as e:
+                    print(f"Error in event subscriber: {e}")
+
+
+
+def coalesce(events):
+
+    """
+    Merges events for the same row so each row appears at most once:
+        created + updated  -> created (with the updated data)
+        created + deleted  -> nothing
+        updated + updated  -> updated (changes combined)
+        updated + deleted  -> deleted
+    Rows keep the position of their first event. BULK events are kept as one.
+
+    Args:
+        events (list): ChangeEvents in the order they happened.
+
+    Returns:
+        list: The merged ChangeEvents.
+    """
+
+    merged = {} # (table, row_id) -> event, dicts keep insertion order
+    for event in events:
+        if event.action == BULK:
+            merged[(event.table, BULK)] = event
+            continue
+
+        key = (event.table, event.row_id)
+        earlier = merged.get(key)
+        if earlier is None:
+            merged[key] = event
+        elif event.action == DELETED:
+            if earlier.action == CREATED:
+                del merged[key] # never seen by anyone --> nothing to do
+            else:
+                merged[key] = event
+        elif event.action == UPDATED and earlier.action in (CREATED, UPDATED):
+            data = dict(earlier.data or {})
+            data.update(event.data or {})
+            merged[key] = earlier._replace(data=data)
+        else:
+            merged[key] = event
+
+    return list(merged.values())
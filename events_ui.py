@@ -0,0 +1,524 @@
+# events_ui.py
+
+import calendar # month names and weekday names
+import datetime
+import tkinter as tk
+from tkinter import ttk, messagebox
+from collections import OrderedDict
+from database_manager import EVENT_TIME_FORMAT
+
+
+class EventsUI:
+
+    """
+    Manages the Events tab: a campus events calendar with a month view (6
+    weeks of day cells) and a week view.
+
+    The day cells are created once and only their text changes when another
+    month or week is shown, so switching costs the same however many events
+    there are. Each switch loads just the events overlapping the days on
+    screen (DatabaseManager.get_events_between). Loaded periods are cached and
+    the ones before and after are loaded in the background, so going to the
+    next or previous month is instant.
+    """
+
+    MONTH_LINES_PER_CELL = 3 # events listed in a day cell in the month view ("+N more" after that)
+    WEEK_LINES_PER_CELL = 12 # the same in the week view, where the cells are taller
+    CELL_TITLE_LENGTH = 18 # characters of an event title shown in a day cell
+    CACHE_SIZE = 8 # periods kept in memory (the one shown and its neighbours)
+
+    def __init__(self, parent_frame, db_manager, db_executor, user_id, change_monitor=None):
+
+        """
+        Initializes the EventsUI.
+
+        Args:
+            parent_frame (ttk.Frame): The frame to place the UI widgets on.
+            db_manager (DatabaseManager): The app's shared DatabaseManager.
+            db_executor (DatabaseExecutor): Runs the database calls off the Tk thread.
+            user_id (int): The ID of the currently logged-in user.
+            change_monitor (ChangeMonitor): If given, the calendar reloads when events are
+                changed by another CampusLink window on the same database.
+        """
+
+        self.parent_frame = parent_frame
+        self.db_manager = db_manager
+        self.db_executor = db_executor
+        self.user_id = user_id
+
+        self.view = tk.StringVar(value="month") # 'month' or 'week'
+        self.shown_date = datetime.date.today() # any day inside the month/week on screen
+        self.selected_date = self.shown_date # the day whose events are listed below the calendar
+
+        self._cells = [] # (frame, day label, events label) for each day cell, row by row
+        self._first_day = None # date in the top left cell
+        self._events_by_day = {} # date -> events on that day, for the period on screen
+        self._loaded = OrderedDict() # (first day, number of days) -> events by day, least recently used first
+        self._loading = set() # (generation, period) of the loads running right now
+        self._generation = 0 # bumped when the data changes, results loaded before that are dropped
+
+        self._create_widgets()
+        self.show_period()
+
+        # Reload when events change (in another window through the monitor, here through the event bus)
+        if change_monitor:
+            monitor_token = change_monitor.subscribe("events", lambda table: self._events_changed())
+            self.calendar_frame.bind("<Destroy>", lambda event: change_monitor.unsubscribe(monitor_token), add="+")
+        event_bus = self.db_manager.event_bus
+        if event_bus:
+            bus_token = event_bus.subscribe("events", lambda events: self._events_changed())
+            self.calendar_frame.bind("<Destroy>", lambda event: event_bus.unsubscribe(bus_token), add="+")
+
+
+
+    def _create_widgets(self):
+
+        """
+        Sets up the toolbar, the calendar grid and the list of the selected day's events.
+        """
+
+        header = ttk.Label(self.parent_frame, text="Events Calendar", font=("Arial", 18, "bold"))
+        header.pack(pady=10)
+
+        # Toolbar: < Today > | period name | Month/Week | Add Event
+        toolbar = ttk.Frame(self.parent_frame)
+        toolbar.pack(fill="x", padx=10)
+        ttk.Button(toolbar, text="<", width=3, command=lambda: self.move(-1)).pack(side="left")
+        ttk.Button(toolbar, text="Today", command=self.go_to_today).pack(side="left", padx=2)
+        ttk.Button(toolbar, text=">", width=3, command=lambda: self.move(1)).pack(side="left")
+        self.period_label = ttk.Label(toolbar, font=("Arial", 12, "bold"))
+        self.period_label.pack(side="left", padx=10)
+        ttk.Button(toolbar, text="Add Event", command=self._open_add_event_dialog).pack(side="right")
+        ttk.Radiobutton(toolbar, text="Week", value="week", variable=self.view, command=self._view_changed).pack(side="right", padx=5)
+        ttk.Radiobutton(toolbar, text="Month", value="month", variable=self.view, command=self._view_changed).pack(side="right")
+
+        # The selected day's events (packed at the bottom before the calendar so it keeps its space)
+        day_frame = ttk.Frame(self.parent_frame)
+        day_frame.pack(side="bottom", fill="x", padx=10, pady=(5, 0))
+        day_top = ttk.Frame(day_frame)
+        day_top.pack(fill="x")
+        self.day_label = ttk.Label(day_top, font=("Arial", 11, "bold"))
+        self.day_label.pack(side="left")
+        self.delete_button = ttk.Button(day_top, text="Delete Event", command=self._delete_selected_event)
+        self.delete_button.pack(side="right")
+        self.delete_button.state(["disabled"])
+
+        columns = ("time", "title", "location", "by")
+        self.day_tree = ttk.Treeview(day_frame, columns=columns, show="headings", height=5, selectmode="browse")
+        for column_id, heading, width in (("time", "Time", 150), ("title", "Event", 250), ("location", "Location", 150), ("by", "By", 100)):
+            self.day_tree.heading(column_id, text=heading)
+            self.day_tree.column(column_id, width=width, stretch=column_id == "title")
+        scrollbar = ttk.Scrollbar(day_frame, orient="vertical", command=self.day_tree.yview)
+        self.day_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.day_tree.pack(fill="x", expand=True)
+        self.day_tree.bind("<<TreeviewSelect>>", self._on_event_selected)
+
+        # Calendar grid: weekday names, then 6 rows of 7 day cells (the week view uses the first row)
+        self.calendar_frame = ttk.Frame(self.parent_frame)
+        self.calendar_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        for column, name in enumerate(calendar.day_abbr):
+            ttk.Label(self.calendar_frame, text=name, anchor="center").grid(row=0, column=column, sticky="ew")
+            self.calendar_frame.grid_columnconfigure(column, weight=1, uniform="day")
+
+        for index in range(42):
+            row, column = divmod(index, 7)
+            cell = tk.Frame(self.calendar_frame, borderwidth=1, relief="solid", background="white")
+            cell.grid(row=row + 1, column=column, sticky="nsew")
+            day_label = tk.Label(cell, anchor="ne", background="white", font=("Arial", 9, "bold"))
+            day_label.pack(fill="x")
+            events_label = tk.Label(cell, anchor="nw", justify="left", background="white", font=("Arial", 8))
+            events_label.pack(fill="both", expand=True)
+            # note: the click works anywhere in the cell, and the cell is found again by its position
+            for widget in (cell, day_label, events_label):
+                widget.bind("<Button-1>", lambda event, index=index: self._on_cell_clicked(index))
+            self._cells.append((cell, day_label, events_label))
+        for row in range(6):
+            self.calendar_frame.grid_rowconfigure(row + 1, weight=1, uniform="week")
+
+
+
+    def _period(self, shown_date=None):
+
+        """
+        Returns the days on screen for the month/week containing shown_date.
+
+        Returns:
+            tuple: (first day, number of days). A month shows the 6 weeks starting
+                on the Monday on or before the 1st.
+        """
+
+        shown_date = shown_date or self.shown_date
+        if self.view.get() == "week":
+            return shown_date - datetime.timedelta(days=shown_date.weekday()), 7
+        first_of_month = shown_date.replace(day=1)
+        return first_of_month - datetime.timedelta(days=first_of_month.weekday()), 42
+
+
+
+    def _neighbour(self, step):
+        # A day in the month/week step periods away from the one on screen
+        if self.view.get() == "week":
+            return self.shown_date + datetime.timedelta(weeks=step)
+        month_index = self.shown_date.year * 12 + self.shown_date.month - 1 + step
+        return datetime.date(month_index // 12, month_index % 12 + 1, 1)
+
+
+
+    def move(self, step):
+
+        """
+        Shows the next (step=1) or previous (step=-1) month or week.
+        """
+
+        self.shown_date = self._neighbour(step)
+        # note: keep the selected day on screen, the 1st of a new month or the same weekday of a new week
+        self.selected_date = self.shown_date
+        self.show_period()
+
+
+
+    def _view_changed(self):
+        # Switching between month and week keeps the selected day on screen
+        self.shown_date = self.selected_date
+        self.show_period()
+
+
+
+    def go_to_today(self):
+        self.shown_date = self.selected_date = datetime.date.today()
+        self.show_period()
+
+
+
+    def show_period(self):
+
+        """
+        Shows the month/week containing shown_date: the cells' dates right
+        away, the events as soon as they are loaded (at once if cached).
+        """
+
+        first_day, days = self._period()
+        self._first_day = first_day
+        view = self.view.get()
+
+        if view == "month":
+            self.period_label.configure(text=self.shown_date.strftime("%B %Y"))
+        else:
+            last_day = first_day + datetime.timedelta(days=6)
+            self.period_label.configure(text=f"{first_day.strftime('%d %b')} - {last_day.strftime('%d %b %Y')}")
+
+        # Week view uses only the first row of cells
+        for index, (cell, day_label, events_label) in enumerate(self._cells):
+            if index >= days:
+                cell.grid_remove()
+                continue
+            cell.grid()
+            day = first_day + datetime.timedelta(days=index)
+            # note: days of the previous/next month are greyed out in the month view
+            outside = view == "month" and day.month != self.shown_date.month
+            day_label.configure(text=str(day.day), foreground="grey" if outside else "black")
+        for row in range(1, 6):
+            self.calendar_frame.grid_rowconfigure(row + 1, weight=1 if view == "month" else 0)
+
+        events_by_day = self._loaded.get((first_day, days))
+        if events_by_day is not None:
+            self._loaded.move_to_end((first_day, days))
+            self._show_events(events_by_day)
+        else:
+            self._show_events({})
+            self._load((first_day, days))
+
+        # Load the previous and next month/week too, so moving there is instant
+        for step in (1, -1):
+            period = self._period(self._neighbour(step))
+            if period not in self._loaded:
+                self._load(period)
+
+
+
+    def _load(self, period):
+
+        """
+        Loads the events for a period (first day, number of days) in the background.
+        """
+
+        # note: keyed by generation too, a load started before the events changed
+        # doesn't stop the reload (and finishing doesn't mark the reload as done)
+        generation = self._generation
+        if (generation, period) in self._loading:
+            return
+        self._loading.add((generation, period))
+        self.db_executor.submit(
+            self._events_by_day_between, *period,
+            on_success=lambda events_by_day: self._period_loaded(generation, period, events_by_day),
+            on_error=lambda error: self._period_failed(generation, period, error)
+        )
+
+
+
+    def _events_by_day_between(self, first_day, days):
+
+        """
+        Runs on the database thread: loads the events overlapping the days and
+        sorts them into days (an event spanning several days is on each of them).
+
+        Returns:
+            dict: date -> list of event dictionaries, earliest first.
+        """
+
+        end_day = first_day + datetime.timedelta(days=days)
+        events_by_day = {}
+        one_day = datetime.timedelta(days=1)
+        for event in self.db_manager.get_events_between(first_day, end_day):
+            # note: times are stored as 'YYYY-MM-DD HH:MM', the date part is enough here
+            # (and much faster to read than strptime with a whole month of events)
+            day = max(datetime.date.fromisoformat(event['start_time'][:10]), first_day)
+            last = datetime.date.fromisoformat(event['end_time'][:10])
+            if event['end_time'][11:] == "00:00":
+                last -= one_day # an event ending exactly at midnight doesn't reach into that day
+            while day <= last and day < end_day:
+                events_by_day.setdefault(day, []).append(event)
+                day += one_day
+        return events_by_day
+
+
+
+    def _period_loaded(self, generation, period, events_by_day):
+        self._loading.discard((generation, period))
+        if generation != self._generation:
+            return # the events changed while this was loading, a newer load is on its way
+        self._loaded[period] = events_by_day
+        while len(self._loaded) > self.CACHE_SIZE:
+            self._loaded.popitem(last=False)
+        if period == self._period() and self.calendar_frame.winfo_exists():
+            self._show_events(events_by_day)
+
+
+
+    def _period_failed(self, generation, period, error):
+        self._loading.discard((generation, period))
+        print(f"Error loading events: {error}")
+
+
+
+    def _show_events(self, events_by_day):
+
+        """
+        Fills the day cells (and the selected day's list) with the loaded events.
+        """
+
+        self._events_by_day = events_by_day
+        lines_per_cell = self.MONTH_LINES_PER_CELL if self.view.get() == "month" else self.WEEK_LINES_PER_CELL
+        first_day, days = self._period()
+
+        for index in range(days):
+            cell, day_label, events_label = self._cells[index]
+            day = first_day + datetime.timedelta(days=index)
+            events = events_by_day.get(day, [])
+
+            lines = []
+            for event in events[:lines_per_cell]:
+                # note: an event that started on an earlier day shows "..." instead of its start time
+                starts_today = event['start_time'][:10] == day.isoformat()
+                when = event['start_time'][11:] if starts_today else "..."
+                title = event['title']
+                if len(title) > self.CELL_TITLE_LENGTH:
+                    title = title[:self.CELL_TITLE_LENGTH - 3] + "..."
+                lines.append(f"{when} {title}")
+            if len(events) > lines_per_cell:
+                lines.append(f"+{len(events) - lines_per_cell} more")
+            events_label.configure(text="\n".join(lines))
+
+            background = "#dbe9ff" if day == self.selected_date else "white"
+            for widget in (cell, day_label, events_label):
+                widget.configure(background=background)
+
+        self._show_selected_day()
+
+
+
+    def _on_cell_clicked(self, index):
+        self.selected_date = self._first_day + datetime.timedelta(days=index)
+        self._show_events(self._events_by_day)
+
+
+
+    def _show_selected_day(self):
+
+        """
+        Lists every event of the selected day below the calendar.
+        """
+
+        self.day_label.configure(text=f"Events on {self.selected_date.strftime('%A, %d %B %Y')}")
+        self.day_tree.delete(*self.day_tree.get_children())
+        for event in self._events_by_day.get(self.selected_date, []):
+            self.day_tree.insert("", "end", iid=str(event['id']), values=(
+                f"{event['start_time'][5:]} - {event['end_time'][5:]}",
+                event['title'], event['location'], event['username'] or "Unknown User"
+            ))
+        self.delete_button.state(["disabled"])
+
+
+
+    def _selected_event(self):
+        selection = self.day_tree.selection()
+        if not selection:
+            return None
+        return next((event for event in self._events_by_day.get(self.selected_date, [])
+                     if str(event['id']) == selection[0]), None)
+
+
+
+    def _on_event_selected(self, event):
+        # Only the event's creator may delete it --> same as posts on the bulletin board
+        selected = self._selected_event()
+        if selected and selected['user_id'] == self.user_id:
+            self.delete_button.state(["!disabled"])
+        else:
+            self.delete_button.state(["disabled"])
+
+
+
+    def _delete_selected_event(self):
+
+        """
+        Deletes the selected event (after asking) in the background.
+        """
+
+        selected = self._selected_event()
+        if not selected or selected['user_id'] != self.user_id:
+            return
+        if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete '{selected['title']}'?"):
+            self.db_executor.submit(
+                self.db_manager.delete_event, selected['id'],
+                on_success=lambda result: self._event_saved()
+            )
+
+
+
+    def _event_saved(self):
+        # note: with an event bus the change already arrived as an event
+        if not self.db_manager.event_bus:
+            self._events_changed()
+
+
+
+    def _events_changed(self):
+
+        """
+        Called when events were added or deleted: forgets everything loaded and
+        reloads the period on screen.
+        """
+
+        # note: a load that was already running when the events changed is dropped by the generation check
+        self._generation += 1
+        self._loaded.clear()
+        if self.calendar_frame.winfo_exists():
+            first_day, days = self._period()
+            self._load((first_day, days))
+            for step in (1, -1):
+                self._load(self._period(self._neighbour(step)))
+
+
+
+    def _open_add_event_dialog(self):
+        AddEventDialog(self.parent_frame, self.db_manager, self.db_executor, self.user_id,
+                       self.selected_date, self._event_saved)
+
+
+
+
+class AddEventDialog(tk.Toplevel):
+
+    """
+    A dialog window for adding a new event to the calendar.
+    """
+
+    def __init__(self, parent, db_manager, db_executor, user_id, day, on_event_added):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.db_executor = db_executor
+        self.user_id = user_id
+        self.on_event_added = on_event_added
+
+        self.title("Add Event")
+        self.geometry("420x420")
+        self.resizable(False, False)
+        self.grab_set() # modal, like the other dialogs
+
+        self._create_widgets(day)
+
+
+
+    def _create_widgets(self, day):
+
+        """
+        Creates the input fields (dates default to the selected day) and the Save button.
+        """
+
+        frame = ttk.Frame(self, padding="10")
+        frame.pack(fill="both", expand=True)
+        frame.grid_columnconfigure(1, weight=1)
+
+        self.entries = {}
+        fields = [("title", "Title:", ""), ("location", "Location:", ""),
+                  ("start_date", "Start date (YYYY-MM-DD):", day.isoformat()), ("start_time", "Start time (HH:MM):", "12:00"),
+                  ("end_date", "End date (YYYY-MM-DD):", day.isoformat()), ("end_time", "End time (HH:MM):", "13:00")]
+        for row, (key, label, default) in enumerate(fields):
+            ttk.Label(frame, text=label).grid(row=row, column=0, sticky="w", pady=3)
+            entry = ttk.Entry(frame)
+            entry.insert(0, default)
+            entry.grid(row=row, column=1, sticky="ew", pady=3)
+            self.entries[key] = entry
+
+        ttk.Label(frame, text="Description:").grid(row=len(fields), column=0, sticky="nw", pady=3)
+        self.description_text = tk.Text(frame, width=30, height=6)
+        self.description_text.grid(row=len(fields), column=1, sticky="nsew", pady=3)
+
+        self.save_button = ttk.Button(frame, text="Save Event", command=self._save)
+        self.save_button.grid(row=len(fields) + 1, column=0, columnspan=2, pady=(10, 0))
+
+
+
+    def _save(self):
+
+        """
+        Checks the form and saves the event in the background.
+        """
+
+        values = {key: entry.get().strip() for key, entry in self.entries.items()}
+        if not values["title"]:
+            messagebox.showerror("Input Error", "The event needs a title.", parent=self)
+            return
+        try:
+            start = datetime.datetime.strptime(f"{values['start_date']} {values['start_time']}", EVENT_TIME_FORMAT)
+            end = datetime.datetime.strptime(f"{values['end_date']} {values['end_time']}", EVENT_TIME_FORMAT)
+        except ValueError:
+            messagebox.showerror("Input Error", "Dates must look like YYYY-MM-DD and times like HH:MM.", parent=self)
+            return
+        if end <= start:
+            messagebox.showerror("Input Error", "The event has to end after it starts.", parent=self)
+            return
+
+        # Save in the background --> button is disabled so the event can't be saved twice
+        self.save_button.state(["disabled"])
+        self.db_executor.submit(
+            self.db_manager.add_event, self.user_id, values["title"], start, end,
+            values["location"], self.description_text.get("1.0", tk.END).strip(),
+            on_success=self._event_saved,
+            on_error=self._event_failed
+        )
+
+
+
+    def _event_saved(self, event_id):
+        if event_id is None:
+            self._event_failed("the database could not save it")
+            return
+        self.on_event_added()
+        self.destroy()
+
+    def _event_failed(self, error):
+        self.save_button.state(["!disabled"])
+        messagebox.showerror("Error", f"Failed to add event: {error}", parent=self)
@@ -0,0 +1,149 @@
+# group_commit.py
+
+import queue
+import sqlite3 # imports library for working with SQLite databases
+import threading
+import time
+from concurrent.futures import Future
+
+
+class GroupCommitter:
+
+    """
+    Merges single-row writes that arrive within a few milliseconds of each
+    other into one transaction, so they share one commit (and one fsync)
+    instead of paying for one each.
+
+    Writers call submit() and wait on the returned Future; a background thread
+    collects everything submitted during the commit window, runs it on the
+    writer connection inside a single transaction, commits, and then resolves
+    all the Futures. Writes that arrive while a commit is running are picked
+    up together by the next one. The window is cut short once every waiting
+    writer is already in the group.
+
+    A statement that fails (e.g. a duplicate username) only fails its own
+    Future, the rest of the group still commits.
+    """
+
+    def __init__(self, connections, window_ms=5, max_batch=1000):
+
+        """
+        Initializes the GroupCommitter and starts its thread.
+
+        Args:
+            connections (ConnectionManager): Provides the writer connection.
+            window_ms (float): How long to wait for more writes after the first one arrives.
+            max_batch (int): Most writes merged into one transaction.
+        """
+
+        self.connections = connections
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+
+        self._queue = queue.Queue() # (future, sql, params) waiting to be committed, None = stop
+        self._waiting = 0 # writes submitted but not yet committed
+        self._waiting_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+        self._thread.start()
+
+
+
+    def submit(self, sql, params=()):
+
+        """
+        Queues one write for the next group commit.
+
+        Returns:
+            Future: Resolves to (lastrowid, rowcount) once the write is committed.
+        """
+
+        future = Future()
+        with self._waiting_lock:
+            self._waiting += 1
+        self._queue.put((future, sql, params))
+        return future
+
+
+
+    def _run(self):
+
+        """
+        Background loop --> waits for a write, gathers whatever else arrives within
+        the window, and commits the group.
+        """
+
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                # Every writer that is waiting is already in this batch --> waiting
+                # longer can't add anything (they are all blocked on us), so commit now
+                if self._queue.empty() and len(batch) >= self._waiting:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True # commit what we have, then stop
+                    break
+                batch.append(item)
+
+            self._commit(batch)
+
+
+
+    def _commit(self, batch):
+
+        """
+        Runs a group of writes in one transaction and resolves their Futures.
+        """
+
+        results = []
+        try:
+            with self.connections.transaction() as conn:
+                for future, sql, params in batch:
+                    try:
+                        cursor = conn.execute(sql, params)
+                        results.append((future, (cursor.lastrowid, cursor.rowcount), None))
+                    except sqlite3.Error as e:
+                        # sqlite already undid just this statement, the transaction carries on
+                        results.append((future, None, e))
+        except sqlite3.Error as e:
+            # the commit itself failed --> nothing in the group was saved
+            self._done(len(batch))
+            for future, sql, params in batch:
+                future.set_exception(e)
+            return
+
+        self._done(len(batch))
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+
+    def _done(self, count):
+        with self._waiting_lock:
+            self._waiting -= count
+
+
+
+    def close(self):
+
+        """
+        Commits anything still queued and stops the background thread.
+        """
+
+        self._queue.put(None)
+        self._thread.join()
@@ -0,0 +1,153 @@
+# identity_cache.py
+
+import threading # lock so the cache can be shared between threads
+from collections import OrderedDict
+
+
+class IdentityCache:
+
+    """
+    A small in-memory cache of user id <-> username, so looking up the same
+    user again (e.g. the author of every post in the feed) never has to go
+    back to the database.
+
+    The cache holds at most max_size users. When it is full the user that was
+    looked up longest ago is dropped (LRU = least recently used). Both
+    directions are always kept in step: an id is cached together with its
+    username or not at all.
+
+    Only users that exist are cached. A lookup that finds nothing in the
+    database is not remembered, so a user created later is found right away.
+    """
+
+    def __init__(self, max_size=1024):
+
+        """
+        Initializes the IdentityCache.
+
+        Args:
+            max_size (int): The most users kept in the cache.
+        """
+
+        self.max_size = max_size
+        self._by_id = OrderedDict() # user id -> username, least recently used first
+        self._by_name = {} # username -> user id (same users as _by_id)
+        self._lock = threading.Lock()
+        self.hits = 0 # lookups answered from the cache
+        self.misses = 0 # lookups that had to go to the database
+
+
+
+    def get_username(self, user_id):
+
+        """
+        Returns the cached username for a user ID, or None if it isn't cached.
+        """
+
+        with self._lock:
+            username = self._by_id.get(user_id)
+            if username is None:
+                self.misses += 1
+                return None
+            self._by_id.move_to_end(user_id) # now the most recently used
+            self.hits += 1
+            return username
+
+
+
+    def get_user_id(self, username):
+
+        """
+        Returns the cached user ID for a username, or None if it isn't cached.
+        """
+
+        with self._lock:
+            user_id = self._by_name.get(username)
+            if user_id is None:
+                self.misses += 1
+                return None
+            self._by_id.move_to_end(user_id)
+            self.hits += 1
+            return user_id
+
+
+
+    def put(self, user_id, username):
+
+        """
+        Remembers that user_id has this username, replacing anything cached
+        for the same id or the same username.
+        """
+
+        if user_id is None or username is None:
+            return
+
+        with self._lock:
+            self._forget(user_id, username)
+            self._by_id[user_id] = username
+            self._by_name[username] = user_id
+            # Full --> drop the least recently used user
+            while len(self._by_id) > self.max_size:
+                old_id, old_name = self._by_id.popitem(last=False)
+                del self._by_name[old_name]
+
+
+
+    def invalidate(self, user_id=None, username=None):
+
+        """
+        Forgets a user (by ID, username or both). Call this whenever a user is
+        added, renamed or removed so the cache can't return an old name.
+        """
+
+        with self._lock:
+            self._forget(user_id, username)
+
+
+
+    def _forget(self, user_id, username):
+
+        """
+        Removes the entries for user_id and for username. Caller holds the lock.
+        """
+
+        old_name = self._by_id.pop(user_id, None)
+        if old_name is not None:
+            del self._by_name[old_name]
+        old_id = self._by_name.pop(username, None)
+        if old_id is not None:
+            del self._by_id[old_id]
+
+
+
+    def clear(self):
+        with self._lock:
+            self._by_id.clear()
+            self._by_name.clear()
+
+
+
+    def stats(self):
+
+        """
+        Returns the cache's size and hit/miss counts (handy when debugging).
+
+        Returns:
+            dict: size, max_size, hits, misses and hit_rate (0.0 - 1.0).
+        """
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._by_id),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+
+    def __len__(self):
+        with self._lock:
+            return len(self._by_id)
@@ -13,7 +13,7 @@ class LoginUI:
     """
 
 
-    def __init__(self, parent_frame, db_manager, show_main_app_callback):
+    def __init__(self, parent_frame, db_manager, db_executor, show_main_app_callback):
 
         """
         Initializes the LoginUI.
@@ -21,11 +21,13 @@ class LoginUI:
         Args:
             parent_frame (ttk.Frame): The frame to place the UI widgets on.
             db_manager (DatabaseManager): An instance of the DatabaseManager for authentication.
+            db_executor (DatabaseExecutor): Runs the database calls off the Tk thread.
             show_main_app_callback (function): The method in CampusLinkApp to call on successful login.
         """
 
         self.parent_frame = parent_frame
         self.db_manager = db_manager
+        self.db_executor = db_executor
         self.show_main_app_callback = show_main_app_callback
         
         self._create_login_widgets()
@@ -63,8 +65,8 @@ class LoginUI:
         self.password_entry.grid(row=1, column=1, padx=5, pady=5)
         
         # Login Button
-        login_button = ttk.Button(main_login_frame, text="Login", command=self._handle_login)
-        login_button.pack(pady=10)
+        self.login_button = ttk.Button(main_login_frame, text="Login", command=self._handle_login)
+        self.login_button.pack(pady=10)
 
         # --- Separator and Create Account Section ---
         ttk.Separator(main_login_frame, orient="horizontal").pack(fill="x", pady=20)
@@ -72,8 +74,12 @@ class LoginUI:
         create_account_label = ttk.Label(main_login_frame, text="New to CampusLink?", font=("Arial", 12))
         create_account_label.pack(pady=5)
         
-        create_account_button = ttk.Button(main_login_frame, text="Create Account", command=self._handle_create_account)
-        create_account_button.pack()
+        self.create_account_button = ttk.Button(main_login_frame, text="Create Account", command=self._handle_create_account)
+        self.create_account_button.pack()
+
+        # Shows that a request is running in the background
+        self.status_label = ttk.Label(main_login_frame, text="", font=("Arial", 10, "italic"))
+        self.status_label.pack(pady=(10, 0))
     
 
 
@@ -106,13 +112,36 @@ class LoginUI:
             return
 
         # Use the updated check_user method that returns a specific status string
-        login_status = self.db_manager.check_user(username, password)
+        # note: runs on its own background thread, the window stays responsive meanwhile.
+        # password hashing takes ~100 ms on purpose, so it doesn't use the ordered
+        # database worker where it would hold up every other query
+        def check_login():
+            login_status = self.db_manager.check_user(username, password)
+            user_id = self.db_manager.get_user_id(username) if login_status == "success" else None
+            return login_status, user_id
+
+        self._set_busy("Logging in...")
+        self.db_executor.run_in_thread(
+            check_login,
+            on_success=lambda result: self._finish_login(username, *result),
+            on_error=self._handle_request_error
+        )
+
+
+
+    def _finish_login(self, username, login_status, user_id):
+
+        """
+        Called on the Tk thread once check_user has answered.
+        """
+
+        self._set_busy(None)
         
         # --- START OF HIGHLIGHTED CHANGE ---
         # The logic is now a decision tree based on the status string.
         if login_status == "success":
             # Correct username and password, so proceed with login.
-            self.show_main_app_callback(username)
+            self.show_main_app_callback(username, user_id)
             self._clear_entries()
         elif login_status == "user_not_found":
             # User does not exist, show the specific message.
@@ -138,13 +167,49 @@ class LoginUI:
             messagebox.showerror("Input Error", "Username and password cannot be empty.")
             return
 
-        # Attempt to add the user to the database
-        if self.db_manager.add_user(username, password):
+        # Attempt to add the user to the database (on a background thread, hashing is slow on purpose)
+        self._set_busy("Creating account...")
+        self.db_executor.run_in_thread(
+            self.db_manager.add_user, username, password,
+            on_success=lambda added: self._finish_create_account(username, added),
+            on_error=self._handle_request_error
+        )
+
+
+
+    def _finish_create_account(self, username, added):
+
+        """
+        Called on the Tk thread once add_user has answered.
+        """
+
+        self._set_busy(None)
+        if added:
             messagebox.showinfo("Success", f"Account for '{username}' created successfully! You can now log in.")
             self._clear_entries() # clears entries after successful creation        
         # note: The add_user method handles errors internally
 
 
+
+    def _handle_request_error(self, error):
+        self._set_busy(None)
+        messagebox.showerror("Error", f"An unexpected error occurred: {error}")
+
+
+
+    def _set_busy(self, message):
+
+        """
+        Disables the buttons and shows a message while a request runs
+        (message=None re-enables them).
+        """
+
+        state = ["disabled"] if message else ["!disabled"]
+        self.login_button.state(state)
+        self.create_account_button.state(state)
+        self.status_label.configure(text=message or "")
+
+
     def _clear_entries(self):
         
         """
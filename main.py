@@ -1,5 +1,10 @@
 # main.py
 
+# Startup profiling (--profile-startup startup.json, see startup_profiler.py)
+# note: started before the other imports so their time is recorded too
+import startup_profiler
+startup_profiler.start_from_environment()
+
 import tkinter as tk
 from tkinter import ttk, messagebox
 import os
@@ -7,12 +12,16 @@ import os
 
 # importing the classes from other files
 
+from connection_manager import ConnectionManager
 from database_manager import DatabaseManager
+from db_executor import DatabaseExecutor
+from change_monitor import ChangeMonitor
+from event_bus import EventBus
 from login_ui import LoginUI
-from account_ui import AccountUI
-from activities_ui import ActivitiesUI
-from bulletin_ui import BulletinUI
-from emergency_contacts_ui import EmergencyContactsUI
+# note: the tab UIs (account_ui, activities_ui, events_ui, bulletin_ui,
+# emergency_contacts_ui, diagnostics_ui) are imported the first time their tab is opened, see _build_tab
+
+startup_profiler.mark("imports")
 
 
 class CampusLinkApp(tk.Tk):
@@ -37,6 +46,7 @@ class CampusLinkApp(tk.Tk):
         # Ensure parent class 'tk.Tk' window is correctly set up before CampusLinkApp class
         # adds its specific features 
         super().__init__()
+        startup_profiler.mark("tk init")
         self.title("CampusLink Desktop App") # Set window title
         self.geometry("800x600") # Set initial window size
         
@@ -51,9 +61,39 @@ class CampusLinkApp(tk.Tk):
         self.grid_columnconfigure(0, weight=1)
 
 
-        # Initialize Database Manager and create tables
-        self.db_manager = DatabaseManager(os.path.join(os.getcwd(), "campuslink.db"))
+        # Initialize the shared connection manager, Database Manager and create tables
+        # note: the app owns the only ConnectionManager. every UI gets this same
+        # db_manager passed in, and the connections are closed when the window closes
+        db_path = os.path.join(os.getcwd(), "campuslink.db")
+        self.connection_manager = ConnectionManager(db_path)
+        startup_profiler.mark("open database connection")
+
+        # Background worker for database calls --> keeps the window responsive while queries run
+        self.db_executor = DatabaseExecutor(self)
+
+        # Every row the app creates/updates/deletes is announced here so all open views can patch themselves
+        # note: events from a burst of writes reach the views together, once per executor poll
+        self.event_bus = EventBus(schedule=self.db_executor.call_in_ui)
+
+        self.db_manager = DatabaseManager(connection_manager=self.connection_manager, event_bus=self.event_bus)
         self.db_manager.create_tables()
+        startup_profiler.mark("database manager + create_tables")
+
+        # Optional query instrumentation, e.g. CAMPUSLINK_DIAGNOSTICS=1 CAMPUSLINK_SLOW_QUERY_MS=30 python main.py
+        # note: off by default, it adds a few microseconds to every database call
+        self.diagnostics_enabled = os.environ.get("CAMPUSLINK_DIAGNOSTICS", "") not in ("", "0")
+        if self.diagnostics_enabled:
+            self.db_manager.enable_query_stats(slow_threshold_ms=float(os.environ.get("CAMPUSLINK_SLOW_QUERY_MS", 50)))
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Watches the database for changes made by other CampusLink windows on the same file
+        # note: its callbacks run on the Tk thread through the executor. Our own writes are
+        # counted separately and left out, the event bus already told the views about them
+        self.db_manager.track_local_changes()
+        self.change_monitor = ChangeMonitor(db_path, deliver=self.db_executor.call_in_ui,
+                                            local_counters=self.db_manager.read_change_counters)
+        self.change_monitor.start()
+        startup_profiler.mark("change monitor")
 
         # Create and manage the Login/Main app views
         # Create a container frame to hold either the login view or the main window
@@ -78,7 +118,8 @@ class CampusLinkApp(tk.Tk):
 
         # Create instance of LoginUI class --> passing ref to call back func (show_...)
         # note: doesnt call it right away, saves to call later after successful log in        
-        self.login_ui = LoginUI(self.login_frame, self.db_manager, self.show_main_app_view)
+        self.login_ui = LoginUI(self.login_frame, self.db_manager, self.db_executor, self.show_main_app_view)
+        startup_profiler.mark("login view")
 
 
         # Create a Notebook (tabbed interface) Widget for navigation
@@ -100,13 +141,9 @@ class CampusLinkApp(tk.Tk):
         # Add a placeholder label for now -> inside frame
         # ttk.Label(self.activities_frame, text="Activities & Task Schedule Manager (Coming Soon!)", font=("Arial", 14)).pack(pady=50)
 
-        # Events Calendar Frame -> removing events frame -> modified proj to meet deadline
-        #self.events_frame = ttk.Frame(self.notebook, padding="10")
-        ##self.events_frame.grid_rowconfigure(0, weight=1)
-        ##self.events_frame.grid_columnconfigure(0, weight=1)
-        #self.notebook.add(self.events_frame, text="Events")
-        # Add a placeholder label for now
-        #ttk.Label(self.events_frame, text="Events Calendar (Coming Soon!)", font=("Arial", 14)).pack(pady=50)
+        # Events Calendar Frame
+        self.events_frame = ttk.Frame(self.notebook, padding="10")
+        self.notebook.add(self.events_frame, text="Events")
 
         # Bulletin Board Frame
         self.bulletin_frame = ttk.Frame(self.notebook, padding="10")
@@ -128,44 +165,123 @@ class CampusLinkApp(tk.Tk):
         self.account_frame = ttk.Frame(self.notebook, padding="10")
         self.notebook.add(self.account_frame, text="Account Info")
         ##ttk.Label(self.account_frame, text = "User Account Information (Coming Soon!)", font=("Arial", 14)).pack(pady=50)
+
+        # Diagnostics Frame --> only when query stats are turned on (see above)
+        if self.diagnostics_enabled:
+            self.diagnostics_frame = ttk.Frame(self.notebook, padding="10")
+            self.notebook.add(self.diagnostics_frame, text="Diagnostics")
         
 
-        # Create instance of AccountUI
+        # The UI inside each tab is only built (and loads its data) the first time
+        # the tab is opened --> logging in doesn't wait for tabs nobody looked at
         self.account_ui = None
-        # Create instance of BulletinUI
+        self.activities_ui = None
+        self.events_ui = None
         self.bulletin_ui = None
-        # Create instance of EmergencyUI
-        self.emergency_contacts_ui = EmergencyContactsUI(self.emergency_frame)
+        self.emergency_contacts_ui = None
+        self.diagnostics_ui = None
+
+        # Which function builds the UI for each tab (keyed by the tab frame's name)
+        self._tab_builders = {
+            str(self.activities_frame): self._build_activities_tab,
+            str(self.events_frame): self._build_events_tab,
+            str(self.bulletin_frame): self._build_bulletin_tab,
+            str(self.emergency_frame): self._build_emergency_tab,
+            str(self.account_frame): self._build_account_tab,
+        }
+        if self.diagnostics_enabled:
+            self._tab_builders[str(self.diagnostics_frame)] = self._build_diagnostics_tab
+        self._built_tabs = set() # tab frame names whose UI exists right now
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        startup_profiler.mark("notebook + tab frames")
 
 
     # Create Methods to switch between views
 
 
-    def show_main_app_view(self, username):
+    def show_main_app_view(self, username, user_id=None):
 
 
         """
         Switches from the login view to the main application view.
         This method will be called by the LoginUI upon a successful login.
+
+        Args:
+            username (str): The username that logged in.
+            user_id (int): The user's ID (LoginUI looks it up together with the login check).
         """
 
         self.current_user = username # stores username so the app can use it later
-        self.current_user_id = self.db_manager.get_user_id(username) # get the user ID
+        if user_id is None:
+            user_id = self.db_manager.get_user_id(username) # get the user ID
+        self.current_user_id = user_id
         self.is_logged_in = True # sets boolean to true. i.e. someone is logged in
         self.login_frame.pack_forget() # key line for hiding the login screen
         self.app_frame.pack(fill="both", expand=True) # makes the main app frame visible by packing
         messagebox.showinfo("Success", f"Welcome, {username}!")
 
-        # Create AccountUI instance after a successful login
-        # We need the username to be set first before creating this UI.
-        # second callback here! AccountUI will store this ref and call when logout clicked
-        self.account_ui = AccountUI(self.account_frame, self.current_user, self.show_login_view)
+        # Only the tab that is showing is built now, the others when they are opened
+        # note: no <<NotebookTabChanged>> fires here, the selected tab didn't change
+        self._build_tab(self.notebook.select())
+
+
+
+    def _on_tab_changed(self, event):
+
+        """
+        Builds the UI of a tab the first time it is opened (after each login).
+        """
+
+        if self.is_logged_in:
+            self._build_tab(self.notebook.select())
+
+
+
+    def _build_tab(self, tab_name):
+
+        """
+        Builds the UI inside a tab unless it already exists.
 
+        Args:
+            tab_name (str): The tab frame's name, as returned by notebook.select().
+        """
+
+        builder = self._tab_builders.get(tab_name)
+        if builder is None or tab_name in self._built_tabs:
+            return
+        self._built_tabs.add(tab_name)
+        builder()
+
+
+
+    def _build_activities_tab(self):
+        from activities_ui import ActivitiesUI
         # Initialize the Activities UI and place it in its designated frame
-        ActivitiesUI(self.activities_frame, self.current_user_id)   
+        self.activities_ui = ActivitiesUI(self.activities_frame, self.db_manager, self.db_executor, self.current_user_id, self.change_monitor)
+
+    def _build_events_tab(self):
+        from events_ui import EventsUI
+        # Initialize the EventsUI (calendar) and place it in its designated frame
+        self.events_ui = EventsUI(self.events_frame, self.db_manager, self.db_executor, self.current_user_id, self.change_monitor)
 
+    def _build_bulletin_tab(self):
+        from bulletin_ui import BulletinUI
         # Initialize the BulletinUI and place it in its designated frame
-        self.bulletin_ui = BulletinUI(self.bulletin_frame, self.db_manager, self.current_user_id)     
+        self.bulletin_ui = BulletinUI(self.bulletin_frame, self.db_manager, self.db_executor, self.current_user_id, self.change_monitor)
+
+    def _build_emergency_tab(self):
+        from emergency_contacts_ui import EmergencyContactsUI
+        # note: the contacts are the same for everyone, so this tab is kept across logins
+        self.emergency_contacts_ui = EmergencyContactsUI(self.emergency_frame)
+
+    def _build_account_tab(self):
+        from account_ui import AccountUI
+        # second callback here! AccountUI will store this ref and call when logout clicked
+        self.account_ui = AccountUI(self.account_frame, self.current_user, self.show_login_view)
+
+    def _build_diagnostics_tab(self):
+        from diagnostics_ui import DiagnosticsUI
+        self.diagnostics_ui = DiagnosticsUI(self.diagnostics_frame, self.db_manager.query_stats)
 
 
 
@@ -183,9 +299,10 @@ class CampusLinkApp(tk.Tk):
 
         # Destroy the ActivitiesUI to clear tasks from the previous user --> added this to fix bug
         # without this tasks of another user1 will be visible to user 2 --> ...for example
-        self.activities_frame.pack_forget()
-        for widget in self.activities_frame.winfo_children():
-            widget.destroy()
+        if self.activities_ui:
+            for widget in self.activities_frame.winfo_children():
+                widget.destroy()
+            self.activities_ui = None
 
         # Destroy the AccountUI to clear the old username display -> upon logout so app resets ui
         if self.account_ui:
@@ -193,20 +310,50 @@ class CampusLinkApp(tk.Tk):
                 widget.destroy()
             self.account_ui = None
 
+        # Destroy the EventsUI --> which events can be deleted depends on who is logged in
+        if self.events_ui:
+            for widget in self.events_frame.winfo_children():
+                widget.destroy()
+            self.events_ui = None
+
         # Destroy the BulletinUI to clear the old posts display
         if self.bulletin_ui:
             for widget in self.bulletin_frame.winfo_children():
                 widget.destroy()
             self.bulletin_ui = None
 
+        # The per-user tabs are built again (for the next user) when they are opened
+        for frame in (self.activities_frame, self.events_frame, self.account_frame, self.bulletin_frame):
+            self._built_tabs.discard(str(frame))
+
         self.app_frame.pack_forget() # hides main applications tabbed interface
         self.login_frame.pack(fill="both", expand=True) # makes login screen visible again
         self.login_ui._clear_entries() # to clear previous login entries
 
 
+    def on_close(self):
+
+
+        """
+        Closes the database connections and the window.
+        This method is called when the user closes the main window.
+        """
+
+        self.change_monitor.stop()
+        self.change_monitor.join()
+        self.db_executor.shutdown() # lets queued writes finish first
+        # note: stops the password hasher's threads (and flushes group commit) while
+        # the connections are still open, it leaves the shared connections alone
+        self.db_manager.close()
+        self.connection_manager.close()
+        self.destroy()
+
+
 # Entry point guard --> "Is this script currently the main program being run? Yes? Execute." 
 if __name__ == "__main__":
     # Create an instance of the application
     app = CampusLinkApp()
+    # Writes the startup profile once the window is up (only in profiling mode)
+    startup_profiler.finish_when_idle(app, close=app.on_close)
     # Start the Tkinter event loop
     app.mainloop()
@@ -0,0 +1,476 @@
+# migrations.py
+
+# Versioned schema migrations for the CampusLink database.
+#
+# The database remembers which migrations it already has in PRAGMA user_version
+# (a number sqlite stores in the file header, 0 for a brand new file). Each
+# migration below has a version number; on startup apply_migrations runs, in
+# order, only the ones with a version higher than user_version and bumps
+# user_version after each one. When the schema is current nothing runs at all.
+#
+# To change the schema, ADD a new migration at the end of MIGRATIONS with the
+# next version number. Never edit a migration that has already shipped.
+#
+# A migration step is either a SQL string or a function that takes the
+# connection (for changes plain SQL can't express, like filling a new column).
+
+
+import sqlite3 # imports library for working with SQLite databases
+from records import make_snippet
+
+
+# ----- Migration 1: base tables -----
+# note: IF NOT EXISTS because databases made before migrations existed
+# already have these tables but still report user_version 0
+
+# --- Table for user authentication ---
+# We store a hashed password instead of the plain-text password for security.
+# 1. creates table named "users" only if doesnt exist already
+# columns:
+# 2. id : creates a unique id for each user --> auto increments for every user
+#    note: serves as "primary key". identifies each row (user)
+# 3. username: stores the username as text
+#    note: NOT NULL means it cant be empty
+#    note: UNIQUE means no two users can have same username
+# 4. password_hash: stores the hased password as non empty text
+CREATE_USERS = '''
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT NOT NULL UNIQUE,
+        password_hash TEXT NOT NULL
+    )
+'''
+
+# --- Table for the user's activities and tasks ---
+# Defining tasks table (linked to the users table via user id)
+# 1. creates table named "tasks" only if it doesnt exist already
+# columns:
+# 2. id: unique identifier for each task ("name" of first column)
+# 3. user_id: will store the ID of the user who "owns" the task
+#    thus linking this task back to a specific entry in the users table
+# 4. task_name: will store the title or name of the task
+#    note: stored as text with rule preventing empty task entry
+# 5. description: for storing details of task
+#    note: stored as text but optional (can be left empty)
+# 6. due_date: for storing the due data of a task
+# 7. is_completed: track the completion status of the task
+#    note: 0 - false (not completed), 1 - true (completed)
+#    note: each task is auto set to 0 (not completed)
+# 8. declares user_id as 'FOREIGN_KEY'
+#    note: tells db that user_id in this table must coorespond to existing id
+#    in the users table. preventing tasks from being created by users that dont exist
+CREATE_TASKS = '''
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        task_name TEXT NOT NULL,
+        description TEXT,
+        due_date TEXT,
+        is_completed BOOLEAN NOT NULL DEFAULT 0,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )
+'''
+
+# --- Table for bulletin board posts ---
+CREATE_POSTS = '''
+    CREATE TABLE IF NOT EXISTS posts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )
+'''
+
+
+# ----- Migration 3: full-text search over posts -----
+# posts_fts is an FTS5 index of each post's title and content. It is an
+# "external content" table: it stores only the index and reads the text from
+# posts itself, and the triggers keep the index in step with every insert,
+# update and delete on posts.
+def create_posts_search_index(conn):
+
+    """
+    Creates the posts_fts index and its triggers, then indexes the existing posts.
+    Skipped (with a warning) if this sqlite was built without FTS5, in which
+    case search falls back to a plain LIKE scan.
+    """
+
+    try:
+        conn.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+                title, content,
+                content='posts', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        print(f"Full-text search is not available ({e}), search will be slower.")
+        return
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN
+            INSERT INTO posts_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts BEGIN
+            INSERT INTO posts_fts (posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE OF title, content ON posts BEGIN
+            INSERT INTO posts_fts (posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO posts_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+    ''')
+    # Index the posts that already exist
+    conn.execute("INSERT INTO posts_fts (posts_fts) VALUES ('rebuild')")
+
+
+
+# ----- Migration 4: task filtering -----
+# tasks_fts indexes task names and descriptions with the trigram tokenizer,
+# which (unlike a normal word index) can answer "contains this text" queries
+# for any substring of 3 or more characters. Like posts_fts it is an external
+# content table kept up to date by triggers.
+def create_tasks_search_index(conn):
+
+    """
+    Creates the tasks_fts trigram index and its triggers, then indexes the
+    existing tasks. Skipped (with a warning) if this sqlite has no FTS5 or is
+    older than 3.34 (no trigram tokenizer), in which case text filters fall
+    back to a LIKE scan over the user's tasks.
+    """
+
+    try:
+        conn.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+                task_name, description,
+                content='tasks', content_rowid='id',
+                tokenize='trigram'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        print(f"Task text search index is not available ({e}), text filters will be slower.")
+        return
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, task_name, description) VALUES (new.id, new.task_name, new.description);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, task_name, description) VALUES ('delete', old.id, old.task_name, old.description);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF task_name, description ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, task_name, description) VALUES ('delete', old.id, old.task_name, old.description);
+            INSERT INTO tasks_fts (rowid, task_name, description) VALUES (new.id, new.task_name, new.description);
+        END
+    ''')
+    # Index the tasks that already exist
+    conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+
+
+
+# ----- Migration 5: tombstones for deleted posts -----
+# Every deleted post leaves a row here (filled by a trigger, so no delete can
+# forget it). get_posts_since hands out the tombstones newer than what a
+# client has seen, so an open feed can drop posts that were deleted elsewhere
+# without reloading. The tombstone id is the client's "deleted since" marker.
+CREATE_POST_TOMBSTONES = '''
+    CREATE TABLE IF NOT EXISTS post_tombstones (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        post_id INTEGER NOT NULL,
+        deleted_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+CREATE_POST_TOMBSTONE_TRIGGER = '''
+    CREATE TRIGGER IF NOT EXISTS posts_tombstone AFTER DELETE ON posts BEGIN
+        INSERT INTO post_tombstones (post_id) VALUES (old.id);
+    END
+'''
+
+
+
+# ----- Migration 6: per-table change counters -----
+# table_versions holds one counter per table that goes up on every insert,
+# update and delete (kept by the triggers below, so changes made by other
+# CampusLink windows on the same database file count too). The ChangeMonitor
+# compares the counters to tell which tables changed.
+WATCHED_TABLES = ("users", "tasks", "posts")
+
+def create_table_versions(conn):
+
+    """
+    Creates table_versions with a row for each watched table, and the
+    triggers that bump the counters.
+    """
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS table_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    for table in WATCHED_TABLES:
+        add_change_counter(conn, table)
+
+
+
+def add_change_counter(conn, table):
+
+    """
+    Adds a table's row to table_versions and the triggers that bump it.
+    Tables created after migration 6 call this themselves (see migration 8).
+    """
+
+    conn.execute("INSERT OR IGNORE INTO table_versions (table_name) VALUES (?)", (table,))
+    for action in ("INSERT", "UPDATE", "DELETE"):
+        # note: table names are always our own constants, never user input
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_version_{action.lower()} AFTER {action} ON {table} BEGIN
+                UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}';
+            END
+        ''')
+
+
+
+def add_local_change_counters(conn):
+
+    """
+    Counts the changes made through this one connection: a TEMP table
+    local_versions with a counter per watched table, bumped by TEMP triggers
+    next to the ones in table_versions. TEMP objects only exist for the
+    connection that made them and only fire for its own writes, so comparing
+    the two counters tells changes made here from changes made by other
+    processes. Not a migration, it has to run again for every new connection.
+
+    note: the counters are part of the same transaction as the writes, a
+    rollback undoes both
+    """
+
+    conn.execute('''
+        CREATE TEMP TABLE IF NOT EXISTS local_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    tables = [row[0] for row in conn.execute("SELECT table_name FROM table_versions")]
+    for table in tables:
+        conn.execute("INSERT OR IGNORE INTO local_versions (table_name) VALUES (?)", (table,))
+        for action in ("INSERT", "UPDATE", "DELETE"):
+            # note: a trigger body can't name a schema, local_versions is found in temp anyway
+            conn.execute(f'''
+                CREATE TEMP TRIGGER IF NOT EXISTS {table}_local_{action.lower()} AFTER {action} ON main.{table} BEGIN
+                    UPDATE local_versions SET version = version + 1 WHERE table_name = '{table}';
+                END
+            ''')
+    conn.commit()
+
+
+
+# ----- Migration 7: post snippets for the feed -----
+# The feed only shows a short preview of each post, the full text is loaded
+# when a post is opened. snippet holds that preview (made once, when the post
+# is written), and idx_posts_feed carries everything a feed page shows, so
+# paging through the feed reads only the index and never the (possibly long)
+# post bodies. It replaces idx_posts_timestamp_id from migration 2, which is
+# the first part of it.
+def add_post_snippets(conn):
+
+    """
+    Adds posts.snippet, fills it in for the existing posts and creates the feed index.
+    """
+
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(posts)")]
+    if "snippet" not in columns:
+        conn.execute("ALTER TABLE posts ADD COLUMN snippet TEXT NOT NULL DEFAULT ''")
+
+    # note: the same make_snippet the app uses when a post is written
+    conn.create_function("make_snippet", 1, make_snippet, deterministic=True)
+    conn.execute("UPDATE posts SET snippet = make_snippet(content)")
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_feed ON posts (timestamp, id, user_id, title, snippet)")
+    conn.execute("DROP INDEX IF EXISTS idx_posts_timestamp_id")
+
+
+
+# ----- Migration 8: events calendar -----
+# Campus events with a start and end time ('YYYY-MM-DD HH:MM'). The calendar
+# asks "which events overlap this month/week?", which a normal index on
+# start_time can't answer quickly: an event that started long before the
+# range may still be running, so every earlier event would have to be checked.
+# events_rtree is an R*Tree index over each event's [start, end] interval
+# (in minutes since 1970) that finds the overlapping events directly. The
+# triggers keep it in step with the events table.
+CREATE_EVENTS = '''
+    CREATE TABLE IF NOT EXISTS events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        location TEXT NOT NULL DEFAULT '',
+        description TEXT NOT NULL DEFAULT '',
+        start_time TEXT NOT NULL,
+        end_time TEXT NOT NULL,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )
+'''
+
+# note: strftime('%s') reads the time as UTC, which is fine here --> only the
+# order and the distance between two times matter, not the time zone
+EVENT_MINUTES = "CAST(strftime('%s', {}) AS INTEGER) / 60"
+
+def create_events_interval_index(conn):
+
+    """
+    Creates the events_rtree interval index and its triggers, then indexes the
+    existing events. Skipped (with a warning) if this sqlite was built without
+    R*Tree, in which case the calendar falls back to idx_events_start.
+    """
+
+    try:
+        # note: rtree_i32 stores whole numbers exactly (the plain rtree rounds to 32-bit floats)
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS events_rtree USING rtree_i32(id, start_minute, end_minute)")
+    except sqlite3.OperationalError as e:
+        print(f"The events interval index is not available ({e}), the calendar will be slower.")
+        return
+
+    new_start, new_end = EVENT_MINUTES.format("new.start_time"), EVENT_MINUTES.format("new.end_time")
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS events_rtree_insert AFTER INSERT ON events BEGIN
+            INSERT INTO events_rtree (id, start_minute, end_minute) VALUES (new.id, {new_start}, {new_end});
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS events_rtree_delete AFTER DELETE ON events BEGIN
+            DELETE FROM events_rtree WHERE id = old.id;
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS events_rtree_update AFTER UPDATE OF start_time, end_time ON events BEGIN
+            UPDATE events_rtree SET start_minute = {new_start}, end_minute = {new_end} WHERE id = new.id;
+        END
+    ''')
+    # Index the events that already exist
+    conn.execute(
+        "INSERT OR REPLACE INTO events_rtree (id, start_minute, end_minute) "
+        f"SELECT id, {EVENT_MINUTES.format('start_time')}, {EVENT_MINUTES.format('end_time')} FROM events"
+    )
+
+
+
+def add_events_change_counter(conn):
+    add_change_counter(conn, "events")
+
+
+
+# List of (version, description, steps). Versions must go up by one.
+MIGRATIONS = [
+    (1, "Create users, tasks and posts tables", [
+        CREATE_USERS,
+        CREATE_TASKS,
+        CREATE_POSTS,
+    ]),
+
+    # ----- Migration 2: indexes for the real query shapes -----
+    # get_tasks looks up one user's tasks (by due date), the feed pages through
+    # posts by (timestamp, id). Without these both were full table scans plus a sort.
+    # note: idx_posts_timestamp_id may already exist from before migrations
+    (2, "Add indexes for tasks by user/due date and posts by timestamp/id", [
+        "CREATE INDEX IF NOT EXISTS idx_tasks_user_due ON tasks (user_id, due_date, id)",
+        "CREATE INDEX IF NOT EXISTS idx_posts_timestamp_id ON posts (timestamp, id)",
+    ]),
+
+    (3, "Add full-text search index over post titles and content", [
+        create_posts_search_index,
+    ]),
+
+    # query_tasks filters by status and due date and sorts by due date or name.
+    # idx_tasks_user_due (migration 2) already covers "any status, by due date"
+    (4, "Add indexes for filtering tasks by status, due date, name and text", [
+        "CREATE INDEX IF NOT EXISTS idx_tasks_user_status_due ON tasks (user_id, is_completed, due_date, id)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_user_name ON tasks (user_id, task_name COLLATE NOCASE, id)",
+        create_tasks_search_index,
+    ]),
+
+    (5, "Record deleted posts so open feeds can catch up incrementally", [
+        CREATE_POST_TOMBSTONES,
+        CREATE_POST_TOMBSTONE_TRIGGER,
+    ]),
+
+    (6, "Add per-table change counters for change detection", [
+        create_table_versions,
+    ]),
+
+    (7, "Store a preview snippet for every post and index the feed by it", [
+        add_post_snippets,
+    ]),
+
+    (8, "Add the events calendar table with an interval index", [
+        CREATE_EVENTS,
+        "CREATE INDEX IF NOT EXISTS idx_events_start ON events (start_time, id)",
+        create_events_interval_index,
+        add_events_change_counter,
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+
+def get_schema_version(conn):
+
+    """
+    Returns the schema version stored in the database file (PRAGMA user_version).
+    """
+
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+
+def apply_migrations(conn):
+
+    """
+    Applies every migration newer than the database's schema version, in order.
+    Each migration runs in its own transaction together with the user_version
+    bump, so a failed migration leaves the database at the previous version.
+
+    Args:
+        conn (sqlite3.Connection): The (writer) connection to migrate.
+
+    Returns:
+        list: The versions that were applied (empty if the schema was already current).
+    """
+
+    applied = []
+    current = get_schema_version(conn)
+
+    for version, description, steps in MIGRATIONS:
+        if version <= current:
+            continue
+
+        try:
+            conn.execute("BEGIN")
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            # note: PRAGMA can't take ? parameters, version is always our own int
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+        print(f"Applied migration {version}: {description}")
+        applied.append(version)
+
+    return applied
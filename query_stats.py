@@ -0,0 +1,328 @@
+# query_stats.py
+
+import collections
+import datetime
+import functools
+import re
+import threading
+import time
+
+
+# Upper edges (milliseconds) of the latency histogram buckets, the last bucket catches everything slower
+BUCKET_EDGES_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+
+# DatabaseManager methods that are never timed
+# note: generator methods (iter_tasks, iter_posts, ...) are skipped too, calling them only creates the generator
+NOT_TIMED = {"close", "transaction", "enable_group_commit", "disable_group_commit",
+             "enable_query_stats", "disable_query_stats"}
+
+# Longest SQL text kept per statement (sqlite's FTS/trigger statements can be huge)
+MAX_SQL_LENGTH = 300
+
+
+
+class LatencyHistogram:
+
+    """
+    Counts durations into fixed buckets (see BUCKET_EDGES_MS). Uses the same
+    small amount of memory no matter how many durations are added, so it can
+    stay on for the whole session.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_EDGES_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+
+
+    def add(self, ms):
+        index = 0
+        while index < len(BUCKET_EDGES_MS) and ms > BUCKET_EDGES_MS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+
+
+    def percentile(self, percent):
+
+        """
+        Returns the upper edge of the bucket the given percentile falls in
+        (so "p95 <= 2.5 ms"). The last bucket reports the slowest duration seen.
+        """
+
+        if self.count == 0:
+            return 0.0
+        wanted = percent / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= wanted and count:
+                return min(BUCKET_EDGES_MS[index], self.max_ms) if index < len(BUCKET_EDGES_MS) else self.max_ms
+        return self.max_ms
+
+
+
+    def as_dict(self):
+        labels = [f"<={edge}ms" for edge in BUCKET_EDGES_MS] + [f">{BUCKET_EDGES_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "max_ms": round(self.max_ms, 3),
+            "total_ms": round(self.total_ms, 3),
+            "buckets": {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+
+
+def normalize_sql(sql):
+
+    """
+    Turns a statement as sqlite traced it into its general shape: values
+    become ?, whitespace is collapsed. Statements that only differ in their
+    values are counted together, and no user data (names, password hashes,
+    post text) ends up in the stats.
+    """
+
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql) # string literals
+    sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql) # numbers
+    sql = " ".join(sql.split())
+    return sql[:MAX_SQL_LENGTH]
+
+
+
+class _Call:
+
+    """
+    One DatabaseManager method call that is in progress on some thread.
+    """
+
+    __slots__ = ("method", "started", "statements")
+
+    def __init__(self, method):
+        self.method = method
+        self.started = time.perf_counter()
+        self.statements = [] # (start time, sql as traced) in the order they ran
+
+
+
+class QueryStats:
+
+    """
+    Times every DatabaseManager method call and every SQL statement those
+    calls run, keeps a latency histogram for each, and logs calls slower than
+    a threshold together with the statements they ran.
+
+    Method calls are timed by wrapping the methods (instrument()). Statements
+    are seen through sqlite's trace callback (on_statement(), installed on
+    every connection by the ConnectionManager): each statement is timed from
+    when it started until the next statement of the same call started, or the
+    call returned, so fetching the rows counts towards the statement.
+
+    note: statements that run outside a timed call (e.g. on the group commit
+    thread) aren't timed, the call waiting for them still is.
+
+    Usage:
+        db_manager.enable_query_stats(slow_threshold_ms=50)
+        ...
+        db_manager.query_stats.snapshot()
+    """
+
+    def __init__(self, slow_threshold_ms=50, slow_log_size=200, print_slow=True):
+
+        """
+        Initializes the QueryStats.
+
+        Args:
+            slow_threshold_ms (float): Calls at least this slow go into the slow query log.
+            slow_log_size (int): How many slow calls are kept (the oldest are dropped).
+            print_slow (bool): Also print a line for every slow call.
+        """
+
+        self.slow_threshold_ms = slow_threshold_ms
+        self.print_slow = print_slow
+        self._methods = {} # method name -> LatencyHistogram
+        self._statements = {} # normalized sql -> LatencyHistogram
+        self._slow_log = collections.deque(maxlen=slow_log_size)
+        self._lock = threading.Lock() # protects the three above
+        self._local = threading.local() # per-thread stack of _Calls in progress
+        self.started = datetime.datetime.now()
+
+
+
+    def instrument(self, db_manager):
+
+        """
+        Wraps every public DatabaseManager method (on this one object) so its calls are timed.
+
+        Returns:
+            list: The names of the wrapped methods (pass them to uninstrument()).
+        """
+
+        import inspect # note: only needed here, and slow to import at startup
+
+        wrapped = []
+        for name, func in inspect.getmembers(type(db_manager), inspect.isfunction):
+            if name.startswith("_") or name in NOT_TIMED or inspect.isgeneratorfunction(func):
+                continue
+            setattr(db_manager, name, self._timed(name, getattr(db_manager, name)))
+            wrapped.append(name)
+        return wrapped
+
+
+
+    def uninstrument(self, db_manager, names):
+
+        """
+        Removes the wrappers again, so the methods run untimed.
+        """
+
+        for name in names:
+            db_manager.__dict__.pop(name, None)
+
+
+
+    def _timed(self, name, method):
+
+        """
+        Returns a version of method that records how long each call takes.
+        """
+
+        @functools.wraps(method)
+        def timed_method(*args, **kwargs):
+            stack = getattr(self._local, "calls", None)
+            if stack is None:
+                stack = self._local.calls = []
+            call = _Call(name)
+            stack.append(call)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stack.pop()
+                self._finish(call, time.perf_counter())
+        return timed_method
+
+
+
+    def on_statement(self, sql):
+
+        """
+        sqlite trace callback: called on the thread running the statement as it starts.
+        """
+
+        # note: runs for every statement, so it only notes the time and moves on
+        # note: statements sqlite runs inside another one (triggers, the full-text
+        # index's own queries) are traced starting with "--". They count towards
+        # the statement that caused them, so they aren't timed separately
+        if sql.startswith("--"):
+            return
+        stack = getattr(self._local, "calls", None)
+        if stack:
+            stack[-1].statements.append((time.perf_counter(), sql))
+
+
+
+    def _finish(self, call, ended):
+
+        """
+        Records a finished call, its statements and (if it was slow) a slow log entry.
+        """
+
+        call_ms = (ended - call.started) * 1000
+        statements = []
+        for index, (started, sql) in enumerate(call.statements):
+            until = call.statements[index + 1][0] if index + 1 < len(call.statements) else ended
+            statements.append((normalize_sql(sql), (until - started) * 1000))
+
+        with self._lock:
+            self._methods.setdefault(call.method, LatencyHistogram()).add(call_ms)
+            for sql, ms in statements:
+                self._statements.setdefault(sql, LatencyHistogram()).add(ms)
+            slow = call_ms >= self.slow_threshold_ms
+            if slow:
+                self._slow_log.append({
+                    "method": call.method,
+                    "ms": round(call_ms, 3),
+                    "at": datetime.datetime.now().isoformat(timespec="milliseconds"),
+                    "thread": threading.current_thread().name,
+                    "statements": [{"sql": sql, "ms": round(ms, 3)} for sql, ms in statements],
+                })
+
+        if slow and self.print_slow:
+            slowest = max(statements, key=lambda statement: statement[1], default=None)
+            detail = f" (slowest statement {slowest[1]:.1f} ms: {slowest[0][:80]})" if slowest else ""
+            print(f"Slow database call: {call.method} took {call_ms:.1f} ms{detail}")
+
+
+
+    def method_stats(self):
+
+        """
+        Returns:
+            dict: method name -> latency summary (count, mean/p50/p95/p99/max ms, histogram buckets).
+        """
+
+        with self._lock:
+            return {name: histogram.as_dict() for name, histogram in self._methods.items()}
+
+
+
+    def statement_stats(self):
+
+        """
+        Returns:
+            dict: normalized SQL -> latency summary, like method_stats().
+        """
+
+        with self._lock:
+            return {sql: histogram.as_dict() for sql, histogram in self._statements.items()}
+
+
+
+    def slow_queries(self):
+
+        """
+        Returns:
+            list: The slow query log, oldest first. Each entry is a dict with the
+                method, how long it took (ms), when, on which thread, and the statements it ran.
+        """
+
+        with self._lock:
+            return list(self._slow_log)
+
+
+
+    def snapshot(self):
+
+        """
+        Returns everything collected so far as one JSON-friendly dictionary.
+        """
+
+        return {
+            "since": self.started.isoformat(timespec="seconds"),
+            "slow_threshold_ms": self.slow_threshold_ms,
+            "methods": self.method_stats(),
+            "statements": self.statement_stats(),
+            "slow_queries": self.slow_queries(),
+        }
+
+
+
+    def reset(self):
+
+        """
+        Forgets everything collected so far.
+        """
+
+        with self._lock:
+            self._methods = {}
+            self._statements = {}
+            self._slow_log.clear()
+            self.started = datetime.datetime.now()
@@ -0,0 +1,112 @@
+# records.py
+
+# Compact row objects returned by DatabaseManager.iter_tasks() / iter_posts(),
+# and make_snippet() for the post previews the bulletin feed shows.
+#
+# A dict per row costs a few hundred bytes on top of the values it holds, a
+# __slots__ object only a pointer per field. When a whole board of posts is
+# streamed that difference adds up to most of the memory used.
+
+
+# Size of the preview stored with every post (posts.snippet) and shown on its card
+SNIPPET_LENGTH = 200 # characters, including the "..." when cut
+SNIPPET_LINES = 3
+
+
+class TaskRecord:
+
+    """
+    One task, read from the tasks table. Fields are attributes (task.task_name).
+    """
+
+    __slots__ = ("id", "task_name", "description", "due_date", "is_completed")
+
+    def __init__(self, id, task_name, description, due_date, is_completed):
+        self.id = id
+        self.task_name = task_name
+        self.description = description
+        self.due_date = due_date
+        self.is_completed = bool(is_completed)
+
+
+
+    def as_dict(self):
+
+        """
+        Returns the task as a dictionary, the way get_tasks() / query_tasks() return it.
+        """
+
+        return {
+            "id": self.id,
+            "task_name": self.task_name,
+            "description": self.description,
+            "due_date": self.due_date,
+            "is_completed": self.is_completed
+        }
+
+
+
+    def __repr__(self):
+        return f"TaskRecord(id={self.id}, task_name={self.task_name!r}, due_date={self.due_date!r})"
+
+
+
+class PostRecord:
+
+    """
+    One bulletin board post, read from the posts table. Fields are attributes (post.title).
+    """
+
+    __slots__ = ("id", "user_id", "title", "content", "timestamp")
+
+    def __init__(self, id, user_id, title, content, timestamp):
+        self.id = id
+        self.user_id = user_id
+        self.title = title
+        self.content = content
+        self.timestamp = timestamp
+
+
+
+    def as_dict(self):
+
+        """
+        Returns the post as a dictionary, the way get_posts() returns it.
+        """
+
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "title": self.title,
+            "content": self.content,
+            "timestamp": self.timestamp
+        }
+
+
+
+    def __repr__(self):
+        return f"PostRecord(id={self.id}, title={self.title!r}, timestamp={self.timestamp!r})"
+
+
+
+def make_snippet(content):
+
+    """
+    Makes the short preview of a post that the feed shows: its first
+    SNIPPET_LINES lines, at most SNIPPET_LENGTH characters, ending in "..." if
+    anything was cut. A snippet of a snippet is the same snippet.
+
+    Args:
+        content (str): The full post text.
+
+    Returns:
+        str: The preview.
+    """
+
+    lines = (content or "").splitlines()
+    snippet = "\n".join(lines[:SNIPPET_LINES])
+    cut = len(lines) > SNIPPET_LINES
+    if len(snippet) > SNIPPET_LENGTH:
+        snippet = snippet[:SNIPPET_LENGTH - 3].rstrip()
+        cut = True
+    return snippet + "..." if cut else snippet
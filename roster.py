@@ -0,0 +1,248 @@
+# roster.py
+
+# Bulk account provisioning: creates an account for every student in a roster
+# CSV at the start of a term.
+#
+# The roster is read row by row (it is never loaded into memory as a whole).
+# Password hashing is what takes the time, so it is spread over a pool of
+# worker processes, while the main process inserts the finished hashes in
+# batches, one transaction per batch. Usernames that are already taken (or
+# appear twice in the roster) and broken rows are reported instead of
+# stopping the run.
+#
+# The CSV needs a header row. Recognized columns (case-insensitive):
+#   username (or user / login / student_id), password (or secret / initial_password)
+#
+# Usage (from the project folder, with the app closed or open):
+#   python roster.py fall_roster.csv --report problems.csv
+#
+# note: initial secrets are hashed with PROVISIONING_N (see credentials.py), a
+# lower scrypt cost than sign-up uses, so 20k accounts take well under a minute on
+# 8 cores. Each hash is replaced with a full-cost one when the student first logs in.
+
+
+import argparse
+import collections
+import csv
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from credentials import PROVISIONING_N, make_hash
+
+
+# Accepted CSV header names for each field
+CSV_COLUMNS = {
+    "username": ("username", "user", "login", "student_id"),
+    "password": ("password", "secret", "initial_password", "initial_secret"),
+}
+
+
+
+def iter_roster(file):
+
+    """
+    Reads a roster from an open CSV file, one row at a time.
+
+    Args:
+        file: A text file opened with newline="".
+
+    Yields:
+        tuple: (line number, username, password). username or password may be
+            empty for broken rows, the caller reports those.
+    """
+
+    reader = csv.reader(file)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    header = [name.strip().lower() for name in header]
+    positions = {}
+    for field, names in CSV_COLUMNS.items():
+        positions[field] = next((header.index(name) for name in names if name in header), None)
+        if positions[field] is None:
+            raise ValueError(f"The roster needs a '{field}' column (one of: {', '.join(names)}).")
+
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue # blank line
+        username = row[positions["username"]].strip() if positions["username"] < len(row) else ""
+        # note: passwords are kept exactly as written, spaces included
+        password = row[positions["password"]] if positions["password"] < len(row) else ""
+        yield reader.line_num, username, password
+
+
+
+def _hash_chunk(rows, n):
+
+    """
+    Runs in a worker process: hashes the passwords of a chunk of roster rows.
+
+    Returns:
+        list: (line number, username, password_hash) tuples.
+    """
+
+    return [(line, username, make_hash(password, n)) for line, username, password in rows]
+
+
+
+def provision_roster(db_manager, path, n=PROVISIONING_N, workers=None, chunk_size=50, batch_size=1000, progress=None):
+
+    """
+    Creates an account for every student in a roster CSV.
+
+    Args:
+        db_manager (DatabaseManager): Where the accounts are saved.
+        path (str): The roster CSV file.
+        n (int): scrypt cost for the initial secrets (a power of two, at least PROVISIONING_N).
+        workers (int): Worker processes for hashing (None = one per CPU core,
+            1 = hash in this process).
+        chunk_size (int): Passwords handed to a worker at a time.
+        batch_size (int): Accounts inserted per transaction.
+        progress (function): Called with the number of accounts created so far after each batch.
+
+    Returns:
+        dict: {"created": number of accounts created,
+               "problems": [(line number, username, reason), ...] for every row not created}
+    """
+
+    if n < PROVISIONING_N:
+        raise ValueError(f"The scrypt cost has to be at least {PROVISIONING_N} (got {n}).")
+
+    workers = workers or os.cpu_count() or 1
+    created = 0
+    problems = []
+    seen = {} # username -> line it first appeared on (to catch names listed twice)
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    pending = collections.deque() # hashing chunks in flight, oldest first
+    ready = [] # hashed rows waiting to be inserted
+
+    def insert_ready(final=False):
+        nonlocal created, ready
+        while ready and (final or len(ready) >= batch_size):
+            batch, ready = ready[:batch_size], ready[batch_size:]
+            skipped = db_manager.add_hashed_users([(username, password_hash) for line, username, password_hash in batch])
+            if skipped is None:
+                problems.extend((line, username, "database error") for line, username, password_hash in batch)
+                continue
+            # note: someone else took the name after we checked (e.g. signed up in the app meanwhile)
+            skipped = set(skipped)
+            problems.extend((line, username, "username already exists") for line, username, password_hash in batch if username in skipped)
+            created += len(batch) - len(skipped)
+            if progress:
+                progress(created)
+
+    def collect(block):
+        # Waits for the oldest hashing chunk(s) and queues their rows for inserting
+        while pending and (block or pending[0].done()):
+            ready.extend(pending.popleft().result())
+            block = False
+        insert_ready()
+
+    try:
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            rows = iter_roster(file)
+            while True:
+                next_rows = list(itertools.islice(rows, batch_size))
+                if not next_rows:
+                    break
+
+                # Sort out broken rows and duplicates before spending time on hashing
+                valid = []
+                for line, username, password in next_rows:
+                    if not username or not password:
+                        problems.append((line, username, "missing username or password"))
+                    elif username in seen:
+                        problems.append((line, username, f"listed twice (first on line {seen[username]})"))
+                    else:
+                        seen[username] = line
+                        valid.append((line, username, password))
+                existing = db_manager.find_existing_usernames([username for line, username, password in valid])
+                for line, username, password in valid:
+                    if username in existing:
+                        problems.append((line, username, "username already exists"))
+                valid = [row for row in valid if row[1] not in existing]
+
+                # Hand the passwords to the workers a chunk at a time
+                for start in range(0, len(valid), chunk_size):
+                    chunk = valid[start:start + chunk_size]
+                    if pool is None:
+                        ready.extend(_hash_chunk(chunk, n))
+                    else:
+                        pending.append(pool.submit(_hash_chunk, chunk, n))
+                    # note: only a few chunks per worker are kept in flight, so a huge roster
+                    # is never held in memory all at once
+                    if len(pending) >= workers * 4:
+                        collect(block=True)
+                collect(block=False)
+
+        while pending:
+            collect(block=True)
+        insert_ready(final=True)
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    problems.sort()
+    return {"created": created, "problems": problems}
+
+
+
+def write_report(problems, path):
+
+    """
+    Saves the rows that were not created as a CSV (line, username, reason).
+    """
+
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["line", "username", "reason"])
+        writer.writerows(problems)
+
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create CampusLink accounts for every student in a roster CSV.")
+    parser.add_argument("roster", help="CSV file with username and password columns")
+    parser.add_argument("--db", default=os.path.join(os.getcwd(), "campuslink.db"), help="database file (default: ./campuslink.db)")
+    parser.add_argument("--workers", type=int, default=None, help="hashing processes (default: one per CPU core)")
+    parser.add_argument("--cost", type=int, default=PROVISIONING_N, help=f"scrypt cost n for the initial secrets (power of two, default and minimum {PROVISIONING_N})")
+    parser.add_argument("--report", help="write the rows that were not created to this CSV")
+    args = parser.parse_args(argv)
+    if args.cost < PROVISIONING_N:
+        parser.error(f"--cost has to be at least {PROVISIONING_N}")
+
+    from database_manager import DatabaseManager
+
+    db_manager = DatabaseManager(args.db)
+    try:
+        db_manager.create_tables()
+        started = time.perf_counter()
+        try:
+            result = provision_roster(db_manager, args.roster, n=args.cost, workers=args.workers,
+                                      progress=lambda count: print(f"  {count:,} accounts created..."))
+        except (OSError, ValueError) as e:
+            print(f"Error reading the roster: {e}")
+            return 1
+        took = time.perf_counter() - started
+    finally:
+        db_manager.close()
+
+    print(f"{result['created']:,} accounts created in {took:.1f} s, {len(result['problems']):,} rows skipped.")
+    for line, username, reason in result["problems"][:20]:
+        print(f"  line {line}: {username or '(no username)'} - {reason}")
+    if len(result["problems"]) > 20:
+        print(f"  ... and {len(result['problems']) - 20:,} more")
+    if args.report:
+        write_report(result["problems"], args.report)
+        print(f"Skipped rows written to {args.report}")
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+# startup_profiler.py
+
+# Startup profiling mode: records where the time goes from the moment the
+# process starts until the main window first sits idle, and writes it as JSON
+# (and optionally a cProfile dump) so cold-start times can be compared between
+# releases.
+#
+# Turn it on with a command line flag or environment variable:
+#   python main.py --profile-startup startup.json [--profile-cprofile startup.prof] [--profile-exit]
+#   CAMPUSLINK_PROFILE_STARTUP=startup.json CAMPUSLINK_PROFILE_CPROFILE=startup.prof python main.py
+# --profile-exit (CAMPUSLINK_PROFILE_EXIT=1) closes the app right after the
+# first idle frame, so a script can run it again and again.
+#
+# note: this module only uses fast standard library imports on purpose, it is
+# imported before everything else so the other imports can be timed.
+
+import builtins
+import json
+import os
+import platform
+import sys
+import time
+
+
+_active = None # the running StartupProfiler, None when profiling is off
+
+
+
+class StartupProfiler:
+
+    """
+    Collects the startup timeline: named phases (each one ends at a mark()),
+    how long every module took to import, and optionally a cProfile of the
+    whole startup.
+    """
+
+    def __init__(self, output_path, cprofile_path=None, exit_when_done=False):
+
+        """
+        Initializes the StartupProfiler and starts timing right away.
+
+        Args:
+            output_path (str): Where the JSON timeline is written ("-" prints it instead).
+            cprofile_path (str): If given, a cProfile of the startup is saved here
+                (open it with python -m pstats or snakeviz).
+            exit_when_done (bool): Close the app after the first idle frame.
+        """
+
+        self.output_path = output_path
+        self.cprofile_path = cprofile_path
+        self.exit_when_done = exit_when_done
+
+        self._started = time.perf_counter()
+        # Time between the process starting and now (interpreter start-up), None if unknown
+        self._process_age = _process_age()
+        self._phases = [] # (name, ended at perf_counter)
+        self._imports = [] # (module, inclusive seconds, self seconds, nesting depth)
+        self._import_stack = [] # [module, started, seconds spent in nested imports]
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+        self.finished = False
+
+        self._profile = None
+        if cprofile_path:
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+
+        """
+        Replaces the import statement while profiling: times every module that
+        is imported for the first time (already imported ones cost nothing).
+        """
+
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        entry = [name, time.perf_counter(), 0.0]
+        self._import_stack.append(entry)
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self._import_stack.pop()
+            took = time.perf_counter() - entry[1]
+            self._imports.append((name, took, took - entry[2], len(self._import_stack)))
+            if self._import_stack:
+                self._import_stack[-1][2] += took
+
+
+
+    def mark(self, name):
+
+        """
+        Ends the current phase and names it (the next phase starts now).
+        """
+
+        self._phases.append((name, time.perf_counter()))
+
+
+
+    def finish(self, **extra):
+
+        """
+        Stops profiling and writes the timeline (and the cProfile dump).
+
+        Args:
+            **extra: More values to put in the JSON (e.g. the Tk version).
+
+        Returns:
+            dict: The timeline that was written.
+        """
+
+        if self.finished:
+            return None
+        self.finished = True
+        if self._profile:
+            self._profile.disable()
+            self._profile.dump_stats(self.cprofile_path)
+        builtins.__import__ = self._original_import
+
+        timeline = self.timeline()
+        timeline.update(extra)
+        if self.output_path == "-":
+            print(json.dumps(timeline, indent=2))
+        else:
+            try:
+                with open(self.output_path, "w") as file:
+                    json.dump(timeline, file, indent=2)
+                print(f"Startup profile written to {self.output_path} ({timeline['total_ms']:.0f} ms to first idle frame)")
+            except OSError as e:
+                print(f"Error writing the startup profile: {e}")
+        return timeline
+
+
+
+    def timeline(self):
+
+        """
+        Returns the collected timeline as a JSON-friendly dictionary. Times are
+        milliseconds since the process started (since profiling started if the
+        process start time isn't known).
+        """
+
+        offset = self._process_age or 0.0
+        phases = []
+        if self._process_age is not None:
+            phases.append({"name": "python startup", "start_ms": 0.0, "end_ms": round(offset * 1000, 2),
+                           "ms": round(offset * 1000, 2)})
+        previous = self._started
+        for name, ended in self._phases:
+            start_ms = (offset + previous - self._started) * 1000
+            end_ms = (offset + ended - self._started) * 1000
+            phases.append({"name": name, "start_ms": round(start_ms, 2), "end_ms": round(end_ms, 2),
+                           "ms": round(end_ms - start_ms, 2)})
+            previous = ended
+
+        imports = [{"module": module, "ms": round(took * 1000, 3), "self_ms": round(self_took * 1000, 3), "depth": depth}
+                   for module, took, self_took, depth in self._imports]
+
+        return {
+            "format": 1,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(time.time() - (time.perf_counter() - self._started) - offset)),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "process_start_known": self._process_age is not None,
+            "total_ms": phases[-1]["end_ms"] if phases else 0.0,
+            "phases": phases,
+            # note: only the top-level imports add up to the import phase, nested ones are inside them
+            "import_ms": round(sum(entry["ms"] for entry in imports if entry["depth"] == 0), 3),
+            "imports": sorted(imports, key=lambda entry: entry["ms"], reverse=True),
+            "cprofile": self.cprofile_path,
+        }
+
+
+
+def _process_age():
+
+    """
+    Returns how many seconds ago this process started, or None if the system
+    doesn't say (only Linux is supported, accurate to about 10 ms).
+    """
+
+    try:
+        with open("/proc/self/stat") as file:
+            # note: the process name (field 2) may contain spaces, so count fields after its ')'
+            fields = file.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as file:
+            uptime = float(file.read().split()[0])
+        started_after_boot = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        return max(0.0, uptime - started_after_boot)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+
+def start_from_environment(argv=None):
+
+    """
+    Starts profiling if the command line (--profile-startup PATH) or the
+    environment (CAMPUSLINK_PROFILE_STARTUP=PATH) asks for it. The profiling
+    flags are removed from sys.argv.
+
+    Returns:
+        StartupProfiler: The running profiler, or None if profiling is off.
+    """
+
+    global _active
+    if _active is not None:
+        return _active
+
+    argv = sys.argv if argv is None else argv
+    options = {
+        "--profile-startup": os.environ.get("CAMPUSLINK_PROFILE_STARTUP") or None,
+        "--profile-cprofile": os.environ.get("CAMPUSLINK_PROFILE_CPROFILE") or None,
+    }
+    exit_when_done = os.environ.get("CAMPUSLINK_PROFILE_EXIT", "") not in ("", "0")
+
+    # note: parsed by hand, argparse would be one more import to time
+    remaining = []
+    index = 0
+    while index < len(argv):
+        arg = argv[index]
+        if arg in options and index + 1 < len(argv):
+            options[arg] = argv[index + 1]
+            index += 2
+            continue
+        if arg == "--profile-exit":
+            exit_when_done = True
+        else:
+            remaining.append(arg)
+        index += 1
+    argv[:] = remaining
+
+    if options["--profile-startup"] is None:
+        return None
+    _active = StartupProfiler(options["--profile-startup"], options["--profile-cprofile"], exit_when_done)
+    return _active
+
+
+
+def mark(name):
+
+    """
+    Ends the current startup phase (does nothing when profiling is off).
+    """
+
+    if _active is not None and not _active.finished:
+        _active.mark(name)
+
+
+
+def finish_when_idle(root, close=None):
+
+    """
+    Finishes the profile once the main window is shown and Tk has nothing left
+    to do (the first idle frame). Does nothing when profiling is off.
+
+    Args:
+        root (tk.Tk): The app's main window.
+        close (function): Called afterwards to close the app, if --profile-exit was given.
+    """
+
+    if _active is None:
+        return
+
+    def first_idle():
+        _active.mark("first idle frame")
+        _active.finish(tk=str(root.tk.call("info", "patchlevel")))
+        if _active.exit_when_done and close:
+            close()
+
+    # after(0) runs once the main loop is going, after_idle once everything queued before it is done
+    root.after(0, lambda: root.after_idle(first_idle))
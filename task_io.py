@@ -0,0 +1,348 @@
+# task_io.py
+
+# Streaming import and export of tasks as CSV or iCalendar (.ics) files.
+#
+# Nothing here ever holds a whole file or a whole task list in memory:
+# imports read the file row by row with generators and insert in fixed-size
+# batches (one transaction per batch), exports page through the tasks table
+# with fetchmany. Memory use is the same for 100 rows or 10 million.
+#
+# CSV files need a header row. Recognized columns (case-insensitive):
+#   task_name (or name / title / summary), description, due_date (or due / date)
+#
+# From .ics files every VTODO and VEVENT becomes a task:
+#   SUMMARY -> task_name, DESCRIPTION -> description, DUE (or DTSTART) -> due_date
+#
+# note: imported tasks always start as not completed
+
+
+import csv
+import datetime
+import itertools
+import os
+import re
+
+
+# Accepted CSV header names for each task field
+CSV_COLUMNS = {
+    "task_name": ("task_name", "name", "title", "summary"),
+    "description": ("description", "details", "notes"),
+    "due_date": ("due_date", "due", "date", "deadline"),
+}
+
+CSV_EXPORT_HEADER = ["task_name", "description", "due_date", "is_completed"]
+
+# iCalendar text escapes (\\ \; \, \n), undone one at a time so an escaped
+# backslash followed by an n stays a backslash and an n
+ICS_ESCAPE = re.compile(r"\\([\\;,nN])")
+
+# Longest line an .ics file may have, in octets (longer ones are folded)
+ICS_LINE_OCTETS = 75
+
+
+
+def detect_format(path):
+
+    """
+    Returns 'csv' or 'ics' based on the file extension.
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".ics", ".ical", ".ifb", ".icalendar"):
+        return "ics"
+    if extension in (".csv", ".txt"):
+        return "csv"
+    raise ValueError(f"Unsupported file type '{extension}'. Use a .csv or .ics file.")
+
+
+
+# ----- Reading -----
+
+def iter_csv_tasks(file):
+
+    """
+    Reads tasks from an open CSV file, one row at a time.
+
+    Args:
+        file: A text file opened with newline="".
+
+    Yields:
+        tuple: (task_name, description, due_date). Rows without a task name are skipped.
+    """
+
+    reader = csv.reader(file)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    # Find which column holds each field
+    header = [name.strip().lower() for name in header]
+    positions = {}
+    for field, names in CSV_COLUMNS.items():
+        positions[field] = next((header.index(name) for name in names if name in header), None)
+    if positions["task_name"] is None:
+        raise ValueError("The CSV file needs a 'task_name' (or 'name'/'title') column.")
+
+    def column(row, field):
+        index = positions[field]
+        return row[index].strip() if index is not None and index < len(row) else ""
+
+    for row in reader:
+        task_name = column(row, "task_name")
+        if task_name:
+            yield task_name, column(row, "description"), normalize_date(column(row, "due_date"))
+
+
+
+def iter_ics_tasks(file):
+
+    """
+    Reads tasks from an open iCalendar file, one VTODO/VEVENT at a time.
+
+    Args:
+        file: A text file.
+
+    Yields:
+        tuple: (task_name, description, due_date). Components without a SUMMARY are skipped.
+    """
+
+    component = None # properties of the VTODO/VEVENT being read, None when outside one
+    for name, value in _iter_ics_properties(file):
+        if name == "BEGIN" and value.upper() in ("VTODO", "VEVENT"):
+            component = {}
+        elif name == "END" and value.upper() in ("VTODO", "VEVENT"):
+            if component and component.get("SUMMARY"):
+                due = component.get("DUE") or component.get("DTSTART") or ""
+                yield (
+                    _ics_unescape(component["SUMMARY"]),
+                    _ics_unescape(component.get("DESCRIPTION", "")),
+                    _ics_date(due)
+                )
+            component = None
+        elif component is not None and name not in component:
+            component[name] = value
+
+
+
+def _iter_ics_properties(file):
+
+    """
+    Yields (NAME, value) for every property line in an iCalendar file, joining
+    folded lines (continuation lines start with a space or tab) back together.
+    Parameters like ;VALUE=DATE or ;TZID=... are dropped from the name.
+    """
+
+    current = None
+    for line in file:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current:
+            yield _split_ics_line(current)
+        current = line
+    if current:
+        yield _split_ics_line(current)
+
+
+
+def _split_ics_line(line):
+    name, _, value = line.partition(":")
+    return name.split(";", 1)[0].strip().upper(), value
+
+
+
+def _ics_unescape(text):
+    return ICS_ESCAPE.sub(lambda match: "\n" if match.group(1) in "nN" else match.group(1), text)
+
+
+
+def _ics_date(value):
+
+    """
+    Turns an iCalendar date (20250901 or 20250901T090000Z) into 'YYYY-MM-DD'.
+    """
+
+    value = value.strip()
+    if len(value) >= 8 and value[:8].isdigit():
+        return f"{value[:4]}-{value[4:6]}-{value[6:8]}"
+    return value
+
+
+
+def normalize_date(value):
+
+    """
+    Returns a date as 'YYYY-MM-DD' if it is in a format we recognize,
+    otherwise the text unchanged (the app stores due dates as free text).
+    """
+
+    value = value.strip()
+
+    # note: picks the format by looking at the text first, trying strptime with
+    # every format (and catching the errors) is slow over millions of rows
+    parts = value.replace("/", "-").split("-")
+    if len(parts) == 3 and all(part.isdigit() for part in parts):
+        if len(parts[0]) == 4:
+            year, month, day = parts # 2025-09-01 or 2025/09/01
+        else:
+            month, day, year = parts # 09/01/2025
+        if len(year) == 4 and 1 <= int(month) <= 12 and 1 <= int(day) <= 31:
+            return f"{year}-{int(month):02d}-{int(day):02d}"
+    elif len(value) == 8 and value.isdigit():
+        return _ics_date(value) # 20250901
+    return value
+
+
+
+# ----- Import / Export -----
+
+def import_tasks(db_manager, user_id, path, batch_size=1000, progress=None):
+
+    """
+    Imports every task in a CSV or .ics file for a user.
+
+    The file is read with a generator and inserted batch_size tasks at a time,
+    each batch in one transaction, so memory use does not depend on the file size.
+
+    Args:
+        db_manager (DatabaseManager): Where the tasks are saved.
+        user_id (int): The user the tasks belong to.
+        path (str): The file to import.
+        batch_size (int): Tasks inserted per transaction.
+        progress (function): Called with the number of tasks imported so far after each batch.
+
+    Returns:
+        int: The number of tasks imported.
+
+    Raises:
+        ValueError: The file type or its columns are not supported.
+        RuntimeError: A batch could not be saved (the batches before it stay imported).
+    """
+
+    file_format = detect_format(path)
+    imported = 0
+
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        tasks = iter_csv_tasks(file) if file_format == "csv" else iter_ics_tasks(file)
+        rows = ((user_id, task_name, description, due_date) for task_name, description, due_date in tasks)
+
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            added = db_manager.add_tasks(batch)
+            imported += added
+            # note: add_tasks returns 0 when the insert failed, stop instead of reporting a partial import as done
+            if added < len(batch):
+                raise RuntimeError(f"Could not save the tasks to the database after {imported:,} were imported.")
+            if progress:
+                progress(imported)
+
+    return imported
+
+
+
+def export_tasks(db_manager, user_id, path, batch_size=1000, progress=None):
+
+    """
+    Writes all of a user's tasks to a CSV or .ics file (chosen by the extension).
+    Tasks are streamed from the database with fetchmany.
+
+    Args:
+        db_manager (DatabaseManager): Where the tasks are read from.
+        user_id (int): The user whose tasks are exported.
+        path (str): The file to write.
+        batch_size (int): Rows fetched from the database per round trip.
+        progress (function): Called with the number of tasks written so far (every batch_size tasks).
+
+    Returns:
+        int: The number of tasks exported.
+    """
+
+    file_format = detect_format(path)
+    tasks = db_manager.iter_tasks(user_id, batch_size=batch_size)
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ") # when the export was made
+    exported = 0
+
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        if file_format == "csv":
+            writer = csv.writer(file)
+            writer.writerow(CSV_EXPORT_HEADER)
+        else:
+            _write_ics_lines(file, ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//CampusLink//Tasks//EN"])
+
+        for task in tasks:
+            if file_format == "csv":
+                writer.writerow([task.task_name, task.description or "", task.due_date or "", int(task.is_completed)])
+            else:
+                _write_ics_lines(file, _ics_todo_lines(task, stamp))
+
+            exported += 1
+            if progress and exported % batch_size == 0:
+                progress(exported)
+
+        if file_format == "ics":
+            _write_ics_lines(file, ["END:VCALENDAR"])
+
+    if progress:
+        progress(exported)
+    return exported
+
+
+
+def _ics_todo_lines(task, stamp):
+
+    """
+    Builds the lines of one VTODO for a task (a TaskRecord).
+    """
+
+    lines = [
+        "BEGIN:VTODO",
+        f"UID:task-{task.id}@campuslink",
+        f"DTSTAMP:{stamp}",
+        f"SUMMARY:{_ics_escape(task.task_name)}",
+    ]
+    if task.description:
+        lines.append(f"DESCRIPTION:{_ics_escape(task.description)}")
+
+    due = normalize_date(task.due_date or "")
+    if len(due) == 10 and due[4] == "-" and due[7] == "-":
+        lines.append(f"DUE;VALUE=DATE:{due.replace('-', '')}")
+
+    lines.append("STATUS:COMPLETED" if task.is_completed else "STATUS:NEEDS-ACTION")
+    lines.append("END:VTODO")
+    return lines
+
+
+
+def _ics_escape(text):
+    return (text.replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+
+def _write_ics_lines(file, lines):
+
+    """
+    Writes iCalendar lines with CRLF endings, folding lines longer than 75
+    octets (UTF-8 bytes, not characters) as the format requires.
+    """
+
+    for line in lines:
+        if len(line.encode("utf-8")) <= ICS_LINE_OCTETS:
+            file.write(line + "\r\n")
+            continue
+
+        # note: a line is only cut between characters, never inside one, and every
+        # continuation line starts with a space that counts towards its 75 octets
+        start = 0
+        size = 0
+        for position, char in enumerate(line):
+            char_size = len(char.encode("utf-8"))
+            if size + char_size > ICS_LINE_OCTETS:
+                file.write(("" if start == 0 else " ") + line[start:position] + "\r\n")
+                start = position
+                size = 1 # the leading space
+            size += char_size
+        file.write(" " + line[start:] + "\r\n")
@@ -0,0 +1,94 @@
+# test_task_io.py
+
+# Export -> import round trip for task_io, with the characters the CSV and
+# iCalendar formats have to escape (backslashes, commas, semicolons, newlines).
+#
+# Run from the project folder:
+#   python -m unittest discover tests
+
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import task_io
+from database_manager import DatabaseManager
+
+
+TRICKY_TASKS = [
+    ("Back\\slash; name, too", "C:\\new folder, x; y", "2025-09-01"),
+    ("Escaped n", "a literal \\n, then\na real newline", "2025-09-02"),
+    ("Übung für Straße", "Prüfung 考试 📚 " * 12 + "Ende", "2025-09-03"),
+]
+
+
+
+class TaskRoundTripTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.db_managers = []
+
+
+
+    def tearDown(self):
+        for db_manager in self.db_managers:
+            db_manager.close()
+        self.folder.cleanup()
+
+
+
+    def new_database(self, name):
+        # Returns (db_manager, user_id) for a fresh database with one user in it
+        db_manager = DatabaseManager(os.path.join(self.folder.name, name))
+        self.db_managers.append(db_manager)
+        db_manager.create_tables()
+        db_manager.add_hashed_users([("student", "not-a-real-hash")])
+        user_id = db_manager.conn.execute("SELECT id FROM users WHERE username = 'student'").fetchone()[0]
+        return db_manager, user_id
+
+
+
+    def round_trip(self, extension):
+        source, source_user = self.new_database("source.db")
+        source.add_tasks([(source_user, *task) for task in TRICKY_TASKS])
+
+        path = os.path.join(self.folder.name, "tasks." + extension)
+        self.assertEqual(task_io.export_tasks(source, source_user, path), len(TRICKY_TASKS))
+
+        target, target_user = self.new_database("target.db")
+        self.assertEqual(task_io.import_tasks(target, target_user, path), len(TRICKY_TASKS))
+
+        imported = [(task.task_name, task.description, task.due_date) for task in target.iter_tasks(target_user)]
+        self.assertEqual(imported, TRICKY_TASKS)
+
+
+
+    def test_csv_round_trip(self):
+        self.round_trip("csv")
+
+
+
+    def test_ics_round_trip(self):
+        self.round_trip("ics")
+
+
+
+    def test_ics_lines_fit_in_75_octets(self):
+        path = os.path.join(self.folder.name, "long.ics")
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            task_io._write_ics_lines(file, ["DESCRIPTION:" + "é考📚" * 40, "SUMMARY:" + "a" * 67])
+        with open(path, "rb") as file:
+            lines = file.read().split(b"\r\n")[:-1]
+        for line in lines:
+            self.assertLessEqual(len(line), 75)
+            line.decode("utf-8") # raises if a character was cut in half
+        self.assertEqual(lines[-1], b"SUMMARY:" + b"a" * 67)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,271 @@
+# virtual_list.py
+
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualListView(ttk.Frame):
+
+    """
+    A scrollable list of fixed-height rows that only keeps enough row widgets
+    alive to fill the visible area (plus a small overscan). As the user scrolls,
+    rows that leave the view are reused for the rows coming into view, so the
+    number of widgets stays the same no matter how long the list is.
+
+    Rows are pulled from a data source on demand. The data source must provide:
+        row_count()            -> number of rows currently available
+        get_row(index)         -> the row data at that position
+        ensure_loaded(index)   -> try to make rows up to index available
+                                  (e.g. by fetching the next page)
+    A data source that loads rows in the background should call refresh()
+    on the view once they arrive.
+    """
+
+    def __init__(self, parent, data_source, row_factory, row_height, overscan=2, empty_text=""):
+
+        """
+        Initializes the VirtualListView.
+
+        Args:
+            parent (ttk.Frame): The frame to place the list in.
+            data_source: The object the rows are read from (see class docstring).
+            row_factory (function): Called with the parent widget to create a new row
+                widget. The widget must have a show(row) method that fills it with data.
+            row_height (int): The height in pixels of every row.
+            overscan (int): Extra rows kept ready above and below the visible area.
+            empty_text (str): Message shown when the data source has no rows.
+        """
+
+        super().__init__(parent)
+        self.data_source = data_source
+        self.row_factory = row_factory
+        self.row_height = row_height
+        self.overscan = overscan
+
+        # Pool of reusable rows. Each slot is [canvas window id, row widget, index shown or None]
+        self._slots = []
+        self._rendering = False # guards against re-entering _render from scroll callbacks
+        self._render_again = False # set when the view scrolled while we were rendering
+        self._scrollregion = None
+
+        self._create_widgets(empty_text)
+
+
+
+    def _create_widgets(self, empty_text):
+
+        """
+        Creates the canvas, scrollbar and empty-list message.
+        """
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, yscrollincrement=max(1, self.row_height // 4))
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_scrolled)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        # Shown on top of the canvas only when there is nothing to list
+        self.empty_label = ttk.Label(self.canvas, text=empty_text)
+
+        self.canvas.bind("<Configure>", self._on_resized)
+
+        # Mouse wheel scrolling only while the pointer is over the list
+        # note: windows/mac send <MouseWheel>, linux sends <Button-4>/<Button-5>
+        self.canvas.bind("<Enter>", self._bind_mousewheel)
+        self.canvas.bind("<Leave>", self._unbind_mousewheel)
+
+
+
+    def reset(self):
+
+        """
+        Scrolls back to the top and redraws every visible row.
+        Call this after the data source has been reset.
+        """
+
+        self.canvas.yview_moveto(0)
+        self.refresh()
+
+
+
+    def set_data_source(self, data_source, empty_text=None):
+
+        """
+        Switches the list to another data source (e.g. search results instead
+        of the full feed) and scrolls back to the top. The row widgets are kept.
+
+        Args:
+            data_source: The new data source.
+            empty_text (str): New message for when it has no rows (None keeps the current one).
+        """
+
+        self.data_source = data_source
+        if empty_text is not None:
+            self.empty_label.configure(text=empty_text)
+        self.reset()
+
+
+
+    def refresh(self, rows_inserted_above=0):
+
+        """
+        Redraws the visible rows from the data source without changing the scroll position.
+        Call this after rows were added, removed or changed.
+
+        Args:
+            rows_inserted_above (int): Rows that were added at the very top (e.g. new
+                posts). If the list is scrolled down, the view moves down by that many
+                rows so the rows the user is looking at stay where they are.
+        """
+
+        # Forget which index each row widget shows so all of them get refilled
+        for slot in self._slots:
+            slot[2] = None
+
+        top = self.canvas.canvasy(0)
+        if rows_inserted_above and top > 0:
+            count = self.data_source.row_count()
+            self._update_scrollregion(count)
+            self.canvas.yview_moveto((top + rows_inserted_above * self.row_height) / (count * self.row_height))
+        self._render()
+
+
+
+    def _render(self):
+
+        """
+        Places and fills just the rows that are in (or near) the visible area.
+        """
+
+        if self._rendering:
+            return
+        self._rendering = True
+        try:
+            view_height = max(self.canvas.winfo_height(), self.row_height)
+            top = max(0, self.canvas.canvasy(0))
+
+            first = max(0, int(top // self.row_height) - self.overscan)
+            last = int((top + view_height) // self.row_height) + self.overscan
+
+            # Ask the data source for more rows when the view reaches the end of what is loaded
+            if last >= self.data_source.row_count():
+                self.data_source.ensure_loaded(last)
+            count = self.data_source.row_count()
+            last = min(last, count - 1)
+
+            self._update_scrollregion(count)
+            if count == 0:
+                self.empty_label.place(relx=0.5, y=20, anchor="n")
+            else:
+                self.empty_label.place_forget()
+
+            wanted = range(first, last + 1)
+
+            # Rows that already show a wanted index are kept as they are, the rest are free to reuse
+            shown = {}
+            free = []
+            for slot in self._slots:
+                if slot[2] is not None and slot[2] in wanted and slot[2] not in shown:
+                    shown[slot[2]] = slot
+                else:
+                    free.append(slot)
+
+            for index in wanted:
+                if index in shown:
+                    continue
+                slot = free.pop() if free else self._create_slot()
+                slot[1].show(self.data_source.get_row(index))
+                self.canvas.coords(slot[0], 0, index * self.row_height)
+                slot[2] = index
+
+            # Park unused rows above the scroll region where they can never be seen
+            for slot in free:
+                self.canvas.coords(slot[0], 0, -2 * self.row_height)
+                slot[2] = None
+        finally:
+            self._rendering = False
+
+        # The scroll region may have changed while rendering (e.g. rows were removed),
+        # which moves the view --> draw once more for the new position
+        if self._render_again:
+            self._render_again = False
+            self.after_idle(self._render)
+
+
+
+    def _create_slot(self):
+
+        """
+        Creates a new row widget and its canvas window.
+        """
+
+        row = self.row_factory(self.canvas)
+        window_id = self.canvas.create_window(
+            0, -2 * self.row_height, window=row, anchor="nw",
+            width=self.canvas.winfo_width(), height=self.row_height
+        )
+        slot = [window_id, row, None]
+        self._slots.append(slot)
+        return slot
+
+
+
+    def _update_scrollregion(self, count):
+
+        """
+        Sizes the scroll region to fit every available row.
+        """
+
+        # note: only touch it when it changes, setting it makes the canvas call
+        # _on_scrolled again which would redraw forever
+        region = (0, 0, self.canvas.winfo_width(), max(count * self.row_height, 1))
+        if region != self._scrollregion:
+            self._scrollregion = region
+            self.canvas.configure(scrollregion=region)
+
+
+
+    def _on_scrolled(self, first, last):
+
+        """
+        Called by the canvas whenever the visible part of the list changes.
+        """
+
+        self.scrollbar.set(first, last)
+        if self._rendering:
+            self._render_again = True
+        else:
+            self._render()
+
+
+
+    def _on_resized(self, event):
+
+        """
+        Stretches every row to the new width and fills any newly visible space.
+        """
+
+        for slot in self._slots:
+            self.canvas.itemconfigure(slot[0], width=event.width)
+        self._render()
+
+
+
+    def _bind_mousewheel(self, event):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.bind_all(sequence, self._on_mousewheel)
+
+    def _unbind_mousewheel(self, event):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.unbind_all(sequence)
+
+    def _on_mousewheel(self, event):
+
+        """
+        Scrolls the list with the mouse wheel.
+        """
+
+        if event.num == 4 or event.delta > 0:
+            self.canvas.yview_scroll(-1, "units")
+        else:
+            self.canvas.yview_scroll(1, "units")